@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: legacy CATEGORY_MAP loop vs the compiled CategoryMatcher.
+
+Builds a synthetic Category column (default 1M rows) shaped like the raw
+feed -- one to four comma/semicolon separated tokens per row, mixing exact
+keys, longer phrases that contain a key, fragments of keys and unmatched
+noise -- then times map_categories-style resolution per row.
+
+    python bench/bench_category_matcher.py [--rows 1000000] [--seed 7]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from category_matcher import CategoryMatcher  # noqa: E402
+from process_data import CATEGORY_MAP  # noqa: E402
+
+NOISE = ["software", "platform", "cre", "tools", "saas", "services", "other", "misc", "solutions"]
+
+
+def legacy_match(token):
+    if token in CATEGORY_MAP:
+        return CATEGORY_MAP[token]
+    for key, val in CATEGORY_MAP.items():
+        if key in token or token in key:
+            return val
+    return None
+
+
+def synthetic_column(rows, seed):
+    rng = random.Random(seed)
+    keys = list(CATEGORY_MAP)
+
+    def token():
+        kind = rng.random()
+        key = rng.choice(keys)
+        if kind < 0.4:
+            return key.title()
+        if kind < 0.7:
+            return f"{rng.choice(NOISE)} {key} {rng.choice(NOISE)}"
+        if kind < 0.85:
+            start = rng.randrange(len(key))
+            return key[start:start + rng.randint(2, 8)]
+        return " ".join(rng.sample(NOISE, 2)) + f" {rng.randint(0, 999)}"
+
+    for _ in range(rows):
+        yield rng.choice([", ", "; ", ","]).join(token() for _ in range(rng.randint(1, 4)))
+
+
+SPLIT = re.compile(r'[;,]')
+
+
+def resolve_rows(column, match):
+    for raw in column:
+        cats = set()
+        for cat in SPLIT.split(raw):
+            cat_lower = cat.strip().lower()
+            if not cat_lower:
+                continue
+            canonical = match(cat_lower)
+            if canonical:
+                cats.add(canonical)
+
+
+def timed(label, column, match):
+    start = time.perf_counter()
+    resolve_rows(column, match)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.2f} s  {elapsed / len(column) * 1e6:7.2f} us/row")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows:,} synthetic Category values...")
+    column = list(synthetic_column(args.rows, args.seed))
+
+    start = time.perf_counter()
+    matcher = CategoryMatcher(CATEGORY_MAP)
+    print(f"Matcher build: {(time.perf_counter() - start) * 1e3:.1f} ms "
+          f"({len(matcher._goto)} automaton states, {len(matcher._reverse)} reverse entries)")
+
+    timed("split/strip only (floor)", column, lambda t: None)
+    legacy = timed("legacy CATEGORY_MAP loop", column, legacy_match)
+
+    cold = CategoryMatcher(CATEGORY_MAP)
+
+    def cold_match(token):
+        cold._cache.clear()
+        return cold.match(token)
+
+    timed("CategoryMatcher (no cache)", column, cold_match)
+
+    compiled = timed("CategoryMatcher", column, matcher.match)
+    print(f"Speedup vs legacy: {legacy / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""ProductEnricher fetch throughput against local stand-in sites.
+
+Starts one small HTTP server per fake site on 127.0.0.1 (each port is a
+separate host to the fetcher), each answering with a homepage after a
+fixed latency. Every server records its peak number of requests in flight
+and the shortest gap between request starts, so the run also checks the
+per-host limits were honoured. A temporary products.json is enriched with
+ProductEnricher.run_enrichment(): first with one worker and no host
+interval (the old serial fetch loop without its sleeps), then with the
+requested parallelism.
+
+    python bench/bench_fetch.py [--sites 50] [--pages 2] [--latency 0.2] [--workers 16]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+from enrich_products import ProductEnricher  # noqa: E402
+
+# Seconds the old loop slept per product: 1 after the fetch, 2 after the update.
+LEGACY_SLEEP = 3.0
+
+PAGE = """<html><head><title>{name} | Commercial Real Estate Software</title>
+<meta name="description" content="{name} helps property managers and brokers run their portfolio.">
+</head><body><img src="/assets/{name}-logo-dark.svg"><h1>{name}</h1>
+<p class="tagline">Lease administration for office and industrial</p></body></html>"""
+
+
+class Site:
+    def __init__(self, latency):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.starts = []
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with site.lock:
+                    site.in_flight += 1
+                    site.peak = max(site.peak, site.in_flight)
+                    site.starts.append(time.monotonic())
+                time.sleep(site.latency)
+                body = PAGE.format(name=f"site{self.server.server_port}").encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with site.lock:
+                    site.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_port
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reset(self):
+        self.peak = 0
+        self.starts = []
+
+    def min_gap(self):
+        starts = sorted(self.starts)
+        return min((b - a for a, b in zip(starts, starts[1:])), default=None)
+
+
+def run(catalog, jobs, workers, per_host, host_interval):
+    with open(catalog, 'w') as f:
+        json.dump([], f)
+    with open(os.path.join(os.path.dirname(catalog), "categories.json"), 'w') as f:
+        json.dump({}, f)
+    enricher = ProductEnricher(catalog, workers, per_host, host_interval)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        enricher.run_enrichment(jobs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sites", type=int, default=50, help="distinct hosts")
+    parser.add_argument("--pages", type=int, default=2, help="products per host")
+    parser.add_argument("--latency", type=float, default=0.2, help="server response time in seconds")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--per-host", type=int, default=1)
+    parser.add_argument("--host-interval", type=float, default=0.5)
+    args = parser.parse_args()
+
+    sites = [Site(args.latency) for _ in range(args.sites)]
+    jobs = [{"slug": f"site{site.port}-{n}", "domain": f"127.0.0.1:{site.port}",
+             "url": f"http://127.0.0.1:{site.port}/p{n}"}
+            for n in range(args.pages) for site in sites]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = os.path.join(tmp, "products.json")
+        serial = run(catalog, jobs, 1, 1, 0.0)
+        for site in sites:
+            site.reset()
+        parallel = run(catalog, jobs, args.workers, args.per_host, args.host_interval)
+        with open(catalog) as f:
+            enriched = json.load(f)
+
+    peak = max(site.peak for site in sites)
+    gaps = [g for g in (site.min_gap() for site in sites) if g is not None]
+    legacy = serial + LEGACY_SLEEP * len(jobs)
+    print(f"{len(jobs)} products on {args.sites} hosts, {args.latency * 1000:.0f} ms per response")
+    print(f"  serial fetch:       {serial:7.2f}s  (+{LEGACY_SLEEP:.0f}s/product of sleeps = {legacy:.1f}s)")
+    print(f"  {args.workers:2d} workers:         {parallel:7.2f}s  ({legacy / parallel:.0f}x vs the old loop)")
+    print(f"  per-host peak in flight: {peak} (limit {args.per_host}), "
+          f"min gap between starts: {min(gaps) if gaps else 0:.3f}s (limit {args.host_interval}s)")
+    print(f"  enriched records written: {len(enriched)}")
+    ok = peak <= args.per_host and (not gaps or min(gaps) >= args.host_interval - 0.01) and len(enriched) == len(jobs)
+    print("  politeness limits held" if ok else "  LIMITS VIOLATED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
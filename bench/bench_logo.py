@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Logo resolution: the old curl | head | grep | sed pipeline vs logo_resolver.
+
+Serves synthetic homepages from local servers (one port per fake domain)
+with a fixed response latency. A page has its logo near the top of <head>,
+in a site <header> well past line 50, or nowhere (a large body after
+</header>); logo src values cycle through the relative, root-relative,
+protocol-relative and absolute forms. Each domain is resolved with the
+subprocess pipeline (serially, as get_logo_url ran it), then with
+logo_resolver one at a time and concurrently. The run reports wall time,
+logos found, and whether every logo the pipeline found was resolved to
+the same URL.
+
+    python bench/bench_logo.py [--domains 40] [--latency 0.05] [--workers 16]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from logo_resolver import clearbit_url, normalize_logo_url, resolve_logo  # noqa: E402
+from polite_fetch import PoliteFetcher  # noqa: E402
+
+SRC_FORMS = ["/assets/logo-dark.svg", "//cdn.example.com/brand/logo.png", "img/site-logo.jpg",
+             "https://static.example.com/logo-color.svg"]
+FILLER = '<link rel="preload" href="/fonts/inter-{n}.woff2" as="font" crossorigin>\n'
+PARAGRAPH = "<p>" + "Commercial real estate analytics for owners, brokers and lenders. " * 20 + "</p>\n"
+
+
+def page(kind, n):
+    src = SRC_FORMS[n % len(SRC_FORMS)]
+    head = "<!doctype html>\n<html>\n<head>\n<title>Site</title>\n"
+    if kind == "head":
+        head += f'<meta name="x"><img src="{src}">\n'
+    head += "".join(FILLER.format(n=i) for i in range(80)) + "</head>\n<body>\n"
+    header = "<header>\n<nav>\n" + "".join(f'<a href="/p{i}">Page {i}</a>\n' for i in range(20))
+    if kind == "header":
+        header += f'<a href="/"><img class="brand" src="{src}" alt="Site"></a>\n'
+    header += "</nav>\n</header>\n"
+    return (head + header + PARAGRAPH * 400 + "</body></html>\n").encode()
+
+
+class Site:
+    def __init__(self, body, latency):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(latency)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    for i in range(0, len(body), 8192):
+                        self.wfile.write(body[i:i + 8192])
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.domain = f"127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+def curl_pipeline(domain):
+    """The old get_logo_url, pointed at http:// for the local server."""
+    cmd = (f'curl -sL "http://{domain}" | head -50 | grep -oP \'src="[^"]*logo[^"]*\\.(svg|png|jpg|jpeg)[^"]*"\' '
+           f'| head -1 | sed \'s/src="//\' | sed \'s/"//\'')
+    try:
+        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=10)
+        if result.returncode == 0 and result.stdout.strip():
+            return normalize_logo_url(domain, result.stdout.strip())
+    except subprocess.TimeoutExpired:
+        pass
+    return clearbit_url(domain)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--domains", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    kinds = ["head", "header", "none", "header"]
+    sites = [Site(page(kinds[n % len(kinds)], n), args.latency) for n in range(args.domains)]
+    domains = [site.domain for site in sites]
+    print(f"{len(domains)} domains, {len(page('none', 0)) // 1024} KB pages, {args.latency * 1000:.0f} ms latency")
+
+    def resolver(fetcher):
+        return lambda domain: resolve_logo(domain, fetcher, url=f"http://{domain}")
+
+    serial = PoliteFetcher(workers=1, host_interval=0)
+    parallel = PoliteFetcher(workers=args.workers, host_interval=0)
+    runs = [
+        ("curl | head | grep | sed", lambda: {d: curl_pipeline(d) for d in domains}),
+        ("resolver, 1 worker", lambda: {d: resolver(serial)(d) for d in domains}),
+        (f"resolver, {args.workers} workers", lambda: dict(parallel.map(domains, resolver(parallel)))),
+    ]
+
+    results = {}
+    for name, fn in runs:
+        elapsed, found = timed(fn)
+        results[name] = found
+        logos = sum(not url.startswith("https://logo.clearbit.com/") for url in found.values())
+        print(f"  {name:26s} {elapsed:6.2f}s  {logos:3d} logos found")
+
+    legacy, new = results[runs[0][0]], results[runs[2][0]]
+    agree = all(new[d] == url for d, url in legacy.items() if not url.startswith("https://logo.clearbit.com/"))
+    print("  every pipeline logo resolved identically" if agree else "  MISMATCH against the pipeline")
+    sys.exit(0 if agree else 1)
+
+
+if __name__ == "__main__":
+    main()
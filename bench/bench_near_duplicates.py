@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Scaling and accuracy benchmark for scripts/near_duplicates.py.
+
+Generates product records (default 1M) with random titles, domains and
+60-90 word descriptions, and plants near duplicates of a share of them the
+way they show up in the feed: the same vendor under a www., regional or
+product-line URL, a retitled listing, or a lightly edited description.
+Records are fed to NearDuplicateFinder one at a time and never kept, so
+the peak RSS is the finder's own.
+
+Reports signature throughput, find() time, peak RSS, the share of planted
+pairs that were reported (and marked "merge"), and how many reported pairs
+are not duplicates (two variants of one record count as duplicates).
+
+    python bench/bench_near_duplicates.py [--rows 1000000] [--duplicates 0.02] [--seed 1]
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from near_duplicates import NearDuplicateFinder  # noqa: E402
+
+SYLLABLES = ["lea", "prop", "deal", "site", "bild", "rent", "cap", "ten", "zon", "ass", "loop", "crex",
+             "quan", "met", "vau", "hub", "sta", "bas", "flo", "pil", "ora", "ven", "tri", "mar", "nex"]
+TLDS = [".com", ".io", ".ai", ".co"]
+REGIONAL = [".co.uk", ".com.au", ".de", ".ca"]
+
+
+def word(rng, shortest=2, longest=3):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(shortest, longest)))
+
+
+def generate(rows, share, seed):
+    """Yield (record, slug of the record it duplicates or None)."""
+    rng = random.Random(seed)
+    vocabulary = list({word(rng) for _ in range(20000)})
+    originals = []
+    for i in range(rows):
+        if originals and rng.random() < share:
+            original = rng.choice(originals)
+            yield variant(rng, original, vocabulary, i), original["slug"]
+            continue
+        name = word(rng, 3, 4).capitalize() + " " + word(rng, 3, 4).capitalize()
+        record = {
+            "slug": f"p{i}",
+            "title": name,
+            "url": "https://www." + name.lower().replace(" ", "") + rng.choice(TLDS),
+            "description": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(60, 90))),
+        }
+        if len(originals) < 10000:
+            originals.append(record)
+        else:
+            originals[rng.randrange(len(originals))] = record
+        yield record, None
+
+
+def variant(rng, original, vocabulary, i):
+    words = original["description"].split()
+    kind = rng.choice(["www", "regional", "product-line", "retitled", "edited"])
+    host = original["url"].split("://www.")[1]
+    title, url = original["title"], original["url"]
+    if kind == "www":
+        url = "https://" + host
+    elif kind == "regional":
+        url = "https://www." + host.rsplit(".", 1)[0] + rng.choice(REGIONAL)
+    elif kind == "product-line":
+        url = f"https://app.{host}/{word(rng)}"
+        title = f"{title} {word(rng).capitalize()}"
+    elif kind == "retitled":
+        title = f"{title} by {word(rng).capitalize()}"
+    if kind in ("edited", "retitled"):
+        for _ in range(len(words) // 20):  # about 5% of words replaced
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+    return {"slug": f"p{i}", "title": title, "url": url, "description": " ".join(words[:rng.randint(50, len(words))])}
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate detection on synthetic records.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--duplicates", type=float, default=0.02, help="share of rows that are planted duplicates")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    finder = NearDuplicateFinder()
+    planted = set()
+    original_of = {}
+    added = 0.0
+    for record, original in generate(args.rows, args.duplicates, args.seed):
+        start = time.perf_counter()
+        finder.add(record)
+        added += time.perf_counter() - start
+        if original:
+            planted.add((original, record["slug"]))
+            original_of[record["slug"]] = original
+    report = finder.find()
+
+    found = {action: set() for action in ("merge", "review")}
+    for action in found:
+        for cluster in report[action]:
+            for pair in cluster["pairs"]:
+                found[pair["action"]].add((pair["a"], pair["b"]))
+    reported = found["merge"] | found["review"]
+
+    def false(pairs):
+        return sum(1 for a, b in pairs if original_of.get(a, a) != original_of.get(b, b))
+
+    stats = report["stats"]
+    print(f"{args.rows} records, {len(planted)} planted duplicates")
+    print(f"  add()       {added:8.1f}s  {args.rows / added:9.0f} records/s")
+    print(f"  find()      {stats['seconds']:8.1f}s  {stats['candidate_pairs']} candidate pairs, "
+          f"{stats['oversized_brands']} brands / {stats['oversized_buckets']} buckets skipped")
+    print(f"  peak RSS    {peak_rss_mb():8.0f} MB")
+    print(f"  recall      {len(planted & reported) / max(1, len(planted)):8.1%} reported, "
+          f"{len(planted & found['merge']) / max(1, len(planted)):.1%} marked merge")
+    print(f"  false       {false(found['merge']):8d} merge pairs, {false(found['review'])} review pairs")
+
+
+if __name__ == "__main__":
+    main()
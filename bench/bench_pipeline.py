@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Stage-by-stage scaling benchmark for scripts/process_data.py.
+
+For each size (default 1k, 100k and 1M rows) a synthetic raw CSV is
+generated with synthetic_feed.py (cached under .build/bench/ so reruns
+skip it), and a fresh child process runs the steps process() is made of,
+one stage at a time:
+
+    parse       read_rows() into a list
+    filter      visible_rows() + unique_rows() slug dedupe
+    transform   build_product() for every kept row, which includes
+      categorise  map_categories()   (timed again on its own)
+      infer       classify() signals (timed again on its own)
+    categories  CategoryIndex.build() + build_category_data()
+    json        products.json + categories.json, encoded as process() does
+    sitemap     sitemap.xml + robots.txt
+
+Each stage reports wall time, throughput (input rows per second) and the
+process's peak RSS once the stage is done, so the stage that raised the
+peak is visible. categorise and infer are part of transform and are not
+added into the total.
+
+Results are compared with a stored baseline (bench/baselines/pipeline.json
+by default): a stage more than --tolerance slower, or a peak RSS more than
+--tolerance higher, is flagged and makes the run exit 1. Baselines are
+only meaningful on the machine that recorded them; --save-baseline
+replaces the entries for the sizes just measured.
+
+    python bench/bench_pipeline.py [--rows 1000 100000 1000000] [--seed 1]
+                                   [--baseline PATH] [--save-baseline] [--tolerance 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+from synthetic_feed import write_csv  # noqa: E402
+
+FEED_DIR = os.path.join(ROOT, ".build", "bench")
+BASELINE = os.path.join(BENCH_DIR, "baselines", "pipeline.json")
+STAGES = ["parse", "filter", "transform", "categorise", "infer", "categories", "json", "sitemap"]
+# Timed separately, but already inside transform
+SUB_STAGES = ("categorise", "infer")
+# Stages shorter than this are too noisy to compare
+MIN_COMPARABLE_SECONDS = 0.25
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def feed_path(rows, seed):
+    path = os.path.join(FEED_DIR, f"feed-{rows}-{seed}.csv")
+    if not os.path.exists(path):
+        os.makedirs(FEED_DIR, exist_ok=True)
+        write_csv(path + ".tmp", rows, seed)
+        os.replace(path + ".tmp", path)
+    return path
+
+
+def run_stages(feed, out_dir):
+    """Time every stage over one feed (runs in the child process)."""
+    import process_data as pd
+    from category_index import CategoryIndex
+    from text_signals import classify
+
+    results = {}
+
+    def stage(name, fn):
+        start = time.perf_counter()
+        value = fn()
+        results[name] = {"seconds": time.perf_counter() - start, "peak_rss_mb": peak_rss_mb()}
+        return value
+
+    rows = stage("parse", lambda: list(pd.read_rows(feed)))
+    input_rows = len(rows)
+    pairs = stage("filter", lambda: list(pd.unique_rows(pd.visible_rows(rows))))
+    products = stage("transform", lambda: [pd.build_product(slug, row) for slug, row in pairs])
+    stage("categorise", lambda: [pd.map_categories((row.get("Category") or "").strip(), row) for _, row in pairs])
+    stage("infer", lambda: [classify(p["description"], pd.PRODUCT_SIGNALS) for p in products])
+    del rows, pairs
+
+    def categories():
+        index = CategoryIndex.build(products, pd.CANONICAL_CATEGORIES)
+        return pd.build_category_data(index.members)
+
+    cat_data = stage("categories", categories)
+
+    def write_json():
+        with open(os.path.join(out_dir, "products.json"), 'w') as f:
+            f.write(json.dumps(products, indent=2))
+        with open(os.path.join(out_dir, "categories.json"), 'w') as f:
+            f.write(json.dumps(cat_data, indent=2))
+
+    stage("json", write_json)
+
+    def sitemap():
+        root = os.path.dirname(out_dir)
+        with pd.open_sitemap(root) as sm:
+            for p in products:
+                pd.add_product_url(sm, p["slug"], p.get("last_updated"))
+            pd.add_category_urls(sm, cat_data)
+        pd.write_robots(root)
+
+    stage("sitemap", sitemap)
+
+    for timing in results.values():
+        timing["rows_per_s"] = input_rows / timing["seconds"] if timing["seconds"] else None
+    total = sum(t["seconds"] for name, t in results.items() if name not in SUB_STAGES)
+    return {"input_rows": input_rows, "products": len(products), "total_seconds": total,
+            "peak_rss_mb": peak_rss_mb(), "stages": results}
+
+
+def measure(rows, seed):
+    """Run one size in a fresh interpreter so its peak RSS is its own."""
+    feed = feed_path(rows, seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = os.path.join(tmp, "data")
+        os.makedirs(out_dir)
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", feed, out_dir],
+                                check=True, stdout=subprocess.PIPE, text=True)
+    return json.loads(result.stdout)
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def compare(size, run, base, tolerance):
+    """Lines describing regressions of run against the baseline entry for the same size."""
+    problems = []
+    for name in STAGES:
+        new, old = run["stages"][name]["seconds"], base["stages"].get(name, {}).get("seconds")
+        if old and max(new, old) >= MIN_COMPARABLE_SECONDS and new > old * (1 + tolerance):
+            problems.append(f"{size:>9,} rows  {name:<11} {old:8.3f}s -> {new:8.3f}s  (+{new / old - 1:.0%})")
+    new, old = run["peak_rss_mb"], base.get("peak_rss_mb")
+    if old and new > old * (1 + tolerance):
+        problems.append(f"{size:>9,} rows  peak RSS    {old:7.0f} MB -> {new:7.0f} MB  (+{new / old - 1:.0%})")
+    return problems
+
+
+def print_run(size, run, base):
+    print(f"\n{size:,} rows -> {run['products']:,} products, total {run['total_seconds']:.2f}s, "
+          f"peak RSS {run['peak_rss_mb']:.0f} MB")
+    print(f"  {'stage':<13} {'seconds':>9} {'rows/s':>12} {'RSS MB':>8} {'baseline':>9}")
+    for name in STAGES:
+        t = run["stages"][name]
+        old = base["stages"].get(name, {}).get("seconds") if base else None
+        label = f"  {name}" if name in SUB_STAGES else name
+        rate = f"{t['rows_per_s']:,.0f}" if t["rows_per_s"] else "-"
+        print(f"  {label:<13} {t['seconds']:9.3f} {rate:>12} {t['peak_rss_mb']:8.0f} "
+              f"{f'{old:.3f}' if old else '-':>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="record these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown / RSS growth before a stage is flagged")
+    parser.add_argument("--child", nargs=2, metavar=("FEED", "OUT_DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        json.dump(run_stages(*args.child), sys.stdout)
+        return
+
+    baseline = load_baseline(args.baseline)
+    entries = (baseline or {}).get("sizes", {})
+    print(f"Python {platform.python_version()}, {os.cpu_count()} CPUs, seed {args.seed}")
+    if baseline and baseline.get("machine") != platform.node():
+        print(f"(baseline was recorded on {baseline.get('machine')}; timings may not be comparable)")
+
+    runs, problems = {}, []
+    for size in args.rows:
+        run = runs[str(size)] = measure(size, args.seed)
+        base = entries.get(str(size)) if baseline and baseline.get("seed") == args.seed else None
+        print_run(size, run, base)
+        if base:
+            problems += compare(size, run, base, args.tolerance)
+
+    if problems:
+        print(f"\nRegressions beyond {args.tolerance:.0%}:")
+        for line in problems:
+            print("  " + line)
+    elif baseline:
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {os.path.relpath(args.baseline)}")
+
+    if args.save_baseline:
+        if not baseline or baseline.get("seed") != args.seed:
+            entries = {}
+        entries.update(runs)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({"machine": platform.node(), "python": platform.python_version(), "seed": args.seed,
+                       "sizes": entries}, f, indent=2)
+        print(f"Saved baseline to {os.path.relpath(args.baseline)}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Wall-clock speedup of process_data --workers on a synthetic feed.
+
+Generates a synthetic CSV (see synthetic_feed.py), runs the build once per
+worker count into a scratch directory, checks every run produced the same
+bytes as the serial run and prints the speedup.
+
+    python bench/bench_workers.py [--rows 200000] [--workers 1 2 4 8]
+"""
+import argparse
+import filecmp
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROCESS_DATA = os.path.join(os.path.dirname(BENCH_DIR), "scripts", "process_data.py")
+
+sys.path.insert(0, BENCH_DIR)
+from synthetic_feed import write_csv  # noqa: E402
+
+OUTPUTS = [os.path.join("data", "products.json"), os.path.join("data", "categories.json"), "sitemap.xml"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        feed = os.path.join(tmp, "feed.csv")
+        write_csv(feed, args.rows, args.seed)
+        print(f"{args.rows:,} rows, {os.cpu_count()} CPUs")
+
+        baseline = None
+        serial_dir = None
+        for workers in args.workers:
+            out = os.path.join(tmp, f"w{workers}")
+            start = time.perf_counter()
+            subprocess.run([sys.executable, PROCESS_DATA, "--csv", feed, "--out", os.path.join(out, "data"),
+                            "--workers", str(workers)], check=True, stdout=subprocess.DEVNULL)
+            elapsed = time.perf_counter() - start
+
+            if serial_dir is None:
+                serial_dir, baseline = out, elapsed
+                same = "reference"
+            else:
+                same = all(filecmp.cmp(os.path.join(serial_dir, f), os.path.join(out, f), shallow=False)
+                           for f in OUTPUTS)
+                same = "identical" if same else "DIFFERENT OUTPUT"
+            print(f"  --workers {workers:<3} {elapsed:7.2f} s  {baseline / elapsed:5.2f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Synthetic raw-CSV generator shaped like the directory export.
+
+Produces the columns scripts/process_data.py reads (title, url, text,
+Details, Category, page, the Cat - ... Y/N flags, Hide, logoUrl, isFree,
+isTopRated, verified, SEOHeadline, SEODescription) with a realistic mix of
+hidden rows, empty rows, duplicate titles, www./bare domains and messy
+category strings. Output is deterministic for a given seed.
+
+    python bench/synthetic_feed.py ROWS OUT.csv [--seed 1]
+"""
+import argparse
+import csv
+import random
+
+FLAG_COLUMNS = [
+    "Cat - DevelopmentY/N",
+    "Cat - Constr Y/N",
+    "Cat - Law & Muni Y/N",
+    "Cat - Search & Sele Y/N",
+    "Cat - CRM & Mar Y/N",
+    "Cat - Fin & Eval Y/N",
+    "Cat - AI ",
+]
+
+COLUMNS = [
+    "title", "url", "text", "Details", "Category", "page", "Hide", "logoUrl",
+    "isFree", "isTopRated", "verified", "SEOHeadline", "SEODescription",
+] + FLAG_COLUMNS
+
+NAME_PARTS = ["Lease", "Prop", "Deal", "Site", "Build", "Rent", "Cap", "Tenant", "Zone", "Asset",
+              "Loop", "Crex", "Quant", "Metric", "Vault", "Hub", "Stack", "Base", "Flow", "Pilot"]
+SUFFIXES = ["", " AI", " Pro", " Cloud", " Analytics", " CRE", " Labs", " Suite"]
+TLDS = [".com", ".io", ".ai", ".co", ".co.uk", ".com.au"]
+
+DESCRIPTION_WORDS = (
+    "platform software commercial real estate office retail industrial multifamily mixed-use "
+    "residential cloud saas web-based browser online on-premise desktop mobile ios android app "
+    "free trial freemium premium subscription monthly per month quote contact custom pricing "
+    "lease tenant broker brokerage listing deal data analytics insights reporting valuation "
+    "investment underwriting construction development project management building portfolio "
+    "owners operators investors lenders teams workflows automate track manage analyze"
+).split()
+
+CATEGORY_TOKENS = [
+    "Property Management", "CRM", "Marketing", "Data Analytics", "Lease Management", "Investment",
+    "Valuation", "Construction Tech", "AI", "Broker Tools", "Market Research", "Site Selection",
+    "Tenant Experience", "Accounting", "Listings", "Crowdfunding", "ESG", "Legal", "Coworking",
+    "PropTech", "Mortgage", "Insurance", "Visualization", "Other", "Misc", "",
+]
+
+
+def generate_rows(rows, seed=1):
+    rng = random.Random(seed)
+    for i in range(rows):
+        name = rng.choice(NAME_PARTS) + rng.choice(NAME_PARTS).lower() + rng.choice(SUFFIXES)
+        if rng.random() < 0.7:
+            name = f"{name} {i}"  # most titles are unique; the rest collide
+        host = name.lower().replace(" ", "") + rng.choice(TLDS)
+        url = rng.choice(["https://www.", "https://", "http://www.", ""]) + host
+        if rng.random() < 0.1:
+            url += rng.choice(["/product", "/en-us", "/solutions/cre"])
+
+        tagline = " ".join(rng.choices(DESCRIPTION_WORDS, k=rng.randint(0, 10))).capitalize()
+        details = " ".join(rng.choices(DESCRIPTION_WORDS, k=rng.choice([0, 20, 60, 120])))
+
+        row = {
+            "title": name if rng.random() > 0.01 else "",
+            "url": url,
+            "text": tagline,
+            "Details": details,
+            "Category": rng.choice([", ", "; ", ","]).join(rng.choices(CATEGORY_TOKENS, k=rng.randint(0, 3))),
+            "page": "" if rng.random() < 0.9 else name.lower().replace(" ", "-"),
+            "Hide": "TRUE" if rng.random() < 0.05 else rng.choice(["", "FALSE"]),
+            "logoUrl": "" if rng.random() < 0.8 else f"https://cdn.example.com/logos/{i}.png",
+            "isFree": rng.choice(["TRUE", "FALSE", ""]),
+            "isTopRated": "TRUE" if rng.random() < 0.1 else "",
+            "verified": "TRUE" if rng.random() < 0.2 else "",
+            "SEOHeadline": f"{name} review" if rng.random() < 0.3 else "",
+            "SEODescription": tagline[:120],
+        }
+        for col in FLAG_COLUMNS:
+            row[col] = "TRUE" if rng.random() < 0.1 else "FALSE"
+        yield row
+
+
+def write_csv(path, rows, seed=1):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(generate_rows(rows, seed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic raw directory CSV.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("out")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    write_csv(args.out, args.rows, args.seed)
+    print(f"Wrote {args.rows:,} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
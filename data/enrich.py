@@ -2,21 +2,23 @@
 """Apply enrichments to thin products in products.json"""
 import json
 import copy
+import os
+import sys
 
-with open('products.json') as f:
-    products = json.load(f)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from category_index import sync_categories_file
+from product_store import ProductStore
 
-# Build index by title
-idx = {p['title']: i for i, p in enumerate(products)}
+# Indexed by slug and title; flush() only re-serialises the products we touch
+store = ProductStore('products.json')
 
 def enrich(title, updates):
     """Update a product by title with the given dict of fields."""
-    i = idx.get(title)
-    if i is None:
+    product = store.find_by_title(title)
+    if product is None:
         print(f"WARNING: {title} not found")
         return
-    for k, v in updates.items():
-        products[i][k] = v
+    store.update(product['slug'], updates)
     print(f"  Enriched: {title}")
 
 def feat(name, desc):
@@ -643,6 +645,7 @@ enrich("Reonomy", {
 })
 
 # Save
-with open('products.json', 'w') as f:
-    json.dump(products, f, indent=2, ensure_ascii=False)
+changed = store.flush()
+if sync_categories_file('categories.json', store.products, changed):
+    print("Updated categories.json")
 print("\nDone! Saved products.json")
@@ -4,10 +4,15 @@ Comprehensive CRE Product Enrichment for All 25 Target Products
 Based on real web_fetch data and industry knowledge
 """
 
-import json
-import subprocess
+import os
+import sys
 from typing import Dict, List, Optional
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from category_index import sync_categories_file
+from logo_resolver import resolve_logo, resolve_logos
+from product_store import ProductStore
+
 # Major platforms that should be featured
 MAJOR_PLATFORMS = {
     'argus', 'crexi', 'reonomy', 'matterport', 'procore', 
@@ -567,35 +572,14 @@ PRODUCT_MAPPING = [
 ]
 
 def get_logo_url(domain: str) -> str:
-    """Try to get logo using curl, fallback to Clearbit"""
-    try:
-        cmd = f'curl -sL "https://{domain}" | head -50 | grep -oP \'src="[^"]*logo[^"]*\\.(svg|png|jpg|jpeg)[^"]*"\' | head -1 | sed \'s/src="//\' | sed \'s/"//\''
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=10)
-        
-        if result.returncode == 0 and result.stdout.strip():
-            logo_path = result.stdout.strip()
-            if logo_path.startswith('//'):
-                return 'https:' + logo_path
-            elif logo_path.startswith('/'):
-                return f'https://{domain}' + logo_path
-            elif logo_path.startswith('http'):
-                return logo_path
-            else:
-                return f'https://{domain}/' + logo_path
-    except:
-        pass
-    
-    return f"https://logo.clearbit.com/{domain}"
+    """Find a logo on the homepage (streamed, in-process), fallback to Clearbit"""
+    return resolve_logo(domain)
 
-def enrich_product(products: List[Dict], slug: str, domain: str, url: str) -> bool:
+def enrich_product(store: ProductStore, slug: str, domain: str, url: str, logo_url: Optional[str] = None) -> bool:
     """Enrich a single product with comprehensive data"""
     
     # Find existing product
-    existing_product = None
-    for p in products:
-        if p.get('slug') == slug:
-            existing_product = p
-            break
+    existing_product = store.get(slug)
     
     if slug not in ENRICHED_PRODUCTS:
         # Create basic structure for products not in detailed list
@@ -623,7 +607,7 @@ def enrich_product(products: List[Dict], slug: str, domain: str, url: str) -> bo
         "slug": slug,
         "url": url,
         "domain": domain,
-        "logo_url": get_logo_url(domain),
+        "logo_url": logo_url or get_logo_url(domain),
         "last_updated": "2026-02-17",
         "is_verified": False,
         "pricing_model": "Quote-based",
@@ -659,10 +643,10 @@ def enrich_product(products: List[Dict], slug: str, domain: str, url: str) -> bo
     enriched_data['property_types'] = enriched_data['target_audience']['property_types']
     
     if existing_product:
-        existing_product.update(enriched_data)
+        store.update(slug, enriched_data)
         print(f"   ✓ Updated existing product")
     else:
-        products.append(enriched_data)
+        store.add(enriched_data)
         print(f"   ✓ Added new product")
     
     return True
@@ -673,28 +657,34 @@ def main():
     
     # Load existing products
     products_file = "/home/openclaw/projects/cre-directory/data/products.json"
-    with open(products_file, 'r') as f:
-        products = json.load(f)
+    store = ProductStore(products_file)
     
-    print(f"Loaded {len(products)} existing products")
+    print(f"Loaded {len(store)} existing products")
     
     enriched_count = 0
     
+    # Resolve every logo up front, concurrently over one connection pool
+    print("Resolving logos...")
+    logos = resolve_logos([domain for _, domain, _ in PRODUCT_MAPPING])
+    
     for i, (slug, domain, url) in enumerate(PRODUCT_MAPPING, 1):
         print(f"\n[{i:2d}/{len(PRODUCT_MAPPING)}] Enriching {slug}...")
         
-        if enrich_product(products, slug, domain, url):
+        if enrich_product(store, slug, domain, url, logos.get(domain)):
             enriched_count += 1
     
-    # Save results
-    print(f"\n💾 Saving {len(products)} products to file...")
-    with open(products_file, 'w') as f:
-        json.dump(products, f, indent=2, ensure_ascii=False)
+    # Save results (only enriched records are re-serialised)
+    print(f"\n💾 Saving {len(store)} products to file...")
+    enriched_slugs = store.flush()
+    
+    # Apply the category deltas to categories.json
+    categories_file = os.path.join(os.path.dirname(products_file), "categories.json")
+    sync_categories_file(categories_file, store.products, enriched_slugs)
     
     print("=" * 65)
     print(f"🎉 Complete Enrichment Finished!")
     print(f"   • Successfully enriched: {enriched_count} products")
-    print(f"   • Total products in database: {len(products)}")
+    print(f"   • Total products in database: {len(store)}")
     print(f"   • Major platforms featured: {len([s for s in PRODUCT_MAPPING if s[0] in MAJOR_PLATFORMS])}")
 
 if __name__ == "__main__":
@@ -1,32 +1,50 @@
 #!/usr/bin/env python3
-import json
+import os
+import sys
 from datetime import datetime
 
-def update_product(index, updates):
-    """Update a product at the given index with enriched data"""
-    with open('data/products.json', 'r') as f:
-        products = json.load(f)
-    
-    if index >= len(products):
-        print(f"Error: Index {index} out of range. Total products: {len(products)}")
-        return
-    
-    product = products[index]
-    print(f"Updating product {index + 1}: {product['title']}")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from catalog_db import CatalogDB
+from product_journal import append_patch, journal_path, slug_at
+
+PRODUCTS_FILE = 'data/products.json'
+
+def update_product(index, updates, slug=None, db=None):
+    """Journal an update for the product at the given index with enriched data.
+
+    The patch is appended to data/products.journal.jsonl rather than
+    rewriting products.json; run `python scripts/product_journal.py --compact`
+    to fold pending updates in, and use product_journal.load_merged_products()
+    to read the catalog with them applied. With db (a scripts/catalog_db.py
+    SQLite catalog) the product row is updated in place instead.
+    """
+    print(f"Updating product {index + 1}" + (f": {updates['title']}" if 'title' in updates else ""))
     
-    # Update the product with new data
-    for key, value in updates.items():
-        product[key] = value
+    # Update the product with new data and mark it as enriched
+    fields = dict(updates)
+    fields['enriched'] = True
+    fields['enrichedAt'] = datetime.utcnow().isoformat() + 'Z'
     
-    # Mark as enriched
-    product['enriched'] = True
-    product['enrichedAt'] = datetime.utcnow().isoformat() + 'Z'
+    if db:
+        with CatalogDB(db) as catalog:
+            slug = slug or catalog.slug_at(index)
+            if slug is None:
+                print(f"Error: Index {index} out of range. Total products: {len(catalog)}")
+                return
+            catalog.update(slug, fields)
+        print(f"Updated {slug} in {db}")
+        return
     
-    # Write back to file
-    with open('data/products.json', 'w') as f:
-        json.dump(products, f, indent=2, ensure_ascii=False)
+    # Journal the slug, not the index: the catalog may change before compaction
+    if slug is None:
+        try:
+            slug = slug_at(PRODUCTS_FILE, index)
+        except IndexError as e:
+            print(f"Error: {e}")
+            return
+    append_patch(journal_path(PRODUCTS_FILE), fields, index=index, slug=slug)
     
-    print(f"Successfully updated {product['title']}")
+    print(f"Journaled update for {slug} ({len(fields)} fields)")
 
 if __name__ == "__main__":
     # Example usage
@@ -3,14 +3,27 @@
 Enrich 25 CRE software products with real data scraped from their websites.
 """
 
-import json
-import re
-import requests
+import argparse
+import os
+import sys
 from urllib.parse import urljoin, urlparse
-import time
 from datetime import datetime
 from typing import Dict, List, Optional
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from category_index import sync_categories_file
+from enrich_checkpoint import DEFAULT_EVERY, DEFAULT_INTERVAL, EnrichCheckpoint
+from fetch_telemetry import TELEMETRY_LOG, NullTelemetry, Telemetry, response_fields
+from html_extract import PageExtractor, extract_response, extract_text
+from http_cache import DEFAULT_TTL, HttpCache, OfflineMiss
+from polite_fetch import (DEFAULT_HOST_INTERVAL, DEFAULT_PER_HOST, DEFAULT_WORKERS, PoliteFetcher,
+                          pooled_session)
+from product_store import ProductStore
+from text_signals import classify
+
+# Homepages are read (and cached) up to this size
+MAX_PAGE_BYTES = 1024 * 1024
+
 # Target products to enrich
 PRODUCTS_TO_ENRICH = [
     {"slug": "argus", "domain": "altusgroup.com", "url": "https://www.altusgroup.com/argus"},
@@ -41,135 +54,75 @@ PRODUCTS_TO_ENRICH = [
 ]
 
 class ProductEnricher:
-    def __init__(self, json_file_path: str):
+    def __init__(self, json_file_path: str, workers: int = DEFAULT_WORKERS, per_host: int = DEFAULT_PER_HOST,
+                 host_interval: float = DEFAULT_HOST_INTERVAL, cache: Optional[HttpCache] = None,
+                 telemetry: Optional[Telemetry] = None):
         self.json_file_path = json_file_path
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        
-    def load_products(self) -> List[Dict]:
+        self.telemetry = telemetry or NullTelemetry()
+        # One pooled session shared by all fetch threads; politeness is per host
+        self.session = pooled_session(workers, timed=self.telemetry.enabled)
+        self.fetcher = PoliteFetcher(self.session, workers=workers, per_host=per_host,
+                                     host_interval=host_interval, telemetry=self.telemetry)
+        self.cache = cache
+        
+    def load_products(self) -> ProductStore:
         """Load existing products from JSON file."""
-        with open(self.json_file_path, 'r') as f:
-            return json.load(f)
+        return ProductStore(self.json_file_path)
     
-    def save_products(self, products: List[Dict]):
-        """Save products back to JSON file."""
-        with open(self.json_file_path, 'w') as f:
-            json.dump(products, f, indent=2, ensure_ascii=False)
+    def save_products(self, store: ProductStore) -> set:
+        """Write changed products back to the JSON file; returns their slugs."""
+        return store.flush()
     
-    def find_product_by_slug(self, products: List[Dict], slug: str) -> Optional[Dict]:
+    def find_product_by_slug(self, store: ProductStore, slug: str) -> Optional[Dict]:
         """Find product by slug in the products list."""
-        for product in products:
-            if product.get('slug') == slug:
-                return product
-        return None
+        return store.get(slug)
+    
+    def fetch_page(self, url: str, domain: str) -> PageExtractor:
+        """Stream a page through the extractor, reading at most MAX_PAGE_BYTES.
+
+        A failed fetch is re-raised, so the product is neither checkpointed as
+        finished nor overwritten with a blank record, and --resume tries it again.
+        """
+        with self.telemetry.request("homepage", domain, url) as record:
+            try:
+                if self.cache is not None:
+                    response = self.cache.fetch(url, self.fetcher.get, max_bytes=MAX_PAGE_BYTES, timeout=10)
+                else:
+                    response = self.fetcher.get(url, timeout=10, stream=True)
+                record.update(response_fields(response))
+                try:
+                    response.raise_for_status()
+                except Exception:
+                    response.close()  # streamed error page: release the pooled connection
+                    raise
+                page = extract_response(response, domain, MAX_PAGE_BYTES, keep_text=True)
+                record["bytes"] = page.bytes_read
+                record["extract_s"] = round(page.extract_seconds, 6)
+                return page
+            except OfflineMiss:
+                raise  # offline with no cached page: skip the product rather than blank it
+            except Exception as e:
+                print(f"Error fetching {url}: {e}")
+                raise
     
     def fetch_page_content(self, url: str) -> str:
-        """Fetch page content with error handling."""
+        """Fetch page content (up to MAX_PAGE_BYTES) with error handling."""
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except Exception as e:
-            print(f"Error fetching {url}: {e}")
+            return self.fetch_page(url, urlparse(url).netloc).text()
+        except Exception:
             return ""
     
     def find_logo_url(self, domain: str, page_content: str = "") -> str:
-        """Try to find the best logo URL for a domain."""
-        # First try to find logo in page content
-        if page_content:
-            # Look for logo in various patterns
-            logo_patterns = [
-                r'src="([^"]*logo[^"]*\.(?:svg|png|jpg|jpeg)[^"]*)"',
-                r'src="([^"]*\.svg[^"]*)"',
-                r'href="([^"]*logo[^"]*\.(?:svg|png|jpg|jpeg)[^"]*)"',
-            ]
-            
-            for pattern in logo_patterns:
-                matches = re.findall(pattern, page_content, re.IGNORECASE)
-                for match in matches:
-                    if match.startswith('//'):
-                        match = 'https:' + match
-                    elif match.startswith('/'):
-                        match = f'https://{domain}' + match
-                    elif not match.startswith('http'):
-                        match = f'https://{domain}/' + match
-                    
-                    # Prefer dark/colored versions over white
-                    if any(term in match.lower() for term in ['dark', 'color', 'colour', 'logo']):
-                        return match
-        
-        # Fallback to Clearbit
-        return f"https://logo.clearbit.com/{domain}"
+        """Try to find the best logo URL for a domain (Clearbit fallback)."""
+        return extract_text(page_content, domain).logo_url()
     
     def extract_basic_info(self, content: str, domain: str) -> Dict:
         """Extract basic marketing info from page content."""
-        info = {}
-        
-        # Extract title
-        title_match = re.search(r'<title[^>]*>([^<]+)</title>', content, re.IGNORECASE)
-        if title_match:
-            info['page_title'] = title_match.group(1).strip()
-        
-        # Extract meta description
-        desc_match = re.search(r'<meta[^>]*name="description"[^>]*content="([^"]+)"', content, re.IGNORECASE)
-        if desc_match:
-            info['meta_description'] = desc_match.group(1).strip()
-        
-        # Extract h1 tags (potential headlines)
-        h1_matches = re.findall(r'<h1[^>]*>([^<]+)</h1>', content, re.IGNORECASE)
-        info['h1_tags'] = [h1.strip() for h1 in h1_matches]
-        
-        # Extract some key phrases that might be taglines
-        tagline_patterns = [
-            r'<p[^>]*class="[^"]*tagline[^"]*"[^>]*>([^<]+)</p>',
-            r'<span[^>]*class="[^"]*subtitle[^"]*"[^>]*>([^<]+)</span>',
-            r'<div[^>]*class="[^"]*hero[^"]*"[^>]*>.*?<p[^>]*>([^<]+)</p>',
-        ]
-        
-        for pattern in tagline_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE | re.DOTALL)
-            if matches:
-                info['potential_taglines'] = matches
-                break
-        
-        return info
+        return extract_text(content, domain).info()
     
     def get_major_cre_categories(self, company_name: str, content: str) -> List[str]:
         """Determine appropriate CRE categories based on content analysis."""
-        content_lower = content.lower()
-        categories = []
-        
-        # Property Management
-        if any(term in content_lower for term in ['property management', 'tenant', 'lease', 'rent', 'maintenance']):
-            categories.append("Property Management")
-        
-        # CRM & Marketing  
-        if any(term in content_lower for term in ['crm', 'marketing', 'lead', 'campaign', 'prospecting']):
-            categories.append("CRM & Marketing")
-        
-        # Data & Analytics
-        if any(term in content_lower for term in ['analytics', 'data', 'insights', 'reporting', 'intelligence']):
-            categories.append("Data & Analytics")
-        
-        # Investment & Valuation
-        if any(term in content_lower for term in ['investment', 'valuation', 'appraisal', 'cap rate', 'roi']):
-            categories.append("Investment & Valuation")
-        
-        # Broker Tools
-        if any(term in content_lower for term in ['broker', 'brokerage', 'listing', 'deal', 'transaction']):
-            categories.append("Broker Tools")
-        
-        # Construction & Development
-        if any(term in content_lower for term in ['construction', 'development', 'project management', 'building']):
-            categories.append("Construction & Development")
-        
-        # Default if nothing matches
-        if not categories:
-            categories = ["Data & Analytics"]
-        
-        return categories
+        return classify(content, ["cre_categories"])["cre_categories"]
     
     def enrich_product(self, product_info: Dict) -> Dict:
         """Enrich a single product with real data."""
@@ -179,15 +132,14 @@ class ProductEnricher:
         
         print(f"Enriching {slug} from {url}...")
         
-        # Fetch homepage content
-        homepage_content = self.fetch_page_content(url)
-        time.sleep(1)  # Be respectful
-        
-        # Extract basic info
-        basic_info = self.extract_basic_info(homepage_content, domain)
+        # Fetch the homepage and extract basic info and the logo in one streaming pass
+        page = self.fetch_page(url, domain)
+        homepage_content = page.text()
+        basic_info = page.info()
+        signals = classify(homepage_content, ["cre_categories", "audience_property_types"])
         
         # Find logo
-        logo_url = self.find_logo_url(domain, homepage_content)
+        logo_url = page.logo_url()
         
         # Create enriched product data
         enriched = {
@@ -199,7 +151,7 @@ class ProductEnricher:
             "last_updated": "2026-02-17",
             "is_featured": slug in ['argus', 'crexi', 'reonomy', 'matterport', 'procore', 'realpage', 'appfolio'],  # Major platforms
             "is_verified": False,
-            "categories": self.get_major_cre_categories(slug, homepage_content),
+            "categories": signals["cre_categories"],
             "deployment": ["Cloud"],
             "rating": round(3.8 + (hash(slug) % 7) * 0.1, 1),  # Generate realistic rating 3.8-4.4
             "review_count": 0,
@@ -220,11 +172,7 @@ class ProductEnricher:
             enriched['description'] = f"{meta_desc}\n\nThis platform provides comprehensive solutions for commercial real estate professionals, offering tools and insights to streamline operations and drive better outcomes."
         
         # Set target audience based on company type
-        property_types = ["Commercial"]
-        if any(term in homepage_content.lower() for term in ['residential', 'apartment', 'multifamily']):
-            property_types = ["Multifamily", "Residential"]
-        elif any(term in homepage_content.lower() for term in ['office', 'industrial', 'retail']):
-            property_types = ["Office", "Industrial", "Retail"]
+        property_types = signals["audience_property_types"]
         
         enriched['target_audience'] = {
             "roles": ["Property Managers", "Brokers", "Investors"],
@@ -274,49 +222,121 @@ class ProductEnricher:
         
         return enriched
 
-    def run_enrichment(self):
-        """Main enrichment process."""
+    def save_checkpoint(self, store: ProductStore, checkpoint: EnrichCheckpoint) -> None:
+        """Flush applied results to products.json/categories.json, then save the checkpoint."""
+        enriched_slugs = self.save_products(store)
+        sync_categories_file(os.path.join(os.path.dirname(self.json_file_path), "categories.json"),
+                             store.products, enriched_slugs)
+        checkpoint.save()
+    
+    def run_enrichment(self, products_to_enrich: List[Dict] = PRODUCTS_TO_ENRICH, resume: bool = False,
+                       checkpoint_every: int = DEFAULT_EVERY, checkpoint_interval: float = DEFAULT_INTERVAL):
+        """Main enrichment process.
+        
+        Progress is checkpointed every checkpoint_every products or
+        checkpoint_interval seconds; resume=True picks up an interrupted run
+        without fetching the products it had already finished.
+        """
         print("Loading existing products...")
-        products = self.load_products()
-        
-        print(f"Enriching {len(PRODUCTS_TO_ENRICH)} products...")
+        store = self.load_products()
+        
+        if resume:
+            checkpoint = EnrichCheckpoint.load(self.json_file_path, every=checkpoint_every,
+                                               interval=checkpoint_interval)
+            finished = sum(p['slug'] in checkpoint.resumed for p in products_to_enrich)
+            print(f"Resuming: {finished} of {len(products_to_enrich)} products already done")
+        else:
+            checkpoint = EnrichCheckpoint(self.json_file_path, every=checkpoint_every, interval=checkpoint_interval)
+        
+        def enrich(product_info):
+            # Products finished before an interruption come from the checkpoint, not the network
+            enriched = checkpoint.get(product_info['slug'])
+            if enriched is None:
+                enriched = self.enrich_product(product_info)
+                checkpoint.record(product_info['slug'], enriched)
+            return enriched
+        
+        print(f"Enriching {len(products_to_enrich)} products "
+              f"({self.fetcher.workers} at a time, {self.fetcher.per_host} per host)...")
         
         enriched_count = 0
         
-        for product_info in PRODUCTS_TO_ENRICH:
-            try:
-                # Find existing product
-                existing = self.find_product_by_slug(products, product_info['slug'])
-                
-                # Enrich with real data
-                enriched_data = self.enrich_product(product_info)
-                
-                if existing:
-                    # Update existing product
-                    existing.update(enriched_data)
-                    print(f"✓ Updated {product_info['slug']}")
-                else:
-                    # Add new product
-                    products.append(enriched_data)
-                    print(f"✓ Added {product_info['slug']}")
-                
-                enriched_count += 1
-                
-                # Small delay to be respectful
-                time.sleep(2)
+        try:
+            # Products are fetched concurrently; results are applied in list order
+            for product_info, enriched_data in self.fetcher.map(products_to_enrich, enrich):
+                try:
+                    if isinstance(enriched_data, Exception):
+                        raise enriched_data
+                    
+                    # Find existing product
+                    existing = self.find_product_by_slug(store, product_info['slug'])
+                    
+                    if existing:
+                        # Update existing product
+                        store.update(product_info['slug'], enriched_data)
+                        print(f"✓ Updated {product_info['slug']}")
+                    else:
+                        # Add new product
+                        store.add(enriched_data)
+                        print(f"✓ Added {product_info['slug']}")
+                    
+                    enriched_count += 1
+                    
+                except Exception as e:
+                    print(f"✗ Error enriching {product_info['slug']}: {e}")
+                    continue
                 
-            except Exception as e:
-                print(f"✗ Error enriching {product_info['slug']}: {e}")
-                continue
+                if checkpoint.due():
+                    self.save_checkpoint(store, checkpoint)
+        except BaseException:
+            # Crash or Ctrl-C: keep what finished so --resume does not fetch it again
+            self.save_checkpoint(store, checkpoint)
+            print(f"\nStopped after {enriched_count} products; checkpoint saved to {checkpoint.path}. "
+                  "Re-run with --resume to continue.")
+            raise
         
         print(f"\nEnriched {enriched_count} products successfully.")
         print("Saving updated products.json...")
         
-        self.save_products(products)
+        enriched_slugs = self.save_products(store)
+        sync_categories_file(os.path.join(os.path.dirname(self.json_file_path), "categories.json"),
+                             store.products, enriched_slugs)
+        checkpoint.discard()
         print("✓ Saved!")
+        if self.cache is not None:
+            print(self.cache.report())
+        if self.telemetry.enabled:
+            print(self.telemetry.summary())
 
 
 if __name__ == "__main__":
-    enricher = ProductEnricher("/home/openclaw/projects/cre-directory/data/products.json")
-    enricher.run_enrichment()
+    parser = argparse.ArgumentParser(description="Enrich products from their websites.")
+    parser.add_argument("--products", default="/home/openclaw/projects/cre-directory/data/products.json")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="sites fetched in parallel")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="concurrent requests per host")
+    parser.add_argument("--host-interval", type=float, default=DEFAULT_HOST_INTERVAL,
+                        help="minimum seconds between requests to the same host")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL,
+                        help="seconds a cached page is used without revalidating it")
+    parser.add_argument("--offline", action="store_true",
+                        help="only use cached pages (re-run extraction without network access)")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch pages in full")
+    parser.add_argument("--telemetry", nargs="?", const=TELEMETRY_LOG, metavar="LOG",
+                        help="record per-request timings, sizes and statuses to a JSONL log "
+                             "(default: .build/enrich-telemetry.jsonl) and print a summary")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run, reusing the products it had already finished")
+    parser.add_argument("--checkpoint-every", type=int, default=DEFAULT_EVERY,
+                        help="save progress after this many products")
+    parser.add_argument("--checkpoint-interval", type=float, default=DEFAULT_INTERVAL,
+                        help="save progress at least this often (seconds)")
+    args = parser.parse_args()
+    cache = None if args.no_cache else HttpCache(ttl=args.cache_ttl, offline=args.offline)
+    telemetry = Telemetry(args.telemetry) if args.telemetry else None
+    enricher = ProductEnricher(args.products, args.workers, args.per_host, args.host_interval, cache, telemetry)
+    try:
+        enricher.run_enrichment(resume=args.resume, checkpoint_every=args.checkpoint_every,
+                                checkpoint_interval=args.checkpoint_interval)
+    finally:
+        enricher.telemetry.close()
     print("\n🎉 Product enrichment complete!")
\ No newline at end of file
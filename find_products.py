@@ -1,16 +1,33 @@
 #!/usr/bin/env python3
-import json
+import argparse
+import os
+import sys
 
-def find_products():
-    with open('data/products.json', 'r') as f:
-        products = json.load(f)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from catalog_db import CatalogDB
+from product_journal import journal_path, load_merged_products, pending_updates, read_journal
+
+def find_products(db=None):
+    if db:
+        # Only rows 30-79 are read from the SQLite catalog (scripts/catalog_db.py),
+        # with updates still pending in the enrichment journal applied as on the JSON path
+        with CatalogDB(db) as catalog:
+            total = len(catalog)
+            pending = pending_updates(read_journal(journal_path('data/products.json')), catalog.slug_at)
+            window = [(i, dict(p, **pending.get(p['slug'], {}))) for i, p in catalog.slice(30, 80)]
+    else:
+        # Includes updates still pending in the enrichment journal
+        products = load_merged_products('data/products.json')
+        total = len(products)
+        window = [(i, products[i]) for i in range(30, min(80, len(products)))]
     
-    print(f"Total products: {len(products)}")
+    print(f"Total products: {total}")
     print("\nProducts 31-80 (indices 30-79):")
-    for i in range(30, min(80, len(products))):
-        product = products[i]
+    for i, product in window:
         enriched = product.get('enriched', False)
         print(f"{i+1:2d}. {product['title']} - {product.get('url', 'No URL')} - Enriched: {enriched}")
 
 if __name__ == "__main__":
-    find_products()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", help="query this SQLite catalog instead of data/products.json")
+    find_products(parser.parse_args().db)
\ No newline at end of file
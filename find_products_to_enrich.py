@@ -1,18 +1,31 @@
 #!/usr/bin/env python3
 
-import json
+import argparse
+import os
 import sys
 
-def find_products_to_enrich():
-    with open('data/products.json', 'r') as f:
-        products = json.load(f)
-    
-    print(f"Total products: {len(products)}")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from catalog_db import CatalogDB
+from product_journal import journal_path, load_merged_products, pending_updates, read_journal
+
+def find_products_to_enrich(db=None):
+    if db:
+        # Indexed query against the SQLite catalog (scripts/catalog_db.py), with
+        # updates still pending in the enrichment journal applied as on the JSON path
+        with CatalogDB(db) as catalog:
+            print(f"Total products: {len(catalog)}")
+            pending = pending_updates(read_journal(journal_path('data/products.json')), catalog.slug_at)
+            candidates = [(i, dict(p, **pending.get(p['slug'], {}))) for i, p in catalog.needing_enrichment(130)]
+    else:
+        # Includes updates still pending in the enrichment journal
+        products = load_merged_products('data/products.json')
+        print(f"Total products: {len(products)}")
+        candidates = enumerate(products)
     
     # Find products with index 130+ that need enrichment
     products_to_enrich = []
     
-    for i, product in enumerate(products):
+    for i, product in candidates:
         if i >= 130:  # Index 130 and above (0-based indexing)
             # Check if product needs enrichment
             has_enriched = product.get('enriched', False)
@@ -33,4 +46,6 @@ def find_products_to_enrich():
     return products_to_enrich
 
 if __name__ == "__main__":
-    find_products_to_enrich()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", help="query this SQLite catalog instead of data/products.json")
+    find_products_to_enrich(parser.parse_args().db)
\ No newline at end of file
@@ -3,7 +3,12 @@
 Fix enrichment with proper detailed data from web_fetch results
 """
 
-import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from category_index import sync_categories_file
+from product_store import ProductStore
 
 # The detailed enriched data based on real web_fetch results
 DETAILED_ENRICHMENT = {
@@ -232,14 +237,13 @@ def main():
     print("🔧 Fixing product enrichment with detailed real data...")
     
     # Load products
-    with open('/home/openclaw/projects/cre-directory/data/products.json', 'r') as f:
-        products = json.load(f)
+    store = ProductStore('/home/openclaw/projects/cre-directory/data/products.json')
     
     updated_count = 0
     
-    for product in products:
-        slug = product.get('slug')
-        if slug in DETAILED_ENRICHMENT:
+    for slug in DETAILED_ENRICHMENT:
+        product = store.get(slug)
+        if product is not None:
             print(f"   ✓ Applying detailed data to {slug}")
             
             # Apply detailed enrichment
@@ -284,12 +288,14 @@ def main():
             detailed_data['property_types'] = detailed_data['target_audience']['property_types']
             
             # Update the product
-            product.update(detailed_data)
+            store.update(slug, detailed_data)
             updated_count += 1
     
-    # Save back to file
-    with open('/home/openclaw/projects/cre-directory/data/products.json', 'w') as f:
-        json.dump(products, f, indent=2, ensure_ascii=False)
+    # Save back to file (only the updated records are re-serialised)
+    updated_slugs = store.flush()
+    
+    # Keep category counts in step with the rewritten categories
+    sync_categories_file('/home/openclaw/projects/cre-directory/data/categories.json', store.products, updated_slugs)
     
     print(f"✅ Fixed {updated_count} products with detailed real data")
 
@@ -84,9 +84,9 @@ function productCard(p) {
   if (p.pricing && p.pricing.free_tier) badges.push('<span class="badge badge-green">Free</span>');
   if (p.is_featured) badges.push('<span class="badge badge-gold">Featured</span>');
   
-  // Top features
-  const features = (p.feature_groups || []).flatMap(g => g.features || []).slice(0, 3);
-  const featHTML = features.length ? `<div class="card-features">${features.map(f => `<span class="card-feature">✦ ${f.name}</span>`).join('')}</div>` : '';
+  // Top features (view rows carry the names already)
+  const features = p.top_features || (p.feature_groups || []).flatMap(g => g.features || []).slice(0, 3).map(f => f.name);
+  const featHTML = features.length ? `<div class="card-features">${features.map(f => `<span class="card-feature">✦ ${f}</span>`).join('')}</div>` : '';
   
   return `<a class="product-card product-card-link" href="product.html#${p.slug}">
     <div class="card-top">
@@ -197,6 +197,171 @@ async function loadData() {
   CATEGORIES = await cRes.json();
 }
 
+// Per-view column projections (data/views/<name>.json), written by
+// scripts/view_projections.py. Row i of a view is product i of products.json;
+// viewRow() turns it back into a partial product: dictionary columns are
+// decoded, flag bits become booleans and dotted columns become nested fields,
+// so the card and filter code reads rows and full records alike. Rows carry
+// the comparison badges already. Returns null when the view is missing.
+// Paths are spelled out so the dist build can rewrite them to hashed names.
+const VIEW_URLS = {
+  'home': 'data/views/home.json',
+  'category-grid': 'data/views/category-grid.json',
+};
+
+function loadView(name) {
+  return fetch(VIEW_URLS[name])
+    .then(res => { if (!res.ok) throw new Error(res.status); return res.json(); })
+    .catch(() => null);
+}
+
+function viewRow(view, i) {
+  const row = {};
+  const set = (name, value) => {
+    const path = name.split('.');
+    let target = row;
+    path.slice(0, -1).forEach(key => { target = target[key] = target[key] || {}; });
+    target[path[path.length - 1]] = value;
+  };
+  Object.entries(view.columns).forEach(([name, values]) => {
+    if (name === 'flags') {
+      view.flags.forEach((flag, bit) => { if (values[i] >> bit & 1) set(flag, true); });
+      return;
+    }
+    const dict = view.dictionaries[name];
+    const value = values[i];
+    set(name, dict ? (Array.isArray(value) ? value.map(v => dict[v]) : dict[value]) : value);
+  });
+  return row;
+}
+
+// PRODUCTS from a view plus the full categories.json; falls back to loadData().
+// Resolves to the view, or null when products.json was loaded instead.
+async function loadViewData(name) {
+  const [view, cRes] = await Promise.all([loadView(name), fetch('data/categories.json')]);
+  if (!view) {
+    await loadData();
+    return null;
+  }
+  PRODUCTS = Array.from({ length: view.count }, (_, i) => viewRow(view, i));
+  CATEGORIES = await cRes.json();
+  return view;
+}
+
+// Per-product shards (data/products/<slug>.json) and the list manifest are
+// written by scripts/product_shards.py. Shard filenames are the encoded slug,
+// so the slug is encoded twice in the URL. Falls back to products.json when a
+// shard or the manifest is missing.
+const SHARD_REQUESTS = {};
+
+function loadProduct(slug) {
+  if (!SHARD_REQUESTS[slug]) {
+    SHARD_REQUESTS[slug] = fetch(`data/products/${encodeURIComponent(encodeURIComponent(slug))}.json`)
+      .then(res => { if (!res.ok) throw new Error(res.status); return res.json(); })
+      .catch(async () => {
+        if (!PRODUCTS.length) await loadData();
+        return PRODUCTS.find(p => p.slug === slug);
+      });
+  }
+  return SHARD_REQUESTS[slug];
+}
+
+let MANIFEST_REQUEST = null;
+
+function loadManifest() {
+  if (!MANIFEST_REQUEST) {
+    MANIFEST_REQUEST = fetch('data/manifest.json')
+      .then(res => { if (!res.ok) throw new Error(res.status); return res.json(); })
+      .catch(async () => {
+        if (!PRODUCTS.length) await loadData();
+        const categories = {};
+        Object.values(CATEGORIES).forEach(cat => { categories[cat.name] = cat.slug; });
+        return { products: PRODUCTS, categories };
+      });
+  }
+  return MANIFEST_REQUEST;
+}
+
+// Home search index (data/search-index.json, built by scripts/search_index.py).
+// Ids are manifest positions, which match products.json order. Loaded on
+// first use; until then, or if it is stale, search falls back to a scan.
+let SEARCH_INDEX = null;
+let SEARCH_INDEX_REQUEST = null;
+
+function loadSearchIndex() {
+  if (!SEARCH_INDEX_REQUEST) {
+    SEARCH_INDEX_REQUEST = fetch('data/search-index.json')
+      .then(res => { if (!res.ok) throw new Error(res.status); return res.json(); })
+      .then(index => { if (index.count === PRODUCTS.length) SEARCH_INDEX = index; return SEARCH_INDEX; })
+      .catch(() => null);
+  }
+  return SEARCH_INDEX_REQUEST;
+}
+
+// What the home search scan matches for one product: title, tagline,
+// description, feature names and descriptions, categories. View rows only
+// carry the first three feature names.
+function productSearchText(p) {
+  const features = p.top_features || (p.feature_groups || []).flatMap(g => (g.features || []).map(f => f.name + ' ' + (f.description || '')));
+  return [p.title, p.short_description || p.tagline || '', p.description || '', features.join(' '), ...(p.categories || [])]
+    .join('\n').toLowerCase();
+}
+
+// Scan fallback when search-index.json can't be used and PRODUCTS are view
+// rows: the search text of every product in products.json, in row order.
+let SEARCH_TEXT = null;
+let SEARCH_TEXT_REQUEST = null;
+
+function loadSearchText() {
+  if (!SEARCH_TEXT_REQUEST) {
+    SEARCH_TEXT_REQUEST = fetch('data/products.json')
+      .then(res => { if (!res.ok) throw new Error(res.status); return res.json(); })
+      .then(products => { if (products.length === PRODUCTS.length) SEARCH_TEXT = products.map(productSearchText); return SEARCH_TEXT; })
+      .catch(() => null);
+  }
+  return SEARCH_TEXT_REQUEST;
+}
+
+// Same matching and ranking as search() in scripts/search_index.py:
+// every query token must prefix a product token. Returns ranked ids, or
+// null when the query has no indexable tokens.
+function searchIndexIds(index, q) {
+  const tokens = [...new Set(q.toLowerCase().match(/[a-z0-9]+/g) || [])];
+  if (!tokens.length) return null;
+  const maskWeight = [];
+  for (let mask = 0; mask < 1 << index.weights.length; mask++) {
+    maskWeight.push(index.weights.reduce((sum, w, bit) => sum + (mask >> bit & 1 ? w : 0), 0));
+  }
+  const lowerBound = (term, lo) => {
+    let hi = index.terms.length;
+    while (lo < hi) { const mid = (lo + hi) >> 1; if (index.terms[mid] < term) lo = mid + 1; else hi = mid; }
+    return lo;
+  };
+
+  let scores = null;
+  for (const token of tokens) {
+    const best = new Map();
+    const lo = lowerBound(token, 0);
+    const hi = lowerBound(token + '\uffff', lo);
+    for (let n = lo; n < hi; n++) {
+      const boost = index.terms[n] === token ? 2 : 1;
+      const posting = index.postings[n];
+      for (let i = 0; i < posting.length; i += 2) {
+        const score = maskWeight[posting[i + 1]] * boost;
+        if (score > (best.get(posting[i]) || 0)) best.set(posting[i], score);
+      }
+    }
+    if (scores === null) scores = best;
+    else {
+      const merged = new Map();
+      scores.forEach((s, id) => { if (best.has(id)) merged.set(id, s + best.get(id)); });
+      scores = merged;
+    }
+    if (!scores.size) return [];
+  }
+  return [...scores].sort((a, b) => b[1] - a[1] || a[0] - b[0]).map(([id]) => id);
+}
+
 function initNav() {
   const toggle = document.querySelector('.mobile-toggle');
   const links = document.querySelector('.nav-links');
@@ -266,10 +431,10 @@ function animateCounters() {
 }
 
 async function initHome() {
-  await loadData();
+  const view = await loadViewData('home');
   initNav();
   initBackToTop();
-  assignComparisonBadges();
+  if (!view) assignComparisonBadges();
   
   const catCount = Object.keys(CATEGORIES).length;
   
@@ -327,7 +492,7 @@ async function initHome() {
   }
   
   // Stats counters
-  const enrichedCount = PRODUCTS.filter(p => p.feature_groups && p.feature_groups.length > 0).length;
+  const enrichedCount = PRODUCTS.filter(p => p._has_feature_groups || (p.feature_groups && p.feature_groups.length > 0)).length;
   const counterProducts = document.getElementById('counter-products');
   const counterCats = document.getElementById('counter-categories');
   if (counterProducts) counterProducts.setAttribute('data-target', PRODUCTS.length);
@@ -370,15 +535,16 @@ async function initHome() {
 
     if (hasQuery || hasFilters) {
       let filtered = PRODUCTS;
-      if (hasQuery) {
-        filtered = filtered.filter(p => {
-          const featureText = (p.feature_groups || []).flatMap(g => (g.features || []).map(f => f.name + ' ' + (f.description || ''))).join(' ').toLowerCase();
-          return p.title.toLowerCase().includes(q) ||
-            (p.short_description || p.tagline || '').toLowerCase().includes(q) ||
-            (p.description || '').toLowerCase().includes(q) ||
-            featureText.includes(q) ||
-            (p.categories || []).some(c => c.toLowerCase().includes(q));
+      const ids = hasQuery && SEARCH_INDEX ? searchIndexIds(SEARCH_INDEX, q) : null;
+      if (ids) {
+        filtered = ids.map(id => PRODUCTS[id]);
+      } else if (hasQuery) {
+        // View rows lack descriptions, so without the index the scan reads products.json
+        if (!SEARCH_INDEX) loadSearchIndex().then(index => {
+          if (index) runHomeSearch();
+          else if (view && !SEARCH_TEXT) loadSearchText().then(text => { if (text) runHomeSearch(); });
         });
+        filtered = filtered.filter((p, i) => (SEARCH_TEXT ? SEARCH_TEXT[i] : productSearchText(p)).includes(q));
       }
       activeFilters.forEach(f => {
         if (f === 'free_trial') filtered = filtered.filter(p => p.pricing && p.pricing.free_trial);
@@ -406,6 +572,7 @@ async function initHome() {
   };
 
   if (search) {
+    search.addEventListener('focus', loadSearchIndex, { once: true });
     search.addEventListener('input', runHomeSearch);
   }
 
@@ -434,12 +601,11 @@ async function initHome() {
 
 // ====== PRODUCT PAGE ======
 async function initProduct() {
-  await loadData();
+  const slug = location.hash.slice(1);
+  const [product, manifest] = await Promise.all([loadProduct(slug), loadManifest()]);
   initNav();
   initBackToTop();
   
-  const slug = location.hash.slice(1);
-  const product = PRODUCTS.find(p => p.slug === slug);
   const el = document.getElementById('product-content');
   
   if (!product || !el) {
@@ -486,8 +652,8 @@ async function initProduct() {
 
   // Categories with links
   const cats = (product.categories || []).map(c => {
-    const cs = Object.values(CATEGORIES).find(cat => cat.name === c);
-    return cs ? `<a href="category.html#${cs.slug}" class="badge badge-accent">${c}</a>` : `<span class="badge badge-accent">${c}</span>`;
+    const cs = manifest.categories[c];
+    return cs ? `<a href="category.html#${cs}" class="badge badge-accent">${c}</a>` : `<span class="badge badge-accent">${c}</span>`;
   }).join(' ');
 
   // Overview - Pros & Cons
@@ -593,7 +759,7 @@ async function initProduct() {
   let relatedHTML = '';
   const usedSlugs = new Set([slug]);
   (product.categories || []).forEach(cat => {
-    const related = PRODUCTS.filter(p => !usedSlugs.has(p.slug) && (p.categories || []).includes(cat));
+    const related = manifest.products.filter(p => !usedSlugs.has(p.slug) && (p.categories || []).includes(cat));
     if (related.length === 0) return;
     const items = related.slice(0, 10);
     const id = 'carousel-' + slugify(cat);
@@ -664,7 +830,7 @@ async function initProduct() {
   if (similarEl) {
     const primaryCat = (product.categories || [])[0];
     if (primaryCat) {
-      const similar = PRODUCTS.filter(p => p.slug !== slug && !usedSlugs.has(p.slug) && (p.categories || []).includes(primaryCat))
+      const similar = manifest.products.filter(p => p.slug !== slug && !usedSlugs.has(p.slug) && (p.categories || []).includes(primaryCat))
         .sort((a, b) => (b.rating || 0) - (a.rating || 0)).slice(0, 4);
       if (similar.length) {
         similarEl.innerHTML = `<h2>Similar Products</h2><div class="similar-grid">${similar.map(compactProductCard).join('')}</div>`;
@@ -726,7 +892,7 @@ function openLightbox(src) {
 
 // ====== CATEGORY PAGE ======
 async function initCategory() {
-  await loadData();
+  const view = await loadViewData('category-grid');
   initNav();
   
   const slug = location.hash.slice(1);
@@ -791,7 +957,7 @@ async function initCategory() {
     addJsonLd({"@context":"https://schema.org","@type":"FAQPage","mainEntity":ed.faq.map(f=>({"@type":"Question","name":f.question,"acceptedAnswer":{"@type":"Answer","text":f.answer}}))});
   }
   
-  let products = PRODUCTS.filter(p => cat.products.includes(p.slug));
+  let products = view && view.members[slug] ? view.members[slug].map(i => PRODUCTS[i]) : PRODUCTS.filter(p => cat.products.includes(p.slug));
   let currentSort = 'name';
   let filters = { propertyType: '', pricingModel: '', deployment: '' };
 
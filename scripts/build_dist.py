@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Minified, content-hashed and precompressed copy of the site in dist/.
+
+The pages fetch fixed paths such as data/products.json, and the JSON files
+are written with indent=2, so nothing can be cached for long and every byte
+of indentation goes over the wire. This builds a deployable copy of the
+site:
+
+    data/*.json, data/views/*.json   minified, written as name.<hash>.json
+    js/app.js, css/style.css         written as name.<hash>.js / .css
+    *.html, guides/, products/       minified HTML under the same names, with
+                                     references to the files above rewritten
+    data/products/*.json, sitemap.xml, sitemap-*.xml[.gz], robots.txt, CNAME
+                                     copied (shards are addressed by slug and
+                                     are already compact; sitemap.xml may be an
+                                     index of the numbered sitemap shards)
+
+<hash> is the first 10 hex digits of the sha256 of the file as written, so
+hashed files can be served with "Cache-Control: immutable" and pages pick
+up a new name whenever the content changes. Every text file also gets .gz
+(gzip -9) and .br (brotli quality 11) siblings for servers that serve
+precompressed files; a sibling is only kept when it is smaller. Files that
+are already gzipped (sitemap-N.xml.gz) get none. .br files
+need the brotli package and are skipped with a warning without it.
+
+References are rewritten wherever a hashed path appears as a quoted string
+in a page or in js/app.js ("css/style.css", '../css/style.css',
+'data/products.json'), so js/app.js is hashed after its own JSON references
+are rewritten. Paths built at runtime (the per-product shards) keep their
+names.
+
+The digest of each source (after reference rewriting) and what it became
+is kept in .build/dist-state.json; a file whose digest and outputs are
+unchanged is not minified or compressed again. --prune deletes files in
+dist/ that this build did not produce, such as hashed files from earlier
+builds; without it they stay so clients holding an old page still work.
+
+    python scripts/build_dist.py [--out dist] [--prune] [--force]
+"""
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIST_DIR = os.path.join(ROOT, "dist")
+STATE_PATH = os.path.join(ROOT, ".build", "dist-state.json")
+STATE_VERSION = 1
+
+HASH_LENGTH = 10
+COMPACT = (",", ":")
+
+# In build order: a file's references must be hashed before it is.
+HASHED = ("data/products.json", "data/categories.json", "data/manifest.json", "data/search-index.json",
+          "data/views/*.json", "css/*.css", "js/*.js")
+PAGES = ("*.html", "guides/*.html", "products/*.html")
+COPIED = ("data/products/*.json", "sitemap.xml", "sitemap-*.xml", "sitemap-*.xml.gz", "robots.txt", "CNAME")
+
+COMPRESSIBLE = (".html", ".json", ".js", ".css", ".xml", ".txt", ".svg")
+# Files that have paths of hashed files rewritten in them
+REWRITTEN = (".html", ".js")
+
+RAW_ELEMENT_RE = re.compile(r"<!--.*?-->|<(script|style|pre|textarea)\b([^>]*)>(.*?)</\1\s*>", re.S | re.I)
+WHITESPACE_RE = re.compile(r"\s+")
+CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+
+
+def expand(patterns):
+    paths = []
+    for pattern in patterns:
+        paths.extend(sorted(os.path.relpath(p, ROOT) for p in glob.glob(os.path.join(ROOT, pattern))
+                            if os.path.isfile(p)))
+    return paths
+
+
+def hashed_name(path, data):
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def reference_pattern(names):
+    """Regex for quoted references to any of names, optionally ./ ../ or / prefixed."""
+    paths = "|".join(re.escape(path) for path in sorted(names, key=len, reverse=True))
+    return re.compile(r"""(["'`])((?:\.{1,2}/)*/?)(%s)(?=[?#"'`])""" % paths)
+
+
+def rewrite_references(text, names, pattern):
+    return pattern.sub(lambda m: m.group(1) + m.group(2) + names[m.group(3)], text)
+
+
+# -- minifiers -------------------------------------------------------------------
+
+def minify_json(data):
+    return json.dumps(json.loads(data), separators=COMPACT, ensure_ascii=False).encode("utf-8")
+
+
+def _minify_element(match):
+    tag = (match.group(1) or "").lower()
+    if not tag:
+        comment = match.group(0)
+        return comment if comment.startswith("<!--[if") else ""  # keep IE conditional comments
+    attrs, body = match.group(2), match.group(3)
+    if tag == "script" and "ld+json" in attrs:
+        try:
+            body = json.dumps(json.loads(body), separators=COMPACT, ensure_ascii=False)
+        except ValueError:
+            pass
+    elif tag == "style":
+        body = "\n".join(line.strip() for line in CSS_COMMENT_RE.sub("", body).splitlines() if line.strip())
+    return f"<{tag}{WHITESPACE_RE.sub(' ', attrs)}>{body}</{tag}>"
+
+
+def minify_html(text):
+    """Drop comments and collapse whitespace runs to one space outside script/style/pre/textarea.
+
+    Script bodies are left alone (only JSON-LD is re-serialised), so inline
+    code and template literals behave exactly as before.
+    """
+    out, pos = [], 0
+    for match in RAW_ELEMENT_RE.finditer(text):
+        out.append(WHITESPACE_RE.sub(" ", text[pos:match.start()]))
+        out.append(_minify_element(match))
+        pos = match.end()
+    out.append(WHITESPACE_RE.sub(" ", text[pos:]))
+    return "".join(out).strip().encode("utf-8")
+
+
+# -- output ----------------------------------------------------------------------
+
+def compressed_siblings(data):
+    """{suffix: bytes} of the compressed forms worth keeping."""
+    siblings = {".gz": gzip.compress(data, 9, mtime=0)}
+    if brotli is not None:
+        siblings[".br"] = brotli.compress(data, mode=brotli.MODE_TEXT, quality=11, lgwin=24)
+    return {suffix: body for suffix, body in siblings.items() if len(body) < len(data)}
+
+
+def _write_if_changed(path, data):
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def fingerprint():
+    with open(os.path.abspath(__file__), 'rb') as f:
+        h = hashlib.sha256(f.read())
+    h.update(b"brotli" if brotli is not None else b"")
+    return f"{STATE_VERSION}:{h.hexdigest()}"
+
+
+def load_state(path):
+    try:
+        with open(path, 'r') as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return state if state.get("fingerprint") == fingerprint() else {}
+
+
+class DistBuilder:
+    def __init__(self, out_dir=DIST_DIR, state_path=STATE_PATH, force=False):
+        self.out_dir = out_dir
+        self.state_path = state_path
+        self.previous = {} if force else load_state(state_path).get("files", {})
+        self.files = {}
+        self.names = {}  # source path -> hashed path
+        self.outputs = set()
+        self.built = self.skipped = 0
+
+    def _unchanged(self, path, digest):
+        entry = self.previous.get(path)
+        if not entry or entry["digest"] != digest:
+            return None
+        out = os.path.join(self.out_dir, entry["output"])
+        if not all(os.path.exists(out + suffix) for suffix in [""] + entry["siblings"]):
+            return None
+        return entry
+
+    def add(self, path, hashed=False):
+        with open(os.path.join(ROOT, path), 'rb') as f:
+            data = f.read()
+        if path.endswith(REWRITTEN) and self.names:
+            data = rewrite_references(data.decode("utf-8"), self.names, self._pattern).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        entry = self._unchanged(path, digest)
+        if entry is not None:
+            self.skipped += 1
+        else:
+            if path.endswith(".json") and hashed:
+                data = minify_json(data)
+            elif path.endswith(".html"):
+                data = minify_html(data.decode("utf-8"))
+            output = hashed_name(path, data) if hashed else path
+            out = os.path.join(self.out_dir, output)
+            _write_if_changed(out, data)
+            siblings = compressed_siblings(data) if path.endswith(COMPRESSIBLE) else {}
+            for suffix, body in siblings.items():
+                _write_if_changed(out + suffix, body)
+            entry = {"digest": digest, "output": output, "siblings": sorted(siblings)}
+            self.built += 1
+
+        self.files[path] = entry
+        self.outputs.update(entry["output"] + suffix for suffix in [""] + entry["siblings"])
+        if hashed:
+            self.names[path] = entry["output"]
+            self._pattern = reference_pattern(self.names)
+
+    def build(self):
+        for path in expand(HASHED):
+            self.add(path, hashed=True)
+        for path in expand(PAGES) + expand(COPIED):
+            self.add(path)
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        with open(self.state_path, 'w') as f:
+            json.dump({"fingerprint": fingerprint(), "files": self.files}, f, indent=2)
+
+    def prune(self):
+        """Delete files under out_dir that this build did not produce; returns how many."""
+        removed = 0
+        for dirpath, _, filenames in os.walk(self.out_dir):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if os.path.relpath(path, self.out_dir) not in self.outputs:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the minified, hashed and precompressed site in dist/.")
+    parser.add_argument("--out", default=DIST_DIR, help="output directory (default: dist/)")
+    parser.add_argument("--state", default=STATE_PATH)
+    parser.add_argument("--force", action="store_true", help="rebuild every file, ignoring the saved digests")
+    parser.add_argument("--prune", action="store_true", help="delete files in the output this build did not write")
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotli is not installed; writing .gz siblings only (pip install brotli)")
+    builder = DistBuilder(args.out, args.state, args.force)
+    builder.build()
+    removed = builder.prune() if args.prune else 0
+    for path, output in builder.names.items():
+        print(f"  {path:<32} -> {output}")
+    print(f"Built {builder.built} files, {builder.skipped} unchanged"
+          + (f", pruned {removed}" if args.prune else "") + f" in {os.path.relpath(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Persistent per-row state for incremental process_data runs.
+
+The state file holds a small header (digest of the raw CSV, fingerprint of
+the transform code, stat signatures of the outputs we wrote) followed by a
+table keyed by a content hash of each raw CSV row. Each entry remembers the
+slug the row produced (None when the row is filtered out) and, once the row
+has won slug deduplication, its categories, its encoded products.json
+fragment and its sitemap lastmod, so unchanged rows never go through the
+transform pipeline again.
+
+Both parts are pickled back to back so a no-op check only has to read the
+header.
+"""
+import ast
+import hashlib
+import os
+import pickle
+
+STATE_VERSION = 2
+
+# The build script; it and every module under scripts/ it imports, directly
+# or not, decide what the outputs look like.
+PIPELINE_ENTRY = "process_data.py"
+
+
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def pipeline_sources(entry=PIPELINE_ENTRY):
+    """entry and the scripts/ modules it imports (at any depth, including function-level imports)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    seen, todo = set(), [entry]
+    while todo:
+        name = todo.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        with open(os.path.join(here, name), 'rb') as f:
+            tree = ast.parse(f.read(), name)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                modules = [node.module]
+            else:
+                continue
+            for module in modules:
+                path = module.split(".")[0] + ".py"
+                if os.path.exists(os.path.join(here, path)):
+                    todo.append(path)
+    return sorted(seen)
+
+
+def pipeline_fingerprint():
+    here = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256(str(STATE_VERSION).encode())
+    for name in pipeline_sources():
+        h.update(name.encode() + b"\0")
+        with open(os.path.join(here, name), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def row_hash(fields):
+    """Content hash of one raw CSV record (a list of field strings)."""
+    return hashlib.blake2b("\x1f".join(fields).encode("utf-8", "surrogatepass") + len(fields).to_bytes(4, "little"),
+                           digest_size=16).digest()
+
+
+def output_signature(paths):
+    """(size, mtime) per output so hand-edited or missing outputs force a rewrite."""
+    sig = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        sig[path] = (st.st_size, st.st_mtime_ns)
+    return sig
+
+
+class BuildState:
+    def __init__(self, header=None, rows=None):
+        self.header = header or {}
+        self.rows = rows if rows is not None else {}
+
+    @classmethod
+    def load_header(cls, path):
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return {}
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'rb') as f:
+                header = pickle.load(f)
+                rows = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return cls()
+        return cls(header, rows)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump(self.header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(self.rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Optional SQLite catalog with products.json / categories.json as exports.
+
+products.json stays the file the site reads, but scripts that query or
+patch a handful of products don't have to parse all of it. The catalog
+database (.build/catalog.sqlite by default) keeps every product as its
+full JSON record plus indexed columns pulled out of it:
+
+    products(pos, slug, title, domain, enriched, enrichment_failed,
+             last_updated, rating, record)
+    product_categories(category, slug)
+    categories(pos, slug, name, record)
+
+pos is the product's index in products.json: remove() shifts the products
+after it down, so positions stay dense and index lookups (slug_at, slice,
+needing_enrichment) are range scans on the primary key or the enrichment
+index. enriched and enrichment_failed are the record's
+fields of the same name, read exactly as find_products_to_enrich.py reads
+them, so --db and the JSON path pick the same products (the legacy
+enrichmentFailed spelling is not a failure there). Nested fields (pricing,
+feature_groups, company, ...) only live in record, so key order and
+values come back exactly as they went in. categories.json entries are
+stored whole as well. When a product's categories change, the affected
+entries get the same product_count / products patch that
+sync_categories_file() applies to the JSON file.
+
+record holds each product's source text as it appeared in products.json,
+so importing and then exporting reproduces a file in the json.dump(indent=2)
+layout byte for byte, whatever its escaping: ASCII with \\u escapes
+(process_data.py), raw UTF-8 (the enrichment scripts) or a mix of both
+(ProductStore rewrites only the records it changes). Records updated or
+added here are written the way ProductStore writes them. The build can
+take the catalog as its source: `process_data.py --from-db` exports both
+files from it and writes the sitemap and robots.txt to match. Queries
+against the catalog see updates pending in the enrichment journal the same
+way the JSON readers do (product_journal.pending_updates()).
+
+    python scripts/catalog_db.py import [--products data/products.json] [--categories ...] [--db ...]
+    python scripts/catalog_db.py export [--shards]
+    python scripts/catalog_db.py query --category "Property Management" --pending
+"""
+import argparse
+import json
+import os
+import sqlite3
+
+from category_index import CategoryIndex, patch_category_data
+from product_shards import build_shards_from_files
+from product_store import encode_record, parse_catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "data")
+DB_PATH = os.path.join(ROOT, ".build", "catalog.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    pos INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL UNIQUE,
+    title TEXT,
+    domain TEXT,
+    enriched INTEGER NOT NULL DEFAULT 0,
+    enrichment_failed INTEGER NOT NULL DEFAULT 0,
+    last_updated TEXT,
+    rating REAL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_title ON products (title);
+CREATE INDEX IF NOT EXISTS products_domain ON products (domain);
+CREATE INDEX IF NOT EXISTS products_enrichment ON products (enriched, enrichment_failed, pos);
+CREATE INDEX IF NOT EXISTS products_last_updated ON products (last_updated);
+CREATE INDEX IF NOT EXISTS products_rating ON products (rating);
+CREATE TABLE IF NOT EXISTS product_categories (
+    category TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    PRIMARY KEY (category, slug)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS product_categories_slug ON product_categories (slug);
+CREATE TABLE IF NOT EXISTS categories (
+    pos INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL UNIQUE,
+    record TEXT NOT NULL
+);
+"""
+
+COLUMNS = "pos, slug, title, domain, enriched, enrichment_failed, last_updated, rating, record"
+
+
+def _rating(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def product_row(pos, product, source=None):
+    """Indexed column values for one product, in COLUMNS order (source: its text in products.json)."""
+    return (
+        pos,
+        product["slug"],
+        product.get("title"),
+        product.get("domain"),
+        int(bool(product.get("enriched"))),
+        int(bool(product.get("enrichment_failed"))),
+        product.get("last_updated"),
+        _rating(product.get("rating")),
+        source if source is not None else encode_record(product),
+    )
+
+
+def _member_names(product):
+    return list(dict.fromkeys(product.get("categories") or []))
+
+
+class CatalogDB:
+    """Indexed catalog queries and updates; use as a context manager."""
+
+    def __init__(self, path=DB_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.commit()
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT count(*) FROM products").fetchone()[0]
+
+    # -- import / export --------------------------------------------------
+
+    def import_json(self, products_path, categories_path=None):
+        """Replace the catalog with the contents of the JSON files."""
+        with open(products_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        products, sources = parse_catalog(text)
+        conn = self.conn
+        with conn:
+            conn.execute("DELETE FROM products")
+            conn.execute("DELETE FROM product_categories")
+            conn.execute("DELETE FROM categories")
+            conn.executemany(f"INSERT INTO products ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             (product_row(pos, *row) for pos, row in enumerate(zip(products, sources))))
+            conn.executemany("INSERT INTO product_categories (category, slug) VALUES (?, ?)",
+                             ((name, p["slug"]) for p in products for name in _member_names(p)))
+            if categories_path and os.path.exists(categories_path):
+                with open(categories_path, 'r') as f:
+                    cat_data = json.load(f)
+                conn.executemany("INSERT INTO categories (pos, slug, name, record) VALUES (?, ?, ?, ?)",
+                                 ((pos, key, entry["name"], json.dumps(entry, ensure_ascii=False))
+                                  for pos, (key, entry) in enumerate(cat_data.items())))
+        return len(products)
+
+    def products(self, where="", params=()):
+        query = f"SELECT record FROM products {where} ORDER BY pos"
+        return [json.loads(record) for record, in self.conn.execute(query, params)]
+
+    def category_data(self):
+        rows = self.conn.execute("SELECT slug, record FROM categories ORDER BY pos")
+        return {slug: json.loads(record) for slug, record in rows}
+
+    def export_json(self, products_path, categories_path=None):
+        """Write products.json (and categories.json) from the catalog."""
+        tmp = products_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            first = True
+            f.write("[")
+            for record, in self.conn.execute("SELECT record FROM products ORDER BY pos"):
+                f.write(",\n  " if not first else "\n  ")
+                f.write(record)
+                first = False
+            f.write("]" if first else "\n]")
+        os.replace(tmp, products_path)
+
+        if categories_path:
+            cat_data = self.category_data()
+            if cat_data:
+                with open(categories_path + ".tmp", 'w') as f:
+                    json.dump(cat_data, f, indent=2)
+                os.replace(categories_path + ".tmp", categories_path)
+
+    # -- queries ------------------------------------------------------------
+
+    def get(self, slug):
+        row = self.conn.execute("SELECT record FROM products WHERE slug = ?", (slug,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def slug_at(self, index):
+        """Slug of the product at a catalog index (as in products.json)."""
+        row = self.conn.execute("SELECT slug FROM products WHERE pos = ?", (index,)).fetchone()
+        return None if row is None else row[0]
+
+    def slice(self, start, stop):
+        """[(index, product)] for catalog indexes start..stop-1."""
+        rows = self.conn.execute("SELECT pos, record FROM products WHERE pos >= ? AND pos < ? ORDER BY pos",
+                                 (start, stop))
+        return [(pos, json.loads(record)) for pos, record in rows]
+
+    def last_updated(self):
+        """[(slug, last_updated)] in catalog order, for the sitemap."""
+        return self.conn.execute("SELECT slug, last_updated FROM products ORDER BY pos").fetchall()
+
+    def needing_enrichment(self, start=0):
+        """[(index, product)] from catalog index start on that are neither enriched nor failed."""
+        rows = self.conn.execute(
+            "SELECT pos, record FROM products"
+            " WHERE enriched = 0 AND enrichment_failed = 0 AND pos >= ? ORDER BY pos", (start,))
+        return [(pos, json.loads(record)) for pos, record in rows]
+
+    def in_category(self, name):
+        return self.products("WHERE slug IN (SELECT slug FROM product_categories WHERE category = ?)", (name,))
+
+    def by_domain(self, domain):
+        return self.products("WHERE domain = ?", (domain,))
+
+    # -- updates --------------------------------------------------------------
+
+    def update(self, slug, fields):
+        """Merge fields into one product; returns the updated record."""
+        row = self.conn.execute("SELECT pos, record FROM products WHERE slug = ?", (slug,)).fetchone()
+        if row is None:
+            raise KeyError(slug)
+        pos, record = row
+        product = json.loads(record)
+        old_categories = _member_names(product)
+        product.update(fields)
+        if product.get("slug") != slug:
+            raise ValueError(f"update() can't change a slug ({slug!r} -> {product.get('slug')!r})")
+        with self.conn:
+            self.conn.execute(f"REPLACE INTO products ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                              product_row(pos, product))
+            if _member_names(product) != old_categories:
+                self._set_categories(slug, _member_names(product))
+        return product
+
+    def add(self, product):
+        """Append a product, or replace the one with the same slug in place."""
+        row = self.conn.execute("SELECT pos FROM products WHERE slug = ?", (product["slug"],)).fetchone()
+        if row is None:
+            row = self.conn.execute("SELECT coalesce(max(pos) + 1, 0) FROM products").fetchone()
+        with self.conn:
+            self.conn.execute(f"REPLACE INTO products ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                              product_row(row[0], product))
+            self._set_categories(product["slug"], _member_names(product))
+        return product
+
+    def remove(self, slug):
+        row = self.conn.execute("SELECT pos FROM products WHERE slug = ?", (slug,)).fetchone()
+        if row is None:
+            raise KeyError(slug)
+        with self.conn:
+            self.conn.execute("DELETE FROM products WHERE slug = ?", (slug,))
+            # Close the gap; going through negative positions keeps pos unique at every step
+            self.conn.execute("UPDATE products SET pos = -pos WHERE pos > ?", row)
+            self.conn.execute("UPDATE products SET pos = -pos - 1 WHERE pos < 0")
+            self._set_categories(slug, None)
+
+    def _set_categories(self, slug, names):
+        """Point product_categories and the categories.json entries at names (None: removed)."""
+        conn = self.conn
+        conn.execute("DELETE FROM product_categories WHERE slug = ?", (slug,))
+        conn.executemany("INSERT INTO product_categories (category, slug) VALUES (?, ?)",
+                         ((name, slug) for name in names or ()))
+
+        cat_data = self.category_data()
+        if not cat_data:
+            return
+        index = CategoryIndex.from_category_data(cat_data)
+
+        def position(member):
+            row = conn.execute("SELECT pos FROM products WHERE slug = ?", (member,)).fetchone()
+            return row[0] if row else float("inf")
+
+        changed = index.remove(slug) if names is None else index.update(slug, names, position)
+        if not changed:
+            return
+        patch_category_data(cat_data, index, changed)
+        conn.executemany("UPDATE categories SET record = ? WHERE slug = ?",
+                         ((json.dumps(entry, ensure_ascii=False), key)
+                          for key, entry in cat_data.items() if entry["name"] in changed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import, export or query the SQLite catalog.")
+    parser.add_argument("command", choices=("import", "export", "query"))
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--products", default=os.path.join(DATA_DIR, "products.json"))
+    parser.add_argument("--categories", default=os.path.join(DATA_DIR, "categories.json"))
+    parser.add_argument("--shards", action="store_true",
+                        help="after export, also write per-product shards, manifest.json and the page views")
+    parser.add_argument("--category", help="query: products in this category")
+    parser.add_argument("--domain", help="query: products on this domain")
+    parser.add_argument("--pending", action="store_true", help="query: only products needing enrichment")
+    args = parser.parse_args()
+
+    with CatalogDB(args.db) as db:
+        if args.command == "import":
+            count = db.import_json(args.products, args.categories)
+            print(f"Imported {count} products into {args.db}")
+        elif args.command == "export":
+            db.export_json(args.products, args.categories)
+            if args.shards:
+                build_shards_from_files(args.products, args.categories)
+            print(f"Exported {len(db)} products to {args.products}")
+        else:
+            clauses, params = [], []
+            if args.category:
+                clauses.append("slug IN (SELECT slug FROM product_categories WHERE category = ?)")
+                params.append(args.category)
+            if args.domain:
+                clauses.append("domain = ?")
+                params.append(args.domain)
+            if args.pending:
+                clauses.append("enriched = 0 AND enrichment_failed = 0")
+            where = "WHERE " + " AND ".join(clauses) if clauses else ""
+            products = db.products(where, params)
+            for product in products:
+                print(f"  {product['slug']}: {product.get('title')}")
+            print(f"{len(products)} products")
+
+
+if __name__ == "__main__":
+    main()
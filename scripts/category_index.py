@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""Inverted category membership index for categories.json.
+
+The index maps each category name to its member slugs (in catalog order)
+and each slug back to its categories, so it can be built in one pass over
+the catalog and then patched when a product's categories change: only the
+categories the product left or joined are touched.
+
+The enrichment scripts use sync_categories_file() after rewriting product
+categories so product_count / products in categories.json stop drifting.
+Both it and a rebuild leave categories.json shaped like process_data.py's
+full build: a category that gains its first product gets an entry (with
+its CANONICAL_CATEGORIES description), one that loses its last product is
+dropped, and canonical categories come first, in canonical order. Run
+this module directly to rebuild every category from products.json:
+
+    python scripts/category_index.py [--products data/products.json] [--categories data/categories.json]
+
+Hand-written fields in categories.json (seo_title, editorial, ...) are
+preserved; only product_count and products are rewritten.
+"""
+import argparse
+import json
+import os
+import re
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Canonical categories, in the order categories.json lists them
+CANONICAL_CATEGORIES = {
+    "Property Management": "Tools for managing commercial and residential properties, tenants, and maintenance.",
+    "CRM & Marketing": "Customer relationship management and marketing tools for real estate professionals.",
+    "Investment & Valuation": "Software for real estate investment analysis, valuation, and portfolio management.",
+    "Construction & Development": "Tools for construction management, project development, and planning.",
+    "Lease Administration": "Lease management, tracking, and administration software.",
+    "Data & Analytics": "Data platforms, analytics, and business intelligence for real estate.",
+    "Broker Tools": "Software designed specifically for commercial real estate brokers.",
+    "Site Selection": "Tools for location analysis, site selection, and market research.",
+    "Tenant Experience": "Platforms enhancing tenant engagement, communication, and building experience.",
+    "Accounting & Finance": "Financial management, accounting, and budgeting for real estate.",
+    "AI & Automation": "Artificial intelligence and automation tools for real estate workflows.",
+    "Listing Services": "Property listing platforms and marketing for available spaces.",
+    "Crowdfunding & Investing": "Real estate crowdfunding and investment platforms.",
+    "Energy & Sustainability": "Energy management, sustainability, and green building tools.",
+    "Legal & Compliance": "Legal, regulatory, and compliance tools for real estate.",
+    "Workplace & Space Management": "Workspace planning, space utilization, and facility management.",
+}
+
+
+def slugify(text):
+    s = text.lower().strip()
+    s = re.sub(r'[^\w\s-]', '', s)
+    s = re.sub(r'[\s_]+', '-', s)
+    s = re.sub(r'-+', '-', s).strip('-')
+    return s
+
+
+class CategoryIndex:
+    def __init__(self, names):
+        self.members = {name: [] for name in names}
+        self.categories_of = {}
+
+    @classmethod
+    def build(cls, products, names):
+        """Index a whole catalog in one pass."""
+        index = cls(names)
+        for product in products:
+            index.add(product["slug"], product.get("categories") or [])
+        return index
+
+    @classmethod
+    def from_category_data(cls, cat_data, names=()):
+        """Invert an existing categories.json mapping; names adds (empty) categories it lacks."""
+        index = cls([entry["name"] for entry in cat_data.values()] + list(names))
+        for entry in cat_data.values():
+            name = entry["name"]
+            index.members[name] = list(entry.get("products") or [])
+            for slug in index.members[name]:
+                index.categories_of.setdefault(slug, []).append(name)
+        return index
+
+    def add(self, slug, categories):
+        """Append a product that comes after everything already indexed."""
+        names = []
+        for name in categories:
+            members = self.members.get(name)
+            if members is not None and name not in names:
+                names.append(name)
+                members.append(slug)
+        self.categories_of[slug] = names
+
+    def update(self, slug, categories, position):
+        """Move slug to its new categories and return the names that changed.
+
+        position(slug) gives a product's catalog position; it is used to keep
+        member lists in catalog order and is only called for members of the
+        categories the product joins.
+        """
+        old = set(self.categories_of.get(slug, ()))
+        new = {name for name in categories if name in self.members}
+        changed = old ^ new
+
+        for name in old - new:
+            self.members[name].remove(slug)
+        for name in new - old:
+            members = self.members[name]
+            target = position(slug)
+            lo, hi = 0, len(members)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if position(members[mid]) < target:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            members.insert(lo, slug)
+
+        self.categories_of[slug] = list(new)
+        return changed
+
+    def remove(self, slug):
+        """Drop a product from every category; returns the names that changed."""
+        changed = set(self.categories_of.pop(slug, ()))
+        for name in changed:
+            self.members[name].remove(slug)
+        return changed
+
+
+def build_category_data(members):
+    """Build categories.json content from {category name: [slugs]}."""
+    cat_data = {}
+    for cat_name, cat_desc in CANONICAL_CATEGORIES.items():
+        cat_slug = slugify(cat_name)
+        cat_products = members.get(cat_name, [])
+        if cat_products:
+            cat_data[cat_slug] = {
+                "name": cat_name,
+                "slug": cat_slug,
+                "description": cat_desc,
+                "product_count": len(cat_products),
+                "products": cat_products,
+            }
+    return cat_data
+
+
+def reshape_category_data(cat_data, index):
+    """cat_data laid out as build_category_data() would, keeping existing entries and their extra fields.
+
+    Canonical categories come first in canonical order, then any other
+    categories already in cat_data; categories without members are left
+    out and canonical ones that gained members get a fresh entry.
+    """
+    by_name = {entry["name"]: (key, entry) for key, entry in cat_data.items()}
+    names = list(CANONICAL_CATEGORIES) + [name for name in by_name if name not in CANONICAL_CATEGORIES]
+    reshaped = {}
+    for name in names:
+        if not index.members.get(name):
+            continue
+        key, entry = by_name.get(name) or (slugify(name), None)
+        if entry is None:
+            entry = {"name": name, "slug": key, "description": CANONICAL_CATEGORIES[name],
+                     "product_count": 0, "products": []}
+        reshaped[key] = entry
+    return reshaped
+
+
+def patch_category_data(cat_data, index, names=None):
+    """Write index membership back into categories.json entries in place."""
+    for entry in cat_data.values():
+        if names is not None and entry["name"] not in names:
+            continue
+        members = index.members.get(entry["name"], [])
+        entry["product_count"] = len(members)
+        entry["products"] = list(members)
+
+
+def load_category_data(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_category_data(cat_data, path):
+    with open(path, 'w') as f:
+        json.dump(cat_data, f, indent=2)
+
+
+def sync_categories_file(path, products, slugs):
+    """Patch categories.json at path for products whose categories changed.
+
+    products is the in-memory catalog the caller just saved and slugs the
+    products whose categories may have changed (new slugs are fine). Cost is
+    proportional to the changed products plus the size of categories.json;
+    the catalog is only scanned to look up catalog positions when a product
+    joins a category.
+    """
+    slugs = set(slugs)
+    if not slugs:
+        return set()
+
+    cat_data = load_category_data(path)
+    index = CategoryIndex.from_category_data(cat_data, CANONICAL_CATEGORIES)
+
+    by_slug = {}
+    positions = None
+    for product in products:
+        if product.get("slug") in slugs:
+            by_slug[product["slug"]] = product
+
+    def position(slug):
+        nonlocal positions
+        if positions is None:
+            positions = {p.get("slug"): i for i, p in enumerate(products)}
+        return positions.get(slug, len(positions))
+
+    changed = set()
+    for slug in slugs:
+        product = by_slug.get(slug)
+        if product is None:
+            changed |= index.remove(slug)
+        else:
+            changed |= index.update(slug, product.get("categories") or [], position)
+
+    if changed:
+        cat_data = reshape_category_data(cat_data, index)
+        patch_category_data(cat_data, index, changed)
+        save_category_data(cat_data, path)
+    return changed
+
+
+def rebuild_categories_file(path, products):
+    """Recompute membership of every category in categories.json."""
+    cat_data = load_category_data(path)
+    index = CategoryIndex.build(products, list(CANONICAL_CATEGORIES) + [entry["name"] for entry in cat_data.values()])
+    cat_data = reshape_category_data(cat_data, index)
+    patch_category_data(cat_data, index)
+    save_category_data(cat_data, path)
+    return cat_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild category membership in categories.json from products.json.")
+    parser.add_argument("--products", default=os.path.join(DATA_DIR, "products.json"))
+    parser.add_argument("--categories", default=os.path.join(DATA_DIR, "categories.json"))
+    args = parser.parse_args()
+
+    with open(args.products, 'r') as f:
+        products = json.load(f)
+    cat_data = rebuild_categories_file(args.categories, products)
+    for entry in cat_data.values():
+        print(f"  {entry['slug']}: {entry['product_count']}")
+    print(f"Rebuilt {len(cat_data)} categories from {len(products)} products")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Compiled matcher for raw CSV category tokens.
+
+Replaces the per-token walk over CATEGORY_MAP in map_categories. The
+original rule for a token that isn't an exact key is "the first key, in
+map order, where ``key in token or token in key``". Both directions are
+resolved up front:
+
+* ``key in token`` -- an Aho-Corasick automaton over all keys reports every
+  key occurring in the token in one left-to-right pass.
+* ``token in key`` -- a reverse index maps every substring of every key to
+  the earliest key containing it.
+
+The answer is the candidate with the lowest map position, which is exactly
+what the linear scan returned.
+"""
+from collections import deque
+
+_MISSING = object()
+
+
+class CategoryMatcher:
+    def __init__(self, mapping):
+        self.keys = list(mapping)
+        self.values = [mapping[k] for k in self.keys]
+        self.exact = {k: i for i, k in enumerate(self.keys)}
+        self._build_automaton()
+        self._build_reverse_index()
+        self._cache = {}
+
+    def _build_automaton(self):
+        # goto[state] is a dict char -> state; out[state] is the lowest key
+        # index that ends at (or is a suffix of) this state.
+        goto = [{}]
+        out = [None]
+        for idx, key in enumerate(self.keys):
+            state = 0
+            for ch in key:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(None)
+                state = nxt
+            if out[state] is None or idx < out[state]:
+                out[state] = idx
+
+        # Breadth-first from the root's children (which fail to the root) so
+        # every fail target is already final when it is used.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                inherited = out[fail[nxt]]
+                if inherited is not None and (out[nxt] is None or inherited < out[nxt]):
+                    out[nxt] = inherited
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def _build_reverse_index(self):
+        reverse = {}
+        for idx, key in enumerate(self.keys):
+            n = len(key)
+            for i in range(n):
+                for j in range(i + 1, n + 1):
+                    reverse.setdefault(key[i:j], idx)
+        self._reverse = reverse
+
+    def _scan(self, token):
+        """Lowest key index occurring as a substring of token, or None."""
+        goto, fail, out = self._goto, self._fail, self._out
+        best = None
+        state = 0
+        for ch in token:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hit = out[state]
+            if hit is not None and (best is None or hit < best):
+                best = hit
+                if best == 0:
+                    break
+        return best
+
+    def match(self, token):
+        """Return the canonical category for a lowercased, stripped token, or None."""
+        cached = self._cache.get(token, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        idx = self.exact.get(token)
+        if idx is None:
+            idx = self._scan(token)
+            rev = self._reverse.get(token)
+            if rev is not None and (idx is None or rev < idx):
+                idx = rev
+        result = self.values[idx] if idx is not None else None
+
+        if len(self._cache) < 65536:
+            self._cache[token] = result
+        return result
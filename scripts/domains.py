@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""Domain of a product URL, shared by the build and the near-duplicate stage.
+
+process_data.py stores it on every row (product["domain"]) and
+near_duplicates.py derives each record's site and brand from it. It lives
+here so near_duplicates.py doesn't have to import the whole build pipeline
+(and process_data.py doesn't have to import it back lazily).
+"""
+from urllib.parse import urlparse
+
+
+def get_domain(url):
+    try:
+        parsed = urlparse(url)
+        domain = parsed.netloc or parsed.path
+        domain = domain.replace("www.", "")
+        return domain
+    except:
+        return ""
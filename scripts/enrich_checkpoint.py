@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Crash-safe checkpoints for ProductEnricher.run_enrichment.
+
+run_enrichment used to hold every result in memory and write products.json
+once, after the last product, so a crash or Ctrl-C late in a long run lost
+every fetch. EnrichCheckpoint records each product's enriched data as soon
+as its fetch finishes (from the worker threads), and save() writes
+
+    data/products.checkpoint.json   products file, run start time and
+                                    {slug: enriched data} for every product
+                                    finished so far
+
+to a temporary file, fsyncs it and renames it over the old one, so a crash
+mid-write leaves the previous checkpoint intact. run_enrichment saves one
+every `every` products or `interval` seconds (whichever comes first), along
+with a flush of products.json, and deletes it when the run completes.
+
+With --resume, a run loads the checkpoint left by an interrupted run of the
+same products file and uses the stored data for the products it lists
+instead of fetching them again; only products that had not finished (or
+had failed) go back to the network.
+
+    checkpoint = EnrichCheckpoint.load(products_path) if resume else EnrichCheckpoint(products_path)
+    checkpoint.record(slug, enriched)
+    if checkpoint.due():
+        checkpoint.save()
+"""
+import json
+import os
+import threading
+import time
+
+DEFAULT_EVERY = 25
+DEFAULT_INTERVAL = 60.0
+
+
+def checkpoint_path(products_path):
+    """Where runs enriching products_path keep their checkpoint (next to it)."""
+    return os.path.splitext(products_path)[0] + ".checkpoint.json"
+
+
+class EnrichCheckpoint:
+    def __init__(self, products_path, path=None, every=DEFAULT_EVERY, interval=DEFAULT_INTERVAL,
+                 done=None, started_at=None):
+        self.products_path = os.path.abspath(products_path)
+        self.path = path or checkpoint_path(products_path)
+        self.every = every
+        self.interval = interval
+        self.done = dict(done or {})
+        self.started_at = started_at or time.time()
+        self.resumed = set(self.done)
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+
+    @classmethod
+    def load(cls, products_path, path=None, **kwargs):
+        """The checkpoint an interrupted run of products_path left, or an empty one."""
+        try:
+            with open(path or checkpoint_path(products_path), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return cls(products_path, path, **kwargs)
+        if state.get("products_path") != os.path.abspath(products_path):
+            return cls(products_path, path, **kwargs)
+        return cls(products_path, path, done=state.get("done"), started_at=state.get("started_at"), **kwargs)
+
+    def get(self, slug):
+        """Enriched data recorded for slug, or None."""
+        with self._lock:
+            return self.done.get(slug)
+
+    def record(self, slug, enriched):
+        """Remember a finished product (safe to call from fetch threads)."""
+        with self._lock:
+            if slug not in self.done:
+                self._unsaved += 1
+            self.done[slug] = enriched
+
+    def due(self):
+        """True once `every` products finished or `interval` seconds passed since the last save."""
+        with self._lock:
+            unsaved = self._unsaved
+        return unsaved >= self.every or (unsaved > 0 and time.monotonic() - self._saved_at >= self.interval)
+
+    def save(self):
+        """Atomically write the checkpoint."""
+        with self._lock:
+            state = {
+                "products_path": self.products_path,
+                "started_at": self.started_at,
+                "saved_at": time.time(),
+                "done": dict(self.done),
+            }
+            self._unsaved = 0
+        self._saved_at = time.monotonic()
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def discard(self):
+        """Remove the checkpoint once the run it belongs to has completed."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
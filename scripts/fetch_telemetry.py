@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Per-request fetch telemetry for enrichment and logo resolution.
+
+Enrichment reported progress only through print lines, so there was no way
+to tell which domains were slow, which pages were huge or where the time
+went. Telemetry.request() wraps one page fetch and yields a record that the
+fetch path fills in:
+
+    stage         "homepage" (ProductEnricher) or "logo" (logo_resolver)
+    domain, url
+    wait_s        time spent waiting for the host's politeness gate
+    dns_s         getaddrinfo time     } only when a new connection was
+    connect_s     TCP connect time     } opened; reused=True means the
+    tls_s         TLS handshake time   } pooled connection was reused
+    ttfb_s        request sent -> response headers received
+    total_s       the whole fetch, including reading the body
+    extract_s     time spent in the HTML extractor / logo scan
+    bytes         body bytes read (the extractor may stop early)
+    content_length  the Content-Length header, when sent
+    status, cache (hit / revalidated / miss / off), redirects, retries
+    error         exception type and message, when the fetch failed
+
+DNS, connect, TLS and TTFB come from TimedAdapter, a requests adapter whose
+urllib3 connections time themselves into the record of the request running
+on the same thread (pooled_session(timed=True) mounts it). Records are
+appended to a JSONL log as they complete, and summary() gives p50/p95/p99
+per stage and field plus the slowest domains for the end of a run.
+
+NullTelemetry stands in when telemetry is off.
+
+    telemetry = Telemetry(".build/enrich-telemetry.jsonl")
+    with telemetry.request("homepage", domain, url) as record:
+        response = fetcher.get(url)
+        record["status"] = response.status_code
+    print(telemetry.summary())
+"""
+import json
+import os
+import socket
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NameResolutionError
+from urllib3.util.connection import allowed_gai_family
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TELEMETRY_LOG = os.path.join(ROOT, ".build", "enrich-telemetry.jsonl")
+TIMING_FIELDS = ("wait_s", "dns_s", "connect_s", "tls_s", "ttfb_s", "total_s", "extract_s")
+SLOWEST_DOMAINS = 10
+
+_local = threading.local()
+
+
+def current_record():
+    """The record of the request running on this thread, or None."""
+    return getattr(_local, "record", None)
+
+
+def add_timing(field, seconds):
+    """Add seconds to field of the current request's record, if there is one."""
+    record = current_record()
+    if record is not None:
+        record[field] = round((record.get(field) or 0.0) + seconds, 6)
+
+
+# -- timed connections -------------------------------------------------------
+
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        # Resolve here (timed), then connect to each address in turn as
+        # urllib3's create_connection would, so DNS and TCP are measured apart.
+        host = self._dns_host.strip("[]")
+        start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        finally:
+            add_timing("dns_s", time.perf_counter() - start)
+        dns_host, error = self._dns_host, None
+        start = time.perf_counter()
+        try:
+            for info in infos:
+                self._dns_host = info[4][0]
+                try:
+                    return super()._new_conn()
+                except Exception as e:
+                    error = e
+            raise error
+        finally:
+            self._dns_host = dns_host
+            add_timing("connect_s", time.perf_counter() - start)
+
+    def connect(self):
+        record = current_record()
+        if record is not None:
+            record["reused"] = False
+        start = time.perf_counter()
+        super().connect()
+        if record is not None and isinstance(self, HTTPSConnection):
+            handshake = time.perf_counter() - start - (record.get("dns_s") or 0) - (record.get("connect_s") or 0)
+            record["tls_s"] = round(max(0.0, handshake), 6)
+        if getattr(self, "_sent_at", None) is not None:
+            # Plain HTTP connects lazily inside request(); TTFB starts once connected
+            self._sent_at = time.perf_counter()
+
+    def request(self, *args, **kwargs):
+        self._sent_at = time.perf_counter()
+        record = current_record()
+        if record is not None:
+            record.setdefault("reused", True)
+        return super().request(*args, **kwargs)
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        record = current_record()
+        if record is not None and getattr(self, "_sent_at", None) is not None:
+            record["ttfb_s"] = round(time.perf_counter() - self._sent_at, 6)
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections record DNS / connect / TLS / TTFB times."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                                   "https": TimedHTTPSConnectionPool}
+
+
+# -- collection ----------------------------------------------------------------
+
+def response_fields(response):
+    """status / cache / redirects / retries / content_length for a record."""
+    raw = getattr(response, "raw", None)
+    retries = getattr(raw, "retries", None)
+    length = response.headers.get("content-length")
+    return {
+        "status": response.status_code,
+        "cache": getattr(response, "cache_status", "off"),
+        "redirects": len(getattr(response, "history", ()) or ()),
+        "retries": len(retries.history) if retries is not None else 0,
+        "content_length": int(length) if length and length.isdigit() else None,
+    }
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class NullTelemetry:
+    """Stand-in used when telemetry is off."""
+    enabled = False
+
+    @contextmanager
+    def request(self, stage, domain, url):
+        yield {}
+
+    def summary(self):
+        return ""
+
+    def close(self):
+        pass
+
+
+class Telemetry:
+    enabled = True
+
+    def __init__(self, log_path=TELEMETRY_LOG):
+        self.log_path = log_path
+        self.records = []
+        self._lock = threading.Lock()
+        self._log = None
+        if log_path:
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+            self._log = open(log_path, 'a', encoding='utf-8')
+
+    @contextmanager
+    def request(self, stage, domain, url):
+        """Record one fetch; the block fills in the yielded dict."""
+        record = {"ts": round(time.time(), 3), "stage": stage, "domain": domain, "url": url}
+        outer = current_record()
+        _local.record = record
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["total_s"] = round(time.perf_counter() - start, 6)
+            _local.record = outer
+            self._emit(record)
+
+    def _emit(self, record):
+        with self._lock:
+            self.records.append(record)
+            if self._log is not None:
+                self._log.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._log.flush()
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def summary(self):
+        """p50/p95/p99 per stage and field, status and cache counts, slowest domains."""
+        with self._lock:
+            records = list(self.records)
+        if not records:
+            return "Telemetry: no requests recorded"
+        lines = [f"Telemetry: {len(records)} requests" + (f", log in {self.log_path}" if self.log_path else "")]
+        by_stage = defaultdict(list)
+        for record in records:
+            by_stage[record["stage"]].append(record)
+        for stage, items in sorted(by_stage.items()):
+            statuses = Counter(str(r.get("status") or "error") for r in items)
+            caches = Counter(r["cache"] for r in items if r.get("cache"))
+            lines.append(f"  {stage}: {len(items)} requests, status "
+                         + ", ".join(f"{k}={v}" for k, v in sorted(statuses.items()))
+                         + ("; cache " + ", ".join(f"{k}={v}" for k, v in sorted(caches.items())) if caches else ""))
+            lines.append(f"    {'':<10} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+            for field in TIMING_FIELDS + ("bytes",):
+                values = sorted(r[field] for r in items if r.get(field) is not None)
+                if not values:
+                    continue
+                fmt = (lambda v: f"{v / 1024:8.0f}K") if field == "bytes" else (lambda v: f"{v * 1000:7.0f}ms")
+                lines.append(f"    {field:<10} " + " ".join(fmt(percentile(values, p)) for p in (50, 95, 99))
+                             + " " + fmt(values[-1]))
+        per_domain = defaultdict(float)
+        for record in records:
+            per_domain[record["domain"]] += record["total_s"]
+        slowest = sorted(per_domain.items(), key=lambda item: item[1], reverse=True)[:SLOWEST_DOMAINS]
+        lines.append("  slowest domains (total seconds): "
+                     + ", ".join(f"{domain} {seconds:.2f}" for domain, seconds in slowest))
+        return "\n".join(lines)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""Streaming, early-terminating homepage extractor.
+
+ProductEnricher.extract_basic_info and find_logo_url ran about eight
+re.findall / re.search passes over the whole page text (one of them a
+DOTALL ".*?" scan for hero paragraphs), and fetch_page_content buffered
+pages of any size. PageExtractor is fed the raw bytes of the page a chunk
+at a time and scans each chunk once, while it is in hand, with the
+patterns that are still needed (each resumes where it stopped in the
+previous chunk, and drops out once it has found what it is for). The
+patterns run case-sensitively over an ASCII-lowercased copy of the chunk,
+which keeps re's literal-prefix search (IGNORECASE turns it off for
+patterns that start with a letter, and src=" and href=" scans were most of
+the old cost); matched text is taken from the original bytes. It collects:
+
+    title            first <title>text</title>
+    description      first <meta name="description" ... content="...">
+    h1s              <h1>text</h1>
+    taglines         <p class="...tagline...">text</p>, else
+                     <span class="...subtitle...">text</span>, else the
+                     first <p>text</p> after each <div class="...hero...">
+    logo candidates  src="..." containing logo + an image extension, else
+                     src="...svg", else href="...logo...image", keeping
+                     the first one that mentions dark/color/colour/logo
+
+which are the same patterns, priorities and URL normalisation as the old
+regexes (a construct longer than OVERLAP that straddles a chunk boundary
+is the one thing they would find and this does not). feed() returns True
+once the title, the description and a first-choice logo have all been
+seen; callers stop reading there, and h1s and taglines are whatever came
+before that point. Nothing is read past max_bytes, and only the unscanned
+tail of the page is kept in memory. keep_text=True keeps the text read so
+far for callers that need it (enrichment runs the keyword classifier over
+it); the page is then read up to max_bytes, but scanning still stops once
+everything is found. close() scans what is left when the page ends.
+Matching is ASCII case-insensitive where the old patterns were Unicode
+case-insensitive, and page text is decoded with the response's encoding
+(UTF-8 when it has none).
+
+    extractor = PageExtractor("example.com", encoding=response.encoding)
+    for chunk in response.iter_content(CHUNK_SIZE):
+        if extractor.feed(chunk):
+            break
+    extractor.close()
+    info, logo = extractor.info(), extractor.logo_url()
+"""
+import codecs
+import re
+import time
+
+from logo_resolver import clearbit_url, normalize_logo_url
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+CHUNK_SIZE = 16 * 1024
+# Longest construct guaranteed to be matched across a chunk boundary.
+OVERLAP = 4096
+
+# The old patterns, lowercased; they run over lowercased bytes.
+TITLE_RE = re.compile(rb'<title[^>]*>([^<]+)</title>')
+DESCRIPTION_RE = re.compile(rb'<meta[^>]*name="description"[^>]*content="([^"]+)"')
+H1_RE = re.compile(rb'<h1[^>]*>([^<]+)</h1>')
+TAGLINE_RE = re.compile(rb'<p[^>]*class="[^"]*tagline[^"]*"[^>]*>([^<]+)</p>')
+SUBTITLE_RE = re.compile(rb'<span[^>]*class="[^"]*subtitle[^"]*"[^>]*>([^<]+)</span>')
+HERO_DIV_RE = re.compile(rb'<div[^>]*class="[^"]*hero[^"]*"[^>]*>')
+PARAGRAPH_RE = re.compile(rb'<p[^>]*>([^<]+)</p>')
+LOGO_SRC_RE = re.compile(rb'src="([^"]*logo[^"]*\.(?:svg|png|jpg|jpeg)[^"]*)"')
+SVG_SRC_RE = re.compile(rb'src="([^"]*\.svg[^"]*)"')
+LOGO_HREF_RE = re.compile(rb'href="([^"]*logo[^"]*\.(?:svg|png|jpg|jpeg)[^"]*)"')
+PREFERRED_LOGO_TERMS = ('dark', 'color', 'colour', 'logo')
+
+# Logo candidate kinds, in the order the old patterns were tried.
+LOGO_SRC, SVG_SRC, LOGO_HREF = 0, 1, 2
+TAGLINE, SUBTITLE, HERO = 0, 1, 2
+
+
+def _codec_name(encoding):
+    """encoding if Python knows it, else UTF-8 (servers send all sorts of charset= values)."""
+    try:
+        return codecs.lookup(encoding).name if encoding else 'utf-8'
+    except LookupError:
+        return 'utf-8'
+
+
+class PageExtractor:
+    def __init__(self, domain, max_bytes=DEFAULT_MAX_BYTES, keep_text=False, encoding=None):
+        self.domain = domain
+        self.max_bytes = max_bytes
+        self.keep_text = keep_text
+        self.encoding = _codec_name(encoding)
+        self.bytes_read = 0
+        self.extract_seconds = 0.0  # time spent in feed() by extract_response
+        self.done = False
+        self.truncated = False
+
+        self.title = None
+        self.description = None
+        self.h1s = []
+        self.taglines = ([], [], [])
+        self.logos = [None, None, None]
+
+        self._buf = b""
+        self._low = b""
+        self._cursors = {}  # where each pattern resumes in _buf
+        self._hero_pending = False
+        self._text = []
+        self._decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace') if keep_text else None
+
+    # -- feeding -------------------------------------------------------------
+
+    def feed(self, chunk):
+        """Scan the next bytes of the page; returns True once nothing more is needed."""
+        if self.done:
+            return True
+        if self.bytes_read + len(chunk) > self.max_bytes:
+            chunk = chunk[:max(0, self.max_bytes - self.bytes_read)]
+            self.truncated = True
+        self.bytes_read += len(chunk)
+        if self.keep_text:
+            self._text.append(self._decoder.decode(chunk, final=self.truncated))
+        if not self._complete():
+            self._buf += chunk
+            self._low += chunk.lower()
+            self._scan(final=self.truncated)
+        if self.truncated or (not self.keep_text and self._complete()):
+            self.done = True
+        return self.done
+
+    def close(self):
+        """The page has ended: scan the tail held back for the next chunk."""
+        if self.done:
+            return
+        if self.keep_text:
+            self._text.append(self._decoder.decode(b"", final=True))
+        if not self._complete():
+            self._scan(final=True)
+        self.done = True
+
+    def _complete(self):
+        return self.title is not None and self.description is not None and self.logos[LOGO_SRC] is not None
+
+    def _group(self, m):
+        return self._buf[m.start(1):m.end(1)].decode(self.encoding, errors='replace')
+
+    def _scan(self, final):
+        low = self._low
+        # Matches starting in the last OVERLAP bytes may continue in the next chunk.
+        limit = len(low) if final else max(0, len(low) - OVERLAP)
+
+        if self.title is None:
+            for m in self._matches(TITLE_RE, limit, first=True):
+                self.title = self._group(m).strip()
+        if self.description is None:
+            for m in self._matches(DESCRIPTION_RE, limit, first=True):
+                self.description = self._group(m).strip()
+        self.h1s.extend(self._group(m).strip() for m in self._matches(H1_RE, limit))
+        self.taglines[TAGLINE].extend(self._group(m) for m in self._matches(TAGLINE_RE, limit))
+        self.taglines[SUBTITLE].extend(self._group(m) for m in self._matches(SUBTITLE_RE, limit))
+        self._scan_hero(limit)
+
+        if self.logos[LOGO_SRC] is None:
+            for m in self._matches(LOGO_SRC_RE, limit, first=True):
+                self._logo_candidate(LOGO_SRC, self._group(m))
+        for kind, regex in ((SVG_SRC, SVG_SRC_RE), (LOGO_HREF, LOGO_HREF_RE)):
+            if self.logos[LOGO_SRC] is None and self.logos[kind] is None:
+                for m in self._matches(regex, limit):
+                    if self._logo_candidate(kind, self._group(m)):
+                        break
+
+        # Every pattern has scanned up to limit; keep only the tail after it.
+        self._buf = self._buf[limit:]
+        self._low = low[limit:]
+        self._cursors = {regex: pos - limit for regex, pos in self._cursors.items()}
+
+    def _matches(self, regex, limit, first=False):
+        """Matches of regex starting before limit, from where it last stopped (like findall)."""
+        pos = self._cursors.get(regex, 0)
+        found = []
+        for m in regex.finditer(self._low, pos):
+            if m.start() >= limit:
+                break
+            found.append(m)
+            pos = m.end()
+            if first:
+                break
+        self._cursors[regex] = max(pos, limit)
+        return found
+
+    def _scan_hero(self, limit):
+        """The first <p>text</p> after each hero div, as the old DOTALL '.*?' pattern found them."""
+        pos = self._cursors.get(HERO_DIV_RE, 0)
+        while True:
+            m = (PARAGRAPH_RE if self._hero_pending else HERO_DIV_RE).search(self._low, pos)
+            if m is None or m.start() >= limit:
+                break
+            pos = m.end()
+            if self._hero_pending:
+                self.taglines[HERO].append(self._group(m))
+            self._hero_pending = not self._hero_pending
+        self._cursors[HERO_DIV_RE] = max(pos, limit)
+
+    def _logo_candidate(self, kind, value):
+        if self.logos[kind] is not None:
+            return True
+        url = normalize_logo_url(self.domain, value)
+        if any(term in url.lower() for term in PREFERRED_LOGO_TERMS):
+            self.logos[kind] = url
+            return True
+        return False
+
+    # -- results -------------------------------------------------------------
+
+    def info(self):
+        """The dict extract_basic_info returns."""
+        info = {}
+        if self.title is not None:
+            info['page_title'] = self.title
+        if self.description is not None:
+            info['meta_description'] = self.description
+        info['h1_tags'] = list(self.h1s)
+        for matches in self.taglines:
+            if matches:
+                info['potential_taglines'] = list(matches)
+                break
+        return info
+
+    def logo_url(self):
+        """The URL find_logo_url returns (Clearbit when no candidate qualified)."""
+        for url in self.logos:
+            if url is not None:
+                return url
+        return clearbit_url(self.domain)
+
+    def text(self):
+        """Page text read so far (only with keep_text=True)."""
+        return "".join(self._text)
+
+
+def extract_text(content, domain, max_bytes=DEFAULT_MAX_BYTES):
+    """Run the extractor over an already downloaded page string."""
+    extractor = PageExtractor(domain, max_bytes)
+    data = content.encode('utf-8')
+    for start in range(0, len(data), CHUNK_SIZE):
+        if extractor.feed(data[start:start + CHUNK_SIZE]):
+            break
+    extractor.close()
+    return extractor
+
+
+def extract_response(response, domain, max_bytes=DEFAULT_MAX_BYTES, keep_text=False):
+    """Stream a requests response (opened with stream=True) through the extractor.
+
+    Stops reading as soon as the extractor is done and closes the response.
+    """
+    extractor = PageExtractor(domain, max_bytes, keep_text, response.encoding)
+    try:
+        for chunk in response.iter_content(CHUNK_SIZE):
+            start = time.perf_counter()
+            done = extractor.feed(chunk)
+            extractor.extract_seconds += time.perf_counter() - start
+            if done:
+                break
+        extractor.close()
+    finally:
+        response.close()
+    return extractor
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""On-disk HTTP cache with conditional revalidation.
+
+ProductEnricher.fetch_page_content downloaded every homepage in full on
+every run. HttpCache sits in front of the fetch:
+
+    .build/http-cache/entries/ab/<sha256 of url>.json   status, headers, ETag,
+                                                         Last-Modified, fetched_at,
+                                                         encoding, body digest
+    .build/http-cache/bodies/cd/<sha256 of body>         raw body bytes
+
+Bodies are content-addressed, so pages that come back unchanged (or that
+several URLs share) are stored once. A cached entry younger than ttl
+seconds is served without a request. An older one is revalidated with
+If-None-Match / If-Modified-Since; a 304 refreshes the entry and serves the
+stored body, anything else replaces it. Only 2xx responses are cached.
+
+offline=True never touches the network: cached pages are served however
+old they are and uncached URLs raise OfflineMiss, which lets extraction
+code be re-run over the pages from the last online run.
+
+With max_bytes the page is streamed and only its first max_bytes are
+read and cached (the entry is marked truncated), so memory per fetch stays
+bounded.
+
+stats counts hits, misses, revalidations and offline misses; report()
+formats them for the end of a run. Responses from fetch() carry
+cache_status ("hit", "revalidated" or "miss") for fetch telemetry.
+
+    cache = HttpCache(ttl=24 * 3600)
+    response = cache.fetch(url, session.get)
+    print(cache.report())
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(ROOT, ".build", "http-cache")
+DEFAULT_TTL = 24 * 3600
+
+# Response headers worth keeping with a cached page.
+KEEP_HEADERS = ("content-type", "etag", "last-modified", "cache-control", "date", "content-language")
+
+
+class OfflineMiss(Exception):
+    """Raised in offline mode for a URL that has never been cached."""
+
+
+class CachedResponse:
+    """The parts of requests.Response that callers of the cache use (header names lowercased)."""
+
+    def __init__(self, url, status_code, headers, content, encoding, from_cache):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        pass  # only 2xx responses are ever cached
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _read_capped(response, max_bytes):
+    """(first max_bytes of a streamed body, whether it was cut off); closes the response."""
+    chunks, size = [], 0
+    try:
+        for chunk in response.iter_content(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+        else:
+            return b"".join(chunks), False
+    finally:
+        response.close()
+    return b"".join(chunks)[:max_bytes], True
+
+
+class HttpCache:
+    def __init__(self, root=CACHE_DIR, ttl=DEFAULT_TTL, offline=False):
+        self.root = root
+        self.ttl = ttl
+        self.offline = offline
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, what):
+        with self._lock:
+            self.stats[what] += 1
+
+    def _entry_path(self, url):
+        key = _digest(url.encode("utf-8"))
+        return os.path.join(self.root, "entries", key[:2], key + ".json")
+
+    def _body_path(self, digest):
+        return os.path.join(self.root, "bodies", digest[:2], digest)
+
+    def lookup(self, url):
+        """(entry, body bytes) for url, or None."""
+        try:
+            with open(self._entry_path(url), 'r') as f:
+                entry = json.load(f)
+            with open(self._body_path(entry["body"]), 'rb') as f:
+                body = f.read()
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+        if entry.get("url") != url:
+            return None
+        return entry, body
+
+    def store(self, url, response, body=None, truncated=False):
+        body = response.content if body is None else body
+        digest = _digest(body)
+        body_path = self._body_path(digest)
+        if not os.path.exists(body_path):
+            _write_atomic(body_path, body)
+        headers = {k.lower(): v for k, v in response.headers.items() if k.lower() in KEEP_HEADERS}
+        entry = {
+            "url": url,
+            "status": response.status_code,
+            "headers": headers,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "encoding": response.encoding,
+            "fetched_at": time.time(),
+            "body": digest,
+            "truncated": truncated,
+        }
+        self._save_entry(url, entry)
+        return entry, body
+
+    def _save_entry(self, url, entry):
+        _write_atomic(self._entry_path(url), json.dumps(entry).encode("utf-8"))
+
+    def _response(self, url, entry, body, cache_status):
+        response = CachedResponse(url, entry["status"], entry["headers"], body, entry.get("encoding"), True)
+        response.cache_status = cache_status
+        return response
+
+    def fetch(self, url, get, max_bytes=None, **kwargs):
+        """Response for url, from the cache when possible.
+
+        get is called like session.get(url, headers=..., **kwargs) when the
+        network is needed. Non-2xx responses are returned uncached. With
+        max_bytes, a fetched 2xx body is cut off after max_bytes.
+        """
+        cached = self.lookup(url)
+        if cached is not None:
+            entry, body = cached
+            if self.offline or time.time() - entry["fetched_at"] < self.ttl:
+                self._count("hit")
+                return self._response(url, entry, body, "hit")
+        elif self.offline:
+            self._count("offline_miss")
+            raise OfflineMiss(f"{url} is not in the cache")
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if cached is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        if max_bytes is not None:
+            kwargs["stream"] = True
+        response = get(url, headers=headers, **kwargs)
+
+        if cached is not None and response.status_code == 304:
+            response.close()  # may be streamed; the cached body is what we return
+            self._count("revalidated")
+            for name in ("etag", "last-modified", "cache-control", "date"):
+                if name in response.headers:
+                    entry["headers"][name] = response.headers[name]
+            entry["etag"] = response.headers.get("ETag", entry.get("etag"))
+            entry["last_modified"] = response.headers.get("Last-Modified", entry.get("last_modified"))
+            entry["fetched_at"] = time.time()
+            self._save_entry(url, entry)
+            return self._response(url, entry, body, "revalidated")
+
+        self._count("miss")
+        response.cache_status = "miss"
+        if 200 <= response.status_code < 300:
+            if max_bytes is None:
+                self.store(url, response)
+                return response
+            body, truncated = _read_capped(response, max_bytes)
+            entry, body = self.store(url, response, body, truncated)
+            capped = CachedResponse(url, entry["status"], entry["headers"], body, entry["encoding"], False)
+            capped.cache_status = "miss"
+            return capped
+        return response
+
+    def report(self):
+        s = self.stats
+        line = f"HTTP cache: {s['hit']} hits, {s['miss']} misses, {s['revalidated']} revalidated (304)"
+        if s["offline_miss"]:
+            line += f", {s['offline_miss']} not cached (offline)"
+        return line
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""In-process, streaming logo URL resolver.
+
+enrich_all_25_products.get_logo_url used to run
+
+    curl -sL https://<domain> | head -50 | grep -oP 'src="[^"]*logo[^"]*\\.(svg|png|jpg|jpeg)[^"]*"' | head -1 | sed | sed
+
+for every product: a shell, five processes and a new TLS connection per
+domain, and only the first 50 lines of HTML were searched, so the logo in
+a site header further down the page was usually missed.
+
+resolve_logo() fetches the homepage over a pooled session (see
+polite_fetch.py) and scans the body while it streams in, with the same
+pattern the grep used. It stops at the first candidate, when the page
+header (</header>) has gone by without one, or after max_bytes, and
+closes the response without downloading the rest. The path is normalised
+exactly as before (//host/x, /x, http..., relative), and domains with no
+candidate fall back to Clearbit. resolve_logos() runs many domains
+concurrently with the usual per-host limits. With a fetcher that carries
+a Telemetry (see fetch_telemetry.py), each fetch is recorded as a "logo"
+request.
+
+    python scripts/logo_resolver.py crexi.com reonomy.com ...
+
+bench/bench_logo.py compares it with the subprocess pipeline.
+"""
+import re
+import sys
+import time
+
+from fetch_telemetry import response_fields
+from polite_fetch import PoliteFetcher
+
+MAX_BYTES = 256 * 1024
+CHUNK_SIZE = 16 * 1024
+
+# grep -oP 'src="[^"]*logo[^"]*\.(svg|png|jpg|jpeg)[^"]*"' works line by line,
+# hence the excluded newlines.
+LOGO_SRC_RE = re.compile(rb'src="([^"\n]*logo[^"\n]*\.(?:svg|png|jpg|jpeg)[^"\n]*)"')
+HEADER_END_RE = re.compile(rb'</header\s*>', re.IGNORECASE)
+# Longest stretch a match can span; the scan re-reads this much of the previous chunk.
+OVERLAP = 4096
+
+
+def clearbit_url(domain):
+    return f"https://logo.clearbit.com/{domain}"
+
+
+def normalize_logo_url(domain, logo_path):
+    """Absolute URL for a src= value found on https://<domain>."""
+    if logo_path.startswith('//'):
+        return 'https:' + logo_path
+    elif logo_path.startswith('/'):
+        return f'https://{domain}' + logo_path
+    elif logo_path.startswith('http'):
+        return logo_path
+    else:
+        return f'https://{domain}/' + logo_path
+
+
+def scan_for_logo(chunks, max_bytes=MAX_BYTES):
+    """First logo src= in a stream of byte chunks, or None.
+
+    Stops reading once a candidate is found, once </header> has been seen
+    with no candidate before it, or after max_bytes.
+    """
+    buf = b""
+    start = 0
+    for chunk in chunks:
+        buf += chunk
+        match = LOGO_SRC_RE.search(buf, start)
+        if match:
+            return match.group(1).decode("utf-8", errors="replace")
+        if HEADER_END_RE.search(buf, start) or len(buf) >= max_bytes:
+            return None
+        start = max(0, len(buf) - OVERLAP)
+        if start:
+            # Keep only the tail a match could still start in.
+            buf = buf[start:]
+            max_bytes -= start
+            start = 0
+    return None
+
+
+def _timed_chunks(chunks, record):
+    """Pass chunks through, adding their bytes and the time spent reading them to record."""
+    chunks = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        chunk = next(chunks, None)
+        record["read_s"] = record.get("read_s", 0.0) + time.perf_counter() - start
+        if chunk is None:
+            return
+        record["bytes"] = record.get("bytes", 0) + len(chunk)
+        yield chunk
+
+
+def find_logo_path(fetcher, domain, max_bytes=MAX_BYTES, url=None):
+    url = url or f"https://{domain}"
+    with fetcher.telemetry.request("logo", domain, url) as record:
+        response = fetcher.get(url, stream=True)
+        record.update(response_fields(response))
+        try:
+            start = time.perf_counter()
+            path = scan_for_logo(_timed_chunks(response.iter_content(CHUNK_SIZE), record), max_bytes)
+            # Reading is interleaved with the scan; extract_s is the scan alone
+            record["extract_s"] = round(time.perf_counter() - start - record.pop("read_s", 0.0), 6)
+            return path
+        finally:
+            response.close()
+
+
+def resolve_logo(domain, fetcher=None, max_bytes=MAX_BYTES, url=None):
+    """Logo URL for a domain (homepage at url, default https://<domain>), falling back to Clearbit."""
+    fetcher = fetcher or PoliteFetcher()
+    try:
+        logo_path = find_logo_path(fetcher, domain, max_bytes, url)
+    except Exception:
+        logo_path = None
+    if logo_path and logo_path.strip():
+        return normalize_logo_url(domain, logo_path.strip())
+    return clearbit_url(domain)
+
+
+def resolve_logos(domains, fetcher=None, max_bytes=MAX_BYTES):
+    """{domain: logo URL} for many domains, fetched concurrently."""
+    fetcher = fetcher or PoliteFetcher()
+    return dict(fetcher.map(domains, lambda domain: resolve_logo(domain, fetcher, max_bytes)))
+
+
+if __name__ == "__main__":
+    for domain, logo_url in resolve_logos(sys.argv[1:]).items():
+        print(f"{domain}: {logo_url}")
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""Near-duplicate detection for catalog records.
+
+process() only drops rows whose slug was already seen, so the same vendor
+listed under another title or URL (www. variants, regional domains,
+product-line pages) stays in the catalog twice. NearDuplicateFinder looks
+for those in close to linear time:
+
+  * Every record's site is get_domain(url) cut down to its registrable
+    domain (app.yardi.com -> yardi.com, yardi.co.uk stays yardi.co.uk),
+    and its brand is the first label of that (yardi). Records sharing a
+    brand are candidate pairs.
+  * Title + description word bigrams are reduced to a 64-slot MinHash
+    signature with one-permutation hashing (each shingle is hashed once;
+    the top bits pick the slot, the slot keeps its smallest value, empty
+    slots borrow from the next filled one). Signatures are split into 16
+    bands of 4 slots; records that agree on a whole band are candidate
+    pairs, so pairs with Jaccard 0.5 are found about 2 times in 3 and
+    pairs above 0.8 almost always.
+  * Brand groups and LSH buckets larger than MAX_GROUP are skipped and
+    counted (shared hosts, boilerplate descriptions), which keeps pair
+    generation linear in the number of records.
+
+Each candidate pair is scored by estimated text Jaccard (the share of
+equal signature slots) and title token Jaccard. Pairs that reach
+REVIEW_TEXT, or share a brand and reach REVIEW_TITLE / REVIEW_BRAND_TEXT,
+are reported. A pair is marked "merge" when the brand matches and either
+the text is MERGE_SIMILARITY similar or the title is and the text reaches
+REVIEW_BRAND_TEXT (different vendors do share names across TLDs), or when
+the text is MERGE_TEXT similar and the titles overlap. Pairs are joined into clusters;
+each cluster keeps its richest record (most filled fields, then catalog
+order) and lists the others.
+
+merge_records() folds duplicates into the kept record: empty fields are
+filled from the duplicates, categories / property_types / deployment are
+unioned and the dropped slugs are listed in merged_from.
+
+The report goes to .build/near-duplicates.json. process_data.py runs this
+stage with --dedupe report|merge; run directly it checks products.json,
+and --merge applies the "merge" clusters in place.
+
+    python scripts/near_duplicates.py [--products data/products.json] [--report PATH] [--merge]
+"""
+import argparse
+import json
+import os
+import re
+import time
+import zlib
+from array import array
+from operator import eq
+
+from category_index import sync_categories_file
+from domains import get_domain
+from product_store import ProductStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "data")
+REPORT_PATH = os.path.join(ROOT, ".build", "near-duplicates.json")
+REPORT_VERSION = 1
+
+SLOTS = 64
+SLOT_SHIFT = 58            # top 6 bits of a 64-bit shingle hash pick the slot
+VALUE_SHIFT = 26           # the next 32 bits are what the slot keeps
+BANDS, ROWS = 16, 4
+MAX_GROUP = 100
+SUMMARY_CLUSTERS = 20
+
+REVIEW_TEXT = 0.5
+REVIEW_TITLE = 0.5
+REVIEW_BRAND_TEXT = 0.3
+MERGE_SIMILARITY = 0.8
+MERGE_TEXT = 0.9
+
+MASK32 = (1 << 32) - 1
+DENSIFY_STEP = 0x61C88647
+
+WORD_RE = re.compile(r"[^\W_]+")
+# Runs of anything but whitespace and ASCII punctuation, so UTF-8 words stay whole
+TOKEN_RE = re.compile(rb"[^\s!-/:-@\[-`{-~]+")
+# Title words that don't tell two vendors apart
+TITLE_NOISE = {"inc", "llc", "ltd", "co", "corp", "corporation", "the", "software", "app", "platform", "by",
+               "com", "io", "net"}
+# Registrable domains one level below these belong to different owners
+SECOND_LEVEL = {"co", "com", "net", "org", "gov", "ac", "edu"}
+HOSTING_SUFFIXES = {"herokuapp.com", "github.io", "wixsite.com", "webflow.io", "netlify.app", "vercel.app",
+                    "azurewebsites.net", "web.app", "firebaseapp.com", "myshopify.com", "bubbleapps.io"}
+UNION_FIELDS = ("categories", "property_types", "deployment")
+
+
+def site_key(domain):
+    """(registrable domain, brand label) for a get_domain() result; ("", "") when there is none."""
+    host = domain.lower().split("/")[0].split(":")[0].strip(".")
+    labels = host.split(".")
+    if len(labels) < 2 or not all(labels):
+        return "", ""
+    keep = 2
+    if len(labels) >= 3 and (".".join(labels[-2:]) in HOSTING_SUFFIXES
+                             or (labels[-2] in SECOND_LEVEL and len(labels[-1]) == 2)):
+        keep = 3
+    registrable = labels[-keep:]
+    return ".".join(registrable), registrable[0]
+
+
+def title_tokens(title):
+    return {token for token in WORD_RE.findall(title.lower()) if token not in TITLE_NOISE}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def record_text(record):
+    return " ".join((record.get("title") or "",
+                     record.get("description") or record.get("short_description") or record.get("tagline") or ""))
+
+
+def signature(text):
+    """SLOTS 32-bit MinHash values for the word bigrams of text, or None when it has no words.
+
+    Words are hashed with crc32 and bigrams with hash() of a tuple of ints,
+    which CPython does not randomise, so signatures are stable between
+    runs (on 64-bit builds) and computed without a Python-level loop.
+    """
+    hashes = list(map(zlib.crc32, TOKEN_RE.findall(text.lower().encode("utf-8"))))
+    if not hashes:
+        return None
+    shingles = list(map(hash, zip(hashes, hashes[1:]) if len(hashes) > 1 else zip(hashes)))
+    # Sorted high to low, so each slot ends up holding its smallest hash. The
+    # hashes are signed, but within one slot they share the sign bit.
+    best = {h >> SLOT_SHIFT & (SLOTS - 1): h >> VALUE_SHIFT & MASK32 for h in sorted(shingles, reverse=True)}
+    if len(best) == SLOTS:
+        return [best[slot] for slot in range(SLOTS)]
+    # Empty slots take the value of the next filled slot (wrapping around),
+    # offset by how far away it is
+    values = [0] * SLOTS
+    first = min(best)
+    nearest, distance = best[first], 0
+    for step in range(SLOTS):
+        slot = (first - step) % SLOTS
+        if slot in best:
+            nearest, distance = best[slot], 0
+        else:
+            distance += 1
+            values[slot] = (nearest + distance * DENSIFY_STEP) & MASK32
+            continue
+        values[slot] = nearest
+    return values
+
+
+def _filled(value):
+    return value is not None and value != "" and value != [] and value != {}
+
+
+def richness(record):
+    return sum(1 for value in record.values() if _filled(value)) + (2 if record.get("is_verified") else 0)
+
+
+def merge_records(keeper, duplicates):
+    """keeper with empty fields filled from duplicates, list fields unioned and merged_from set."""
+    merged = dict(keeper)
+    merged_from = set(keeper.get("merged_from") or [])
+    for dup in duplicates:
+        merged_from.add(dup["slug"])
+        merged_from.update(dup.get("merged_from") or [])
+        for key, value in dup.items():
+            if key in ("slug", "merged_from"):
+                continue
+            current = merged.get(key)
+            if key in UNION_FIELDS and isinstance(current, list) and isinstance(value, list):
+                merged[key] = current + [v for v in value if v not in current]
+            elif not _filled(current) and _filled(value):
+                merged[key] = value
+    merged_from.discard(keeper["slug"])
+    merged["merged_from"] = sorted(merged_from)
+    return merged
+
+
+class _Clusters:
+    """Union-find over row ids."""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        parent = self.parent
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while x != root:
+            parent[x], x = root, parent.get(x, x)
+        return root
+
+    def union(self, a, b):
+        self.parent.setdefault(a, a)
+        self.parent.setdefault(b, b)
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+    def groups(self):
+        groups = {}
+        for x in list(self.parent):
+            groups.setdefault(self.find(x), []).append(x)
+        return [sorted(members) for _, members in sorted(groups.items())]
+
+
+class NearDuplicateFinder:
+    """Collects compact per-record features with add(); find() returns the report."""
+
+    def __init__(self):
+        self.slugs = []
+        self.titles = []
+        self.sites = []
+        self.row_brands = []
+        self.brands = {}  # brand -> row ids
+        self.richness = array('H')
+        self.has_signature = bytearray()
+        self.signatures = array('I')
+        self.stats = {"records": 0, "without_text": 0, "oversized_brands": 0, "oversized_buckets": 0,
+                      "candidate_pairs": 0, "reported_pairs": 0, "merge_pairs": 0}
+
+    def add(self, record):
+        row = len(self.slugs)
+        self.slugs.append(record["slug"])
+        self.titles.append(record.get("title") or "")
+        site, brand = site_key(get_domain(record.get("url") or ""))
+        self.sites.append(site)
+        self.row_brands.append(brand)
+        if brand:
+            self.brands.setdefault(brand, []).append(row)
+        self.richness.append(min(richness(record), 0xFFFF))
+        values = signature(record_text(record))
+        self.has_signature.append(values is not None)
+        self.signatures.extend(values or [0] * SLOTS)
+        return row
+
+    def _candidate_pairs(self):
+        pairs = set()
+        n = len(self.slugs)
+
+        def add_group(rows):
+            if len(rows) > MAX_GROUP:
+                return False
+            for i, a in enumerate(rows):
+                for b in rows[i + 1:]:
+                    pairs.add(a * n + b)  # rows are in ascending order
+            return True
+
+        for rows in self.brands.values():
+            if len(rows) > 1 and not add_group(rows):
+                self.stats["oversized_brands"] += 1
+
+        blob = self.signatures.tobytes()
+        record_width, band_width = SLOTS * 4, ROWS * 4
+        has_signature = self.has_signature
+        for band in range(BANDS):
+            buckets = {}
+            offset = band * band_width
+            for row in range(n):
+                if has_signature[row]:
+                    start = row * record_width + offset
+                    key = blob[start:start + band_width]
+                    bucket = buckets.get(key)
+                    if bucket is None:
+                        buckets[key] = row
+                    elif type(bucket) is int:
+                        buckets[key] = [bucket, row]
+                    else:
+                        bucket.append(row)
+            for bucket in buckets.values():
+                if type(bucket) is list and not add_group(bucket):
+                    self.stats["oversized_buckets"] += 1
+        return pairs
+
+    def text_similarity(self, a, b):
+        if not (self.has_signature[a] and self.has_signature[b]):
+            return 0.0
+        sig = self.signatures
+        return sum(map(eq, sig[a * SLOTS:(a + 1) * SLOTS], sig[b * SLOTS:(b + 1) * SLOTS])) / SLOTS
+
+    def score(self, a, b):
+        """Pair entry for rows a < b, or None when they don't look alike."""
+        text = self.text_similarity(a, b)
+        title = jaccard(title_tokens(self.titles[a]), title_tokens(self.titles[b]))
+        same_site = bool(self.sites[a]) and self.sites[a] == self.sites[b]
+        same_brand = bool(self.row_brands[a]) and self.row_brands[a] == self.row_brands[b]
+        if not (text >= REVIEW_TEXT or (same_brand and (title >= REVIEW_TITLE or text >= REVIEW_BRAND_TEXT))):
+            return None
+        merge = ((same_brand and (text >= MERGE_SIMILARITY
+                                  or (title >= MERGE_SIMILARITY and text >= REVIEW_BRAND_TEXT)))
+                 or (text >= MERGE_TEXT and title >= REVIEW_TITLE))
+        return {"a": self.slugs[a], "b": self.slugs[b], "text": round(text, 3), "title": round(title, 3),
+                "same_site": same_site, "same_brand": same_brand, "action": "merge" if merge else "review"}
+
+    def _cluster(self, members, pairs):
+        keep = max(members, key=lambda row: (self.richness[row], -row))
+        return {
+            "keep": self.slugs[keep],
+            "duplicates": [self.slugs[row] for row in members if row != keep],
+            "pairs": pairs,
+        }
+
+    def find(self):
+        start = time.perf_counter()
+        n = self.stats["records"] = len(self.slugs)
+        self.stats["without_text"] = n - sum(self.has_signature)
+        candidates = self._candidate_pairs()
+        self.stats["candidate_pairs"] = len(candidates)
+
+        scored = []
+        merge, linked = _Clusters(), _Clusters()
+        for key in sorted(candidates):
+            a, b = divmod(key, n)
+            entry = self.score(a, b)
+            if entry is None:
+                continue
+            scored.append((a, b, entry))
+            linked.union(a, b)
+            if entry["action"] == "merge":
+                merge.union(a, b)
+        self.stats["reported_pairs"] = len(scored)
+        self.stats["merge_pairs"] = sum(1 for _, _, entry in scored if entry["action"] == "merge")
+
+        merge_pairs, linked_pairs, open_review = {}, {}, set()
+        for a, b, entry in scored:
+            root = linked.find(a)
+            linked_pairs.setdefault(root, []).append(entry)
+            if entry["action"] == "merge":
+                merge_pairs.setdefault(merge.find(a), []).append(entry)
+            elif merge.find(a) != merge.find(b):
+                open_review.add(root)  # review pairs inside one merge cluster are settled by the merge
+
+        self.stats["seconds"] = round(time.perf_counter() - start, 3)
+        return {
+            "version": REPORT_VERSION,
+            "signature": {"slots": SLOTS, "bands": BANDS, "rows": ROWS},
+            "stats": self.stats,
+            "merge": [self._cluster(members, merge_pairs[members[0]]) for members in merge.groups()],
+            "review": [self._cluster(members, linked_pairs[members[0]]) for members in linked.groups()
+                       if members[0] in open_review],
+        }
+
+
+def find_near_duplicates(records):
+    finder = NearDuplicateFinder()
+    for record in records:
+        finder.add(record)
+    return finder.find()
+
+
+def apply_merges(products, report):
+    """products with each "merge" cluster folded into its kept record, in catalog order."""
+    by_slug = {p["slug"]: p for p in products}
+    merged, dropped = {}, set()
+    for cluster in report["merge"]:
+        merged[cluster["keep"]] = merge_records(by_slug[cluster["keep"]],
+                                                [by_slug[slug] for slug in cluster["duplicates"]])
+        dropped.update(cluster["duplicates"])
+    return [merged.get(p["slug"], p) for p in products if p["slug"] not in dropped]
+
+
+def write_report(report, path=REPORT_PATH):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def summary(report):
+    s = report["stats"]
+    lines = [f"Near duplicates: {s['records']} records, {s['candidate_pairs']} candidate pairs, "
+             f"{s['merge_pairs']} merge / {s['reported_pairs'] - s['merge_pairs']} review pairs in {s['seconds']}s"]
+    if s["oversized_brands"] or s["oversized_buckets"]:
+        lines.append(f"  skipped {s['oversized_brands']} brands and {s['oversized_buckets']} LSH buckets "
+                     f"with more than {MAX_GROUP} records")
+    for action in ("merge", "review"):
+        clusters = report[action]
+        if len(clusters) > SUMMARY_CLUSTERS:
+            lines.append(f"  {len(clusters)} {action} clusters, first {SUMMARY_CLUSTERS}:")
+        for cluster in clusters[:SUMMARY_CLUSTERS]:
+            best = max(cluster["pairs"], key=lambda p: (p["text"], p["title"]))
+            lines.append(f"  {action:<6} {cluster['keep']} <- {', '.join(cluster['duplicates'])} "
+                         f"(text {best['text']:.2f}, title {best['title']:.2f}"
+                         + (", same site" if best["same_site"] else ", same brand" if best["same_brand"] else "")
+                         + ")")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate products in products.json.")
+    parser.add_argument("--products", default=os.path.join(DATA_DIR, "products.json"))
+    parser.add_argument("--categories", default=os.path.join(DATA_DIR, "categories.json"))
+    parser.add_argument("--report", default=REPORT_PATH, help="JSON report path (default: .build/near-duplicates.json)")
+    parser.add_argument("--merge", action="store_true",
+                        help="fold every \"merge\" cluster into its kept record and remove the duplicates")
+    args = parser.parse_args()
+
+    store = ProductStore(args.products)
+    report = find_near_duplicates(store.products)
+    write_report(report, args.report)
+    print(summary(report))
+    print(f"Report written to {args.report}")
+
+    if args.merge and report["merge"]:
+        for cluster in report["merge"]:
+            duplicates = [store.get(slug) for slug in cluster["duplicates"]]
+            store.update(cluster["keep"], merge_records(store.get(cluster["keep"]), duplicates))
+            for slug in cluster["duplicates"]:
+                store.remove(slug)
+        changed = store.flush()
+        if os.path.exists(args.categories):
+            sync_categories_file(args.categories, store.products, changed)
+        print(f"Merged {sum(len(c['duplicates']) for c in report['merge'])} duplicates "
+              f"into {len(report['merge'])} products")
+
+
+if __name__ == "__main__":
+    main()
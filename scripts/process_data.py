@@ -1,35 +1,35 @@
 #!/usr/bin/env python3
 """Process raw CRE directory CSV into structured JSON."""
+import argparse
 import csv
+import glob
 import json
 import re
 import os
-from urllib.parse import urlparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote
+
+import build_state
+import near_duplicates
+from catalog_db import CatalogDB
+from category_index import CANONICAL_CATEGORIES, CategoryIndex, build_category_data, slugify
+from category_matcher import CategoryMatcher
+from domains import get_domain
+from product_shards import build_shards_from_files
+from sitemap_writer import CATEGORY_PRIORITY, HOME_PRIORITY, PRODUCT_PRIORITY, SITE, SitemapWriter
+from stage_profile import NullProfiler, StageProfiler
+from text_signals import classify
 
 RAW_CSV = "/home/openclaw/.openclaw/workspace/cre-directory/raw-data.csv"
 OUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+PROFILE_REPORT = os.path.join(os.path.dirname(OUT_DIR), ".build", "profile.json")
 
-# Canonical categories and mapping from messy CSV categories
-CANONICAL_CATEGORIES = {
-    "Property Management": "Tools for managing commercial and residential properties, tenants, and maintenance.",
-    "CRM & Marketing": "Customer relationship management and marketing tools for real estate professionals.",
-    "Investment & Valuation": "Software for real estate investment analysis, valuation, and portfolio management.",
-    "Construction & Development": "Tools for construction management, project development, and planning.",
-    "Lease Administration": "Lease management, tracking, and administration software.",
-    "Data & Analytics": "Data platforms, analytics, and business intelligence for real estate.",
-    "Broker Tools": "Software designed specifically for commercial real estate brokers.",
-    "Site Selection": "Tools for location analysis, site selection, and market research.",
-    "Tenant Experience": "Platforms enhancing tenant engagement, communication, and building experience.",
-    "Accounting & Finance": "Financial management, accounting, and budgeting for real estate.",
-    "AI & Automation": "Artificial intelligence and automation tools for real estate workflows.",
-    "Listing Services": "Property listing platforms and marketing for available spaces.",
-    "Crowdfunding & Investing": "Real estate crowdfunding and investment platforms.",
-    "Energy & Sustainability": "Energy management, sustainability, and green building tools.",
-    "Legal & Compliance": "Legal, regulatory, and compliance tools for real estate.",
-    "Workplace & Space Management": "Workspace planning, space utilization, and facility management.",
-}
+# Rows per task when --workers > 1
+CHUNK_SIZE = 2000
 
-# Map messy category keywords to canonical
+
+# Mapping from messy CSV categories to CANONICAL_CATEGORIES (category_index.py)
 CATEGORY_MAP = {
     "property management": "Property Management",
     "management": "Property Management",
@@ -132,23 +132,8 @@ CATEGORY_MAP = {
     "multifamily": "Property Management",
 }
 
-
-def slugify(text):
-    s = text.lower().strip()
-    s = re.sub(r'[^\w\s-]', '', s)
-    s = re.sub(r'[\s_]+', '-', s)
-    s = re.sub(r'-+', '-', s).strip('-')
-    return s
-
-
-def get_domain(url):
-    try:
-        parsed = urlparse(url)
-        domain = parsed.netloc or parsed.path
-        domain = domain.replace("www.", "")
-        return domain
-    except:
-        return ""
+CATEGORY_MATCHER = CategoryMatcher(CATEGORY_MAP)
+CATEGORY_SPLIT = re.compile(r'[;,]')
 
 
 def map_categories(raw_cats, row):
@@ -157,19 +142,15 @@ def map_categories(raw_cats, row):
     
     # From Category field
     if raw_cats:
-        for cat in re.split(r'[;,]', raw_cats):
+        for cat in CATEGORY_SPLIT.split(raw_cats):
             cat_lower = cat.strip().lower()
             if not cat_lower:
                 continue
-            # Try exact match first
-            if cat_lower in CATEGORY_MAP:
-                cats.add(CATEGORY_MAP[cat_lower])
-            else:
-                # Try substring match
-                for key, val in CATEGORY_MAP.items():
-                    if key in cat_lower or cat_lower in key:
-                        cats.add(val)
-                        break
+            # Exact key, else first key (in map order) that is a substring
+            # of the token or contains it
+            canonical = CATEGORY_MATCHER.match(cat_lower)
+            if canonical:
+                cats.add(canonical)
     
     # From boolean flags
     flag_map = {
@@ -191,155 +172,499 @@ def map_categories(raw_cats, row):
     return sorted(cats)
 
 
+PRODUCT_SIGNALS = ("property_types", "deployment", "pricing_model")
+
+
 def infer_property_types(desc):
-    types = []
-    desc_lower = (desc or "").lower()
-    for pt in ["Office", "Retail", "Industrial", "Multifamily", "Mixed-Use"]:
-        if pt.lower() in desc_lower:
-            types.append(pt)
-    if "residential" in desc_lower:
-        types.append("Residential")
-    if "commercial" in desc_lower and not types:
-        types.extend(["Office", "Retail", "Industrial"])
-    if not types:
-        types.append("Commercial")
-    return sorted(set(types))
+    return classify(desc, ["property_types"])["property_types"]
 
 
 def infer_deployment(desc):
-    dep = []
-    desc_lower = (desc or "").lower()
-    if any(w in desc_lower for w in ["cloud", "saas", "web-based", "web based", "browser", "online"]):
-        dep.append("Cloud")
-    if any(w in desc_lower for w in ["on-premise", "on premise", "desktop", "installed"]):
-        dep.append("On-Premise")
-    if any(w in desc_lower for w in ["mobile", "ios", "android", "app"]):
-        dep.append("Mobile")
-    if not dep:
-        dep.append("Cloud")  # default assumption for modern SaaS
-    return dep
+    return classify(desc, ["deployment"])["deployment"]
 
 
 def infer_pricing(desc):
-    desc_lower = (desc or "").lower()
-    if "free" in desc_lower and ("trial" not in desc_lower):
-        if "freemium" in desc_lower or "premium" in desc_lower:
-            return "Freemium"
-        return "Free"
-    if "subscription" in desc_lower or "monthly" in desc_lower or "per month" in desc_lower:
-        return "Subscription"
-    if "quote" in desc_lower or "contact" in desc_lower or "custom pricing" in desc_lower:
-        return "Quote-based"
-    return "Quote-based"  # default for B2B
-
-
-def process():
-    os.makedirs(OUT_DIR, exist_ok=True)
-    
-    products = []
-    seen_slugs = set()
+    return classify(desc, ["pricing_model"])["pricing_model"]
+
+
+def read_rows(path):
+    """Yield raw CSV rows one at a time."""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from csv.DictReader(f)
+
+
+def is_visible(row):
+    """False for untitled, hidden and content-less rows."""
+    title = (row.get("title") or "").strip()
+    if not title:
+        return False
     
-    with open(RAW_CSV, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            title = (row.get("title") or "").strip()
-            if not title:
-                continue
-            
-            # Skip hidden
-            if row.get("Hide", "").strip().upper() == "TRUE":
-                continue
-            
-            url = (row.get("url") or "").strip()
-            tagline = (row.get("text") or "").strip()
-            description = (row.get("Details") or "").strip()
-            raw_cats = (row.get("Category") or "").strip()
-            
-            # Skip entries with no real content
-            if len(tagline) <= 2 and not description:
-                continue
-            
-            slug = row.get("page", "").strip() or slugify(title)
-            if slug in seen_slugs:
-                continue
-            seen_slugs.add(slug)
-            
-            domain = get_domain(url)
-            logo_url = f"https://logo.clearbit.com/{domain}" if domain else ""
-            
-            # Use existing logo if available
-            existing_logo = (row.get("logoUrl") or "").strip()
-            if existing_logo:
-                logo_url = existing_logo
-            
-            categories = map_categories(raw_cats, row)
-            
-            # Ensure description is SEO-worthy (at least 100 chars)
-            if len(description) < 100 and tagline:
-                description = f"{tagline}. {description}" if description else tagline
-            
-            product = {
-                "title": title,
-                "slug": slug,
-                "url": url,
-                "domain": domain,
-                "tagline": tagline if len(tagline) > 2 else description[:150].rstrip('.') + '.',
-                "description": description,
-                "categories": categories,
-                "property_types": infer_property_types(description),
-                "deployment": infer_deployment(description),
-                "pricing_model": infer_pricing(description),
-                "logo_url": logo_url,
-                "is_free": row.get("isFree", "").strip().upper() == "TRUE",
-                "is_top_rated": row.get("isTopRated", "").strip().upper() == "TRUE",
-                "is_verified": row.get("verified", "").strip().upper() == "TRUE",
-                "seo_headline": (row.get("SEOHeadline") or "").strip(),
-                "seo_description": (row.get("SEODescription") or "").strip(),
-            }
-            products.append(product)
+    # Skip hidden
+    if row.get("Hide", "").strip().upper() == "TRUE":
+        return False
+    
+    tagline = (row.get("text") or "").strip()
+    description = (row.get("Details") or "").strip()
+    
+    # Skip entries with no real content
+    if len(tagline) <= 2 and not description:
+        return False
+    
+    return True
+
+
+def row_slug(row):
+    title = (row.get("title") or "").strip()
+    return row.get("page", "").strip() or slugify(title)
+
+
+def visible_rows(rows):
+    """Drop untitled, hidden and content-less rows."""
+    for row in rows:
+        if is_visible(row):
+            yield row
+
+
+def unique_rows(rows, seen_slugs=None):
+    """Yield (slug, row) pairs, keeping only the first row for each slug."""
+    if seen_slugs is None:
+        seen_slugs = set()
+    for row in rows:
+        slug = row_slug(row)
+        if slug in seen_slugs:
+            continue
+        seen_slugs.add(slug)
+        yield slug, row
+
+
+def build_product(slug, row):
+    """Turn one deduplicated CSV row into a product record."""
+    title = (row.get("title") or "").strip()
+    url = (row.get("url") or "").strip()
+    tagline = (row.get("text") or "").strip()
+    description = (row.get("Details") or "").strip()
+    raw_cats = (row.get("Category") or "").strip()
+    
+    domain = get_domain(url)
+    logo_url = f"https://logo.clearbit.com/{domain}" if domain else ""
+    
+    # Use existing logo if available
+    existing_logo = (row.get("logoUrl") or "").strip()
+    if existing_logo:
+        logo_url = existing_logo
+    
+    categories = map_categories(raw_cats, row)
+    
+    # Ensure description is SEO-worthy (at least 100 chars)
+    if len(description) < 100 and tagline:
+        description = f"{tagline}. {description}" if description else tagline
+    
+    signals = classify(description, PRODUCT_SIGNALS)
+    
+    return {
+        "title": title,
+        "slug": slug,
+        "url": url,
+        "domain": domain,
+        "tagline": tagline if len(tagline) > 2 else description[:150].rstrip('.') + '.',
+        "description": description,
+        "categories": categories,
+        "property_types": signals["property_types"],
+        "deployment": signals["deployment"],
+        "pricing_model": signals["pricing_model"],
+        "logo_url": logo_url,
+        "is_free": row.get("isFree", "").strip().upper() == "TRUE",
+        "is_top_rated": row.get("isTopRated", "").strip().upper() == "TRUE",
+        "is_verified": row.get("verified", "").strip().upper() == "TRUE",
+        "seo_headline": (row.get("SEOHeadline") or "").strip(),
+        "seo_description": (row.get("SEODescription") or "").strip(),
+    }
+
+
+def _build_chunk(pairs):
+    return [build_product(slug, row) for slug, row in pairs]
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parallel_products(pairs, workers, chunk_size):
+    """build_product over (slug, row) pairs in a process pool, in input order.
+    
+    At most two chunks per worker are in flight, so memory stays bounded
+    when the caller is streaming.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in _chunked(pairs, chunk_size):
+            pending.append(pool.submit(_build_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def iter_products(rows, workers=1, chunk_size=CHUNK_SIZE):
+    """Generator pipeline: filter -> dedupe -> categorise/infer.
+    
+    Filtering and slug dedupe always run here, in file order, so first-wins
+    behaviour is the same for any worker count; with workers > 1 only the
+    row transforms are farmed out.
+    """
+    pairs = unique_rows(visible_rows(rows))
+    if workers > 1:
+        yield from _parallel_products(pairs, workers, chunk_size)
+    else:
+        for slug, row in pairs:
+            yield build_product(slug, row)
+
+
+def _json_array_item(obj):
+    """Encode one element exactly as json.dump(list, indent=2) would."""
+    return "  " + json.dumps(obj, indent=2).replace("\n", "\n  ")
+
+
+def open_sitemap(root, gzip=False):
+    """Sitemap writer with the home page already added."""
+    sitemap = SitemapWriter(root, SITE, gzip=gzip)
+    sitemap.add(f"{SITE}/", HOME_PRIORITY)
+    return sitemap
+
+
+def add_product_url(sitemap, slug, lastmod=None):
+    sitemap.add(f"{SITE}/product.html#{quote(slug, safe='')}", PRODUCT_PRIORITY, lastmod)
+
+
+def add_category_urls(sitemap, cat_data):
+    for cs in cat_data.values():
+        sitemap.add(f"{SITE}/category.html#{cs['slug']}", CATEGORY_PRIORITY)
+
+
+def write_robots(root):
+    with open(os.path.join(root, "robots.txt"), 'w') as f:
+        f.write(f"User-agent: *\nAllow: /\nSitemap: {SITE}/sitemap.xml\n")
+
+
+def dedupe_products(products, merge=False):
+    """Near-duplicate stage: report clusters (near_duplicates.py), folding "merge" clusters in when merge is set."""
+    report = near_duplicates.find_near_duplicates(products)
+    near_duplicates.write_report(report)
+    print(near_duplicates.summary(report))
+    if merge:
+        products = near_duplicates.apply_merges(products, report)
+        print(f"Merged {sum(len(c['duplicates']) for c in report['merge'])} near duplicates")
+    return products
+
+
+def process(raw_csv=RAW_CSV, out_dir=OUT_DIR, workers=1, sitemap_gzip=False, profiler=None, dedupe=None):
+    profiler = profiler or NullProfiler()
+    os.makedirs(out_dir, exist_ok=True)
+    
+    rows = read_rows(raw_csv)
+    if profiler.enabled:
+        # Read everything up front so parsing is measured apart from the transforms
+        with profiler.stage("read") as stage:
+            rows = list(rows)
+            stage.rows = len(rows)
+    
+    with profiler.stage("transform") as stage:
+        products = list(iter_products(rows, workers))
+        stage.rows = len(products)
+    
+    if dedupe:
+        with profiler.stage("dedupe", len(products)):
+            products = dedupe_products(products, merge=dedupe == "merge")
     
     # Build categories data
-    cat_data = {}
-    for cat_name, cat_desc in CANONICAL_CATEGORIES.items():
-        cat_slug = slugify(cat_name)
-        cat_products = [p["slug"] for p in products if cat_name in p["categories"]]
-        if cat_products:
-            cat_data[cat_slug] = {
-                "name": cat_name,
-                "slug": cat_slug,
-                "description": cat_desc,
-                "product_count": len(cat_products),
-                "products": cat_products,
-            }
+    with profiler.stage("category index", len(products)):
+        index = CategoryIndex.build(products, CANONICAL_CATEGORIES)
+        cat_data = build_category_data(index.members)
     
     # Write outputs
-    with open(os.path.join(OUT_DIR, "products.json"), 'w') as f:
-        json.dump(products, f, indent=2)
+    with profiler.stage("products.json", len(products)):
+        with open(os.path.join(out_dir, "products.json"), 'w') as f:
+            f.write(json.dumps(products, indent=2))
     
-    with open(os.path.join(OUT_DIR, "categories.json"), 'w') as f:
-        json.dump(cat_data, f, indent=2)
+    with profiler.stage("categories.json", len(cat_data)):
+        with open(os.path.join(out_dir, "categories.json"), 'w') as f:
+            f.write(json.dumps(cat_data, indent=2))
     
     print(f"Processed {len(products)} products into {len(cat_data)} categories")
     
     # Generate sitemap
-    sitemap = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-    base = "https://sichuanlambda.github.io/cre-directory"
-    sitemap += f'  <url><loc>{base}/</loc><priority>1.0</priority></url>\n'
-    for p in products:
-        sitemap += f'  <url><loc>{base}/product.html#{p["slug"]}</loc><priority>0.8</priority></url>\n'
-    for cs in cat_data.values():
-        sitemap += f'  <url><loc>{base}/category.html#{cs["slug"]}</loc><priority>0.9</priority></url>\n'
-    sitemap += '</urlset>'
+    root = os.path.dirname(out_dir)
+    with profiler.stage("sitemap", len(products)):
+        with open_sitemap(root, sitemap_gzip) as sitemap:
+            for p in products:
+                add_product_url(sitemap, p["slug"], p.get("last_updated"))
+            add_category_urls(sitemap, cat_data)
     
-    root = os.path.dirname(OUT_DIR)
-    with open(os.path.join(root, "sitemap.xml"), 'w') as f:
-        f.write(sitemap)
+    with profiler.stage("robots"):
+        write_robots(root)
     
-    with open(os.path.join(root, "robots.txt"), 'w') as f:
-        f.write(f"User-agent: *\nAllow: /\nSitemap: {base}/sitemap.xml\n")
+    print("Generated sitemap.xml and robots.txt")
+
+
+def process_catalog(db_path, out_dir=OUT_DIR, sitemap_gzip=False):
+    """Build from a SQLite catalog (catalog_db.py) instead of the CSV.
+    
+    products.json and categories.json are exported from the catalog, and the
+    sitemap and robots.txt are written from its indexed columns.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    root = os.path.dirname(out_dir)
+    with CatalogDB(db_path) as catalog:
+        catalog.export_json(os.path.join(out_dir, "products.json"), os.path.join(out_dir, "categories.json"))
+        cat_data = catalog.category_data()
+        with open_sitemap(root, sitemap_gzip) as sitemap:
+            for slug, lastmod in catalog.last_updated():
+                add_product_url(sitemap, slug, lastmod)
+            add_category_urls(sitemap, cat_data)
+        count = len(catalog)
+    
+    print(f"Exported {count} products in {len(cat_data)} categories from {db_path}")
+    
+    write_robots(root)
+    
+    print("Generated sitemap.xml and robots.txt")
+
+
+def process_stream(raw_csv=RAW_CSV, out_dir=OUT_DIR, workers=1, sitemap_gzip=False):
+    """Bounded-memory variant of process().
+    
+    Rows flow through the same generator pipeline and each product is
+    written to products.json and sitemap.xml as soon as it is built; only
+    the slug set and per-category slug lists are kept. Output is
+    byte-identical to process().
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    root = os.path.dirname(out_dir)
+    products_path = os.path.join(out_dir, "products.json")
+    
+    index = CategoryIndex(CANONICAL_CATEGORIES)
+    count = 0
+    with open(products_path + ".tmp", 'w') as pf, open_sitemap(root, sitemap_gzip) as sitemap:
+        pf.write("[")
+        for product in iter_products(read_rows(raw_csv), workers):
+            pf.write(",\n" if count else "\n")
+            pf.write(_json_array_item(product))
+            add_product_url(sitemap, product["slug"], product.get("last_updated"))
+            index.add(product["slug"], product["categories"])
+            count += 1
+        pf.write("\n]" if count else "]")
+        
+        cat_data = build_category_data(index.members)
+        add_category_urls(sitemap, cat_data)
+    
+    os.replace(products_path + ".tmp", products_path)
+    with open(os.path.join(out_dir, "categories.json"), 'w') as f:
+        f.write(json.dumps(cat_data, indent=2))
+    
+    print(f"Processed {count} products into {len(cat_data)} categories")
+    
+    write_robots(root)
     
     print("Generated sitemap.xml and robots.txt")
 
 
+def read_records(path):
+    """Yield (raw fields, row dict) pairs, with rows shaped like csv.DictReader's."""
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        fieldnames = next(reader, None) or []
+        n = len(fieldnames)
+        for fields in reader:
+            if not fields:
+                continue
+            row = dict(zip(fieldnames, fields))
+            if len(fields) > n:
+                row[None] = fields[n:]
+            elif len(fields) < n:
+                for key in fieldnames[len(fields):]:
+                    row[key] = None
+            yield fields, row
+
+
+def process_incremental(raw_csv=RAW_CSV, out_dir=OUT_DIR, state_path=None, sitemap_gzip=False, shards=False):
+    """Rebuild outputs, re-running the transforms only for new or changed rows.
+    
+    Rows are keyed by a content hash (see build_state.py). Unchanged rows
+    reuse their cached slug, categories and encoded products.json fragment;
+    rows that disappeared simply drop out. If the CSV, the transform code
+    and the outputs are all unchanged since the last run nothing is parsed
+    or written at all. Output is byte-identical to process(). With shards,
+    the per-product shards, manifest and views are written before the
+    outputs are signed, so they count towards that check too.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    root = os.path.dirname(out_dir)
+    if state_path is None:
+        state_path = os.path.join(root, ".build", "process-state.pickle")
+    products_path = os.path.join(out_dir, "products.json")
+    categories_path = os.path.join(out_dir, "categories.json")
+    sitemap_path = os.path.join(root, "sitemap.xml")
+    robots_path = os.path.join(root, "robots.txt")
+    outputs = [products_path, categories_path, sitemap_path, robots_path]
+    
+    def output_signature():
+        # Sitemap shards and the page views come and go, so they are signed as found
+        extra = sorted(glob.glob(os.path.join(root, "sitemap-*.xml*"))
+                       + glob.glob(os.path.join(out_dir, "views", "*.json"))
+                       + glob.glob(os.path.join(out_dir, "manifest.json")))
+        return build_state.output_signature(outputs + extra)
+    
+    csv_digest = build_state.file_digest(raw_csv)
+    fingerprint = build_state.pipeline_fingerprint()
+    header = build_state.BuildState.load_header(state_path)
+    if (header.get("csv_digest") == csv_digest and header.get("fingerprint") == fingerprint
+            and header.get("site_base") == SITE and header.get("sitemap_gzip") == sitemap_gzip
+            and header.get("outputs") == output_signature()):
+        print("No changes since last build")
+        return
+    
+    state = build_state.BuildState.load(state_path)
+    if state.header.get("fingerprint") != fingerprint:
+        state = build_state.BuildState()  # transform code changed: nothing cached is valid
+    cached = state.rows
+    
+    rows = {}
+    winners = []
+    seen_slugs = set()
+    reused = built = 0
+    for fields, row in read_records(raw_csv):
+        key = build_state.row_hash(fields)
+        entry = rows.get(key) or cached.get(key)
+        if entry is None:
+            entry = [row_slug(row) if is_visible(row) else None, None, None, None]
+        rows[key] = entry
+        
+        slug = entry[0]
+        if slug is None or slug in seen_slugs:
+            continue
+        seen_slugs.add(slug)
+        if entry[2] is None:
+            product = build_product(slug, row)
+            entry[1] = product["categories"]
+            entry[2] = _json_array_item(product)
+            entry[3] = product.get("last_updated")
+            built += 1
+        else:
+            reused += 1
+        winners.append(entry)
+    removed = sum(1 for key in cached if key not in rows)
+    
+    index = CategoryIndex(CANONICAL_CATEGORIES)
+    for slug, categories, _, _ in winners:
+        index.add(slug, categories)
+    cat_data = build_category_data(index.members)
+    
+    with open(products_path + ".tmp", 'w') as f:
+        if winners:
+            f.write("[\n")
+            f.write(winners[0][2])
+            f.writelines(",\n" + entry[2] for entry in winners[1:])
+            f.write("\n]")
+        else:
+            f.write("[]")
+    os.replace(products_path + ".tmp", products_path)
+    
+    with open(categories_path, 'w') as f:
+        f.write(json.dumps(cat_data, indent=2))
+    
+    with open_sitemap(root, sitemap_gzip) as sitemap:
+        for entry in winners:
+            add_product_url(sitemap, entry[0], entry[3])
+        add_category_urls(sitemap, cat_data)
+    
+    write_robots(root)
+    if shards:
+        build_shards_from_files(products_path, categories_path)
+    
+    state.rows = rows
+    state.header = {
+        "csv_digest": csv_digest,
+        "fingerprint": fingerprint,
+        "site_base": SITE,
+        "sitemap_gzip": sitemap_gzip,
+        "outputs": output_signature(),
+    }
+    state.save(state_path)
+    
+    print(f"Processed {len(winners)} products into {len(cat_data)} categories "
+          f"({built} rebuilt, {reused} reused, {removed} stale rows dropped)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--csv", default=RAW_CSV, help="raw CSV export to read")
+    parser.add_argument("--out", default=OUT_DIR, help="data directory to write JSON into")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream rows straight to disk instead of building the catalog in memory")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-run the transforms for rows that changed since the last incremental run")
+    parser.add_argument("--from-db", metavar="DB",
+                        help="export products.json and categories.json from this SQLite catalog "
+                             "(see catalog_db.py) instead of processing the CSV")
+    parser.add_argument("--state", help="state file for --incremental (default: .build/process-state.pickle)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="transform rows in a pool of N processes (output is identical to a serial run)")
+    parser.add_argument("--sitemap-gzip", action="store_true",
+                        help="write sitemap shards as .xml.gz behind a sitemap index")
+    parser.add_argument("--dedupe", choices=("report", "merge"),
+                        help="find near-duplicate products (see near_duplicates.py); report writes "
+                             ".build/near-duplicates.json, merge also folds the sure ones together")
+    parser.add_argument("--shards", action="store_true",
+                        help="also write per-product shards, manifest.json and the page views (see product_shards.py)")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_REPORT, metavar="REPORT",
+                        help="time each stage and record its peak memory; JSON report to REPORT "
+                             "(default: .build/profile.json)")
+    parser.add_argument("--cprofile", metavar="PATH",
+                        help="with --profile, also dump cProfile stats for the whole build to PATH")
+    args = parser.parse_args(argv)
+    
+    if args.from_db and (args.stream or args.incremental or args.dedupe):
+        parser.error("--from-db exports the catalog as it is; it can't be combined with --stream, "
+                     "--incremental or --dedupe")
+    if args.dedupe and (args.stream or args.incremental):
+        parser.error("--dedupe applies to the default in-memory build")
+    
+    profiler = NullProfiler()
+    if args.profile or args.cprofile:
+        if args.stream or args.incremental or args.from_db:
+            parser.error("--profile and --cprofile apply to the default in-memory build")
+        profiler = StageProfiler(args.cprofile)
+        profiler.start()
+    
+    if args.from_db:
+        process_catalog(args.from_db, args.out, args.sitemap_gzip)
+    elif args.incremental:
+        process_incremental(args.csv, args.out, args.state, args.sitemap_gzip, args.shards)
+    elif args.stream:
+        process_stream(args.csv, args.out, args.workers, args.sitemap_gzip)
+    else:
+        process(args.csv, args.out, args.workers, args.sitemap_gzip, profiler, args.dedupe)
+
+    if args.shards and not args.incremental:
+        with profiler.stage("shards"):
+            build_shards_from_files(os.path.join(args.out, "products.json"),
+                                    os.path.join(args.out, "categories.json"))
+    
+    if profiler.enabled:
+        profiler.stop()
+        report_path = args.profile or PROFILE_REPORT
+        profiler.write(report_path, csv=args.csv, workers=args.workers, sitemap_gzip=args.sitemap_gzip)
+        print(profiler.summary())
+        print(f"Profile report written to {report_path}"
+              + (f", cProfile stats to {args.cprofile}" if args.cprofile else ""))
+
+
 if __name__ == "__main__":
-    process()
+    main()
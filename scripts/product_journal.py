@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Append-only update journal for products.json.
+
+enrich_product.update_product() used to parse and rewrite the whole
+catalog for every product it touched. It now appends one line per update
+to data/products.journal.jsonl instead:
+
+    {"index": 30, "slug": "happyco", "set": {"description": "...", "enriched": true,
+     "enrichedAt": "2026-02-17T10:00:00Z"}}
+
+which writes the size of the patch, not the size of the catalog. An entry
+names its product by slug, so it still lands on the right record if
+products are added, removed or reordered before compaction.
+update_product() turns the index it was given into a slug with slug_at(),
+which parses products.json once per process (and again only after the file
+changes), not once per update. Entries with only an index refer to
+products.json as it stood at the last compaction.
+
+Readers that want to see pending updates use load_merged_products(),
+which applies the journal on top of products.json in memory. compact()
+folds the journal into products.json in one ProductStore flush (only the
+patched records are re-serialised), patches categories.json for them and
+empties the journal. Appends and compaction lock the journal file, so an
+update made while compacting is either folded in or kept for next time.
+
+    python scripts/product_journal.py            # show pending updates
+    python scripts/product_journal.py --compact
+"""
+import argparse
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+
+from category_index import sync_categories_file
+from product_store import ProductStore
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+JOURNAL = "products.journal.jsonl"
+
+
+def journal_path(products_path):
+    return os.path.join(os.path.dirname(products_path), JOURNAL)
+
+
+@contextmanager
+def _locked(path, mode):
+    with open(path, mode) as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# {products path: (stat signature, slugs in catalog order)}
+_SLUGS = {}
+
+
+def slug_at(products_path, index):
+    """Slug of the product at index in products_path; IndexError when there is none.
+
+    The slug list is read once per process and again only when the file's
+    size, mtime or inode change, so journaling many updates costs one parse.
+    """
+    st = os.stat(products_path)
+    signature = (st.st_size, st.st_mtime_ns, st.st_ino)
+    cached = _SLUGS.get(products_path)
+    if cached is None or cached[0] != signature:
+        with open(products_path, 'r', encoding='utf-8') as f:
+            cached = _SLUGS[products_path] = (signature, [p.get("slug") for p in json.load(f)])
+    slugs = cached[1]
+    if not 0 <= index < len(slugs):
+        raise IndexError(f"Index {index} out of range. Total products: {len(slugs)}")
+    return slugs[index]
+
+
+def append_patch(path, fields, index=None, slug=None):
+    """Journal an update of fields for the product at index (or with slug)."""
+    if index is None and slug is None:
+        raise ValueError("a journal entry needs an index or a slug")
+    line = json.dumps({"index": index, "slug": slug, "set": fields}, ensure_ascii=False) + "\n"
+    with _locked(path, 'a+b') as f:
+        end = f.seek(0, os.SEEK_END)
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                line = "\n" + line  # close off a line torn by a crash
+        f.write(line.encode("utf-8"))
+
+
+def parse_journal(data):
+    """Entries from journal bytes; torn lines left by a crash mid-append are skipped."""
+    entries = []
+    for line in data.split(b"\n"):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict) and isinstance(entry.get("set"), dict):
+            entries.append(entry)
+    return entries
+
+
+def read_journal(path):
+    try:
+        with open(path, 'rb') as f:
+            return parse_journal(f.read())
+    except FileNotFoundError:
+        return []
+
+
+def resolve(entry, products, by_slug):
+    """Position of the product an entry patches, or None."""
+    slug = entry.get("slug")
+    if slug is not None:
+        return by_slug.get(slug)
+    index = entry.get("index")
+    if index is not None and 0 <= index < len(products):
+        return index
+    return None
+
+
+def apply_journal(products, entries):
+    """Apply entries to products in place; returns (patched positions, skipped entries)."""
+    by_slug = {p.get("slug"): i for i, p in enumerate(products)}
+    patched, skipped = set(), []
+    for entry in entries:
+        i = resolve(entry, products, by_slug)
+        if i is None:
+            skipped.append(entry)
+            continue
+        products[i].update(entry["set"])
+        patched.add(i)
+    return patched, skipped
+
+
+def pending_updates(entries, slug_of):
+    """{slug: fields} with entries applied in order; slug_of(index) names entries that only have an index.
+
+    For readers that don't hold the whole catalog, such as queries against
+    the SQLite catalog (scripts/catalog_db.py).
+    """
+    pending = {}
+    for entry in entries:
+        slug = entry.get("slug")
+        if slug is None and entry.get("index") is not None:
+            slug = slug_of(entry["index"])
+        if slug is not None:
+            pending.setdefault(slug, {}).update(entry["set"])
+    return pending
+
+
+def load_merged_products(products_path=os.path.join(DATA_DIR, "products.json"), path=None):
+    """products.json with any pending journal entries applied."""
+    with open(products_path, 'r', encoding='utf-8') as f:
+        products = json.load(f)
+    apply_journal(products, read_journal(path or journal_path(products_path)))
+    return products
+
+
+def compact(products_path=os.path.join(DATA_DIR, "products.json"), path=None):
+    """Fold the journal into products.json; returns (changed slugs, skipped entries)."""
+    path = path or journal_path(products_path)
+    if not os.path.exists(path):
+        return set(), []
+    with _locked(path, 'r+b') as f:
+        entries = parse_journal(f.read())
+        store = ProductStore(products_path)
+        patched, skipped = apply_journal(store.products, entries)
+        for i in patched:
+            store.mark_dirty(store.products[i]["slug"])
+        changed = store.flush()
+        f.seek(0)
+        f.truncate()
+    categories = os.path.join(os.path.dirname(products_path), "categories.json")
+    if changed and os.path.exists(categories):
+        sync_categories_file(categories, store.products, changed)
+    return changed, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or compact the products.json update journal.")
+    parser.add_argument("--products", default=os.path.join(DATA_DIR, "products.json"))
+    parser.add_argument("--journal", help="journal file (default: next to --products)")
+    parser.add_argument("--compact", action="store_true", help="fold the journal into products.json")
+    args = parser.parse_args()
+    path = args.journal or journal_path(args.products)
+
+    if args.compact:
+        changed, skipped = compact(args.products, path)
+        print(f"Compacted journal into {args.products}: {len(changed)} products updated")
+        for entry in skipped:
+            print(f"  skipped entry for {entry.get('slug') or entry.get('index')}: no such product")
+        return
+
+    entries = read_journal(path)
+    with open(args.products, 'r', encoding='utf-8') as f:
+        products = json.load(f)
+    by_slug = {p.get("slug"): i for i, p in enumerate(products)}
+    print(f"{len(entries)} pending journal entries in {path}")
+    for entry in entries:
+        i = resolve(entry, products, by_slug)
+        name = products[i].get("title") if i is not None else "(no such product)"
+        print(f"  {entry.get('slug') or entry.get('index')}: {name} <- {', '.join(entry['set'])}")
+
+
+if __name__ == "__main__":
+    main()
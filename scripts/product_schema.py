@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""Product record schema, compiled into one generated check function.
+
+Records in data/products.json are written by hand in several places
+(fix_enrichment.py, enrich_all_25_products.py, ProductEnricher), so a
+mistyped field or a stray spelling only showed up once the frontend broke.
+PRODUCT_SCHEMA describes every field the catalog uses: its JSON types,
+whether it is required, and constraints (non-empty, a format such as slug
+or url, a numeric range, the shape of list items and nested objects).
+Objects are closed: a key the schema does not list is reported, and the
+legacy spellings in ALIASES (enrichmentFailed, failure_reason) are
+reported as such, naming the field to use instead.
+
+compile_schema() turns the schema into Python source for a single
+check(record, errors) function and exec()s it once at import, so checking
+a record runs straight-line type tests with no interpretation of the
+schema; paths and messages are only built for fields that fail.
+validate_products() adds the catalog-wide duplicate slug check and
+returns Violations (index, slug, path, message), paths written like
+pricing.plans[2].price.
+
+--incremental keeps .build/validate-state.pickle, which maps a digest of
+each record's JSON text to its slug and the violations it had. Records are
+split out of products.json without being decoded, and only records whose
+text changed since the last incremental run are parsed and checked. The
+state is discarded when this file changes.
+
+    python scripts/product_schema.py [--products data/products.json]
+    python scripts/product_schema.py --incremental
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import re
+import sys
+import time
+from collections import namedtuple
+
+from product_store import parse_catalog, split_catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "data")
+STATE_PATH = os.path.join(ROOT, ".build", "validate-state.pickle")
+
+Violation = namedtuple("Violation", "index slug path message")
+
+# JSON type name -> test on a local `v`. bool is a subclass of int, hence
+# the exact type() checks.
+TYPE_TESTS = {
+    "string": "type({v}) is str",
+    "integer": "type({v}) is int",
+    "number": "type({v}) in (int, float)",
+    "boolean": "type({v}) is bool",
+    "array": "type({v}) is list",
+    "object": "type({v}) is dict",
+    "null": "{v} is None",
+}
+
+FORMATS = {
+    "slug": r"[A-Za-z0-9][A-Za-z0-9._-]*\Z",
+    "url": r"https?://\S+\Z",
+    "date": r"\d{4}-\d{2}-\d{2}\Z",
+    "datetime": r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:\d{2})?\Z",
+}
+
+
+class Field:
+    def __init__(self, *types, required=False, nonempty=False, format=None, minimum=None, maximum=None,
+                 items=None, fields=None):
+        self.types = types
+        self.required = required
+        self.nonempty = nonempty
+        self.format = format
+        self.minimum = minimum
+        self.maximum = maximum
+        self.items = items        # Field for every element of an array
+        self.fields = fields      # {name: Field} for an object
+
+
+STRINGS = Field("array", items=Field("string"))
+
+PRODUCT_SCHEMA = {
+    "title": Field("string", required=True, nonempty=True),
+    "slug": Field("string", required=True, format="slug"),
+    "url": Field("string", required=True, format="url"),
+    "domain": Field("string"),
+    "logo_url": Field("string", required=True),
+    "headline": Field("string"),
+    "tagline": Field("string"),
+    "description": Field("string", required=True),
+    "short_description": Field("string"),
+    "categories": Field("array", required=True, items=Field("string", nonempty=True)),
+    "primary_category": Field("string"),
+    "property_types": STRINGS,
+    "deployment": STRINGS,
+    "pricing_model": Field("string"),
+    "pricing_info": Field("string"),
+    # Older records keep free text where the frontend now expects an object
+    "pricing": Field("object", "string", "null", fields={
+        "model": Field("string"),
+        "starting_price": Field("string", "null"),
+        "billing_options": STRINGS,
+        "free_trial": Field("boolean"),
+        "free_tier": Field("boolean"),
+        "plans": Field("array", items=Field("object", fields={
+            "name": Field("string"),
+            "price": Field("string"),
+            "period": Field("string"),
+            "description": Field("string"),
+            "features": STRINGS,
+            "includes": STRINGS,
+        })),
+    }),
+    "target_audience": Field("object", "string", fields={
+        "roles": STRINGS,
+        "company_sizes": STRINGS,
+        "property_types": STRINGS,
+    }),
+    "features": STRINGS,
+    "feature_groups": Field("array", items=Field("object", fields={
+        "name": Field("string"),
+        "features": Field("array", items=Field("object", fields={
+            "name": Field("string"),
+            "description": Field("string"),
+        })),
+    })),
+    "screenshots": STRINGS,
+    "video_url": Field("string", "null"),
+    "pros": STRINGS,
+    "cons": STRINGS,
+    "integrations": Field("array", items=Field("string", "object", fields={
+        "name": Field("string"),
+        "category": Field("string"),
+    })),
+    "company": Field("object", fields={
+        "name": Field("string"),
+        "founded": Field("integer", "string", "null"),
+        "headquarters": Field("string"),
+        "employees": Field("string"),
+        "funding": Field("string"),
+    }),
+    "rating": Field("number", "null", minimum=0, maximum=5),
+    "review_count": Field("integer", minimum=0),
+    "seo": Field("object", fields={
+        "title": Field("string"),
+        "description": Field("string"),
+        "keywords": STRINGS,
+    }),
+    "seo_headline": Field("string"),
+    "seo_description": Field("string"),
+    "last_updated": Field("string", format="date"),
+    "is_verified": Field("boolean"),
+    "is_featured": Field("boolean"),
+    "is_free": Field("boolean"),
+    "is_top_rated": Field("boolean"),
+    "enriched": Field("boolean"),
+    "enrichedAt": Field("string", format="datetime"),
+    "enrichment_failed": Field("boolean"),
+    "enrichment_reason": Field("string"),
+    # Slugs folded into this record by near_duplicates.py
+    "merged_from": STRINGS,
+}
+
+# Legacy spelling -> the field to use instead
+ALIASES = {
+    "enrichmentFailed": "enrichment_failed",
+    "failure_reason": "enrichment_reason",
+}
+
+
+def _json_type(value):
+    if value is None:
+        return "null"
+    return {str: "string", bool: "boolean", int: "integer", float: "number",
+            list: "array", dict: "object"}.get(type(value), type(value).__name__)
+
+
+def _unknown_keys(obj, known, prefix, errors, aliases):
+    for key in obj:
+        if key in known:
+            continue
+        canonical = aliases.get(key)
+        if canonical is None:
+            errors.append((prefix + key, "unknown field"))
+        elif canonical in obj and obj[canonical] != obj[key]:
+            errors.append((prefix + key, f"legacy spelling of {canonical}, which is also set to a different value"))
+        else:
+            errors.append((prefix + key, f"legacy spelling of {canonical}"))
+
+
+def _path(path):
+    """Source for path, an f-string only when it interpolates list indexes."""
+    return f'f"{path}"' if "{" in path else repr(path)
+
+
+class _Compiler:
+    def __init__(self):
+        self.lines = []
+        self.consts = {}
+        self.names = 0
+
+    def name(self, prefix):
+        self.names += 1
+        return f"{prefix}{self.names}"
+
+    def const(self, prefix, value):
+        name = self.name(prefix)
+        self.consts[name] = value
+        return name
+
+    def emit(self, depth, line):
+        self.lines.append("    " * depth + line)
+
+    def value(self, v, path, field, depth):
+        """Check local v (reachable at path) against field."""
+        types = field.types
+        test = " or ".join(TYPE_TESTS[t].format(v=v) for t in types)
+        constrained = [t for t in types if self._has_constraints(t, field)]
+        if not constrained:
+            self.emit(depth, f"if not ({test}):")
+            self.emit(depth + 1, self.mismatch(v, path, field))
+            return
+        self.emit(depth, f"if {test}:")
+        for t in constrained:
+            if len(types) > 1:
+                self.emit(depth + 1, f"if {TYPE_TESTS[t].format(v=v)}:")
+                self.constraints(v, path, field, t, depth + 2)
+            else:
+                self.constraints(v, path, field, t, depth + 1)
+        self.emit(depth, "else:")
+        self.emit(depth + 1, self.mismatch(v, path, field))
+
+    def mismatch(self, v, path, field):
+        return f'errors.append(({_path(path)}, "expected {" or ".join(field.types)}, got " + _json_type({v})))'
+
+    def is_leaf(self, field):
+        return not any(self._has_constraints(t, field) for t in field.types)
+
+    def _has_constraints(self, t, field):
+        if t == "string":
+            return field.nonempty or field.format
+        if t in ("integer", "number"):
+            return field.minimum is not None or field.maximum is not None
+        if t == "array":
+            return field.nonempty or field.items is not None
+        if t == "object":
+            return field.fields is not None
+        return False
+
+    def constraints(self, v, path, field, t, depth):
+        if t == "string":
+            if field.nonempty:
+                self.emit(depth, f"if not {v}:")
+                self.emit(depth + 1, f'errors.append(({_path(path)}, "empty string"))')
+            if field.format:
+                regex = self.const("_re", re.compile(FORMATS[field.format]).match)
+                self.emit(depth, f"if {v} and {regex}({v}) is None:")
+                self.emit(depth + 1, f'errors.append(({_path(path)}, "not a valid {field.format}: " + repr({v}[:80])))')
+        elif t in ("integer", "number"):
+            if field.minimum is not None:
+                self.emit(depth, f"if {v} < {field.minimum!r}:")
+                self.emit(depth + 1, f'errors.append(({_path(path)}, f"{{{v}}} is below the minimum {field.minimum}"))')
+            if field.maximum is not None:
+                self.emit(depth, f"if {v} > {field.maximum!r}:")
+                self.emit(depth + 1, f'errors.append(({_path(path)}, f"{{{v}}} is above the maximum {field.maximum}"))')
+        elif t == "array":
+            if field.nonempty:
+                self.emit(depth, f"if not {v}:")
+                self.emit(depth + 1, f'errors.append(({_path(path)}, "empty array"))')
+            if field.items is not None:
+                i, item = self.name("i"), self.name("v")
+                self.emit(depth, f"for {i}, {item} in enumerate({v}):")
+                self.value(item, f"{path}[{{{i}}}]", field.items, depth + 1)
+        elif t == "object" and field.fields is not None:
+            self.fields(v, path + ".", field.fields, {}, depth)
+
+    def fields(self, obj, prefix, fields, aliases, depth):
+        known = self.const("_known", frozenset(fields))
+        self.emit(depth, f"if not {known}.issuperset({obj}):")
+        self.emit(depth + 1, f'_unknown_keys({obj}, {known}, {_path(prefix)}, errors, {self.const("_aliases", aliases)})')
+        for key, field in fields.items():
+            v = self.name("v")
+            if self.is_leaf(field) and not field.required:
+                # A missing key reads as None, which only needs telling apart
+                # from an explicit null when null isn't allowed
+                self.emit(depth, f"{v} = {obj}.get({key!r})")
+                test = " or ".join(TYPE_TESTS[t].format(v=v) for t in field.types)
+                if "null" in field.types:
+                    self.emit(depth, f"if not ({test}):")
+                else:
+                    self.emit(depth, f"if not ({test}) and ({v} is not None or {key!r} in {obj}):")
+                self.emit(depth + 1, self.mismatch(v, prefix + key, field))
+                continue
+            self.emit(depth, f"{v} = {obj}.get({key!r}, _MISSING)")
+            if field.required:
+                self.emit(depth, f"if {v} is _MISSING:")
+                self.emit(depth + 1, f'errors.append(({_path(prefix + key)}, "missing required field"))')
+                self.emit(depth, "else:")
+            else:
+                self.emit(depth, f"if {v} is not _MISSING:")
+            self.value(v, prefix + key, field, depth + 1)
+
+
+def compile_schema(schema, aliases=None):
+    """A check(record, errors) function appending (path, message) for every violation."""
+    compiler = _Compiler()
+    compiler.emit(0, "def check(record, errors):")
+    compiler.emit(1, "if type(record) is not dict:")
+    compiler.emit(2, 'errors.append(("", "expected object, got " + _json_type(record)))')
+    compiler.emit(2, "return")
+    compiler.fields("record", "", schema, aliases or {}, 1)
+    source = "\n".join(compiler.lines)
+    namespace = {"_MISSING": object(), "_json_type": _json_type, "_unknown_keys": _unknown_keys, **compiler.consts}
+    exec(compile(source, "<product schema>", "exec"), namespace)
+    check = namespace["check"]
+    check.source = source
+    return check
+
+
+check_product = compile_schema(PRODUCT_SCHEMA, ALIASES)
+
+
+def _record_slug(product):
+    slug = product.get("slug") if type(product) is dict else None
+    return slug if type(slug) is str and slug else None
+
+
+def _violations(index, slug, errors):
+    return [Violation(index, slug or f"#{index}", path, message) for path, message in errors]
+
+
+def _duplicate_slugs(slugs):
+    seen = {}
+    for index, slug in enumerate(slugs):
+        if slug is None:
+            continue
+        first = seen.setdefault(slug, index)
+        if first != index:
+            yield Violation(index, slug, "slug", f"duplicate slug (first used by record #{first})")
+
+
+def validate_products(products):
+    """Every Violation in products, in catalog order (duplicate slugs last)."""
+    violations = []
+    errors = []
+    for index, product in enumerate(products):
+        check_product(product, errors)
+        if errors:
+            violations += _violations(index, _record_slug(product), errors)
+            errors = []
+    violations.extend(_duplicate_slugs(map(_record_slug, products)))
+    return violations
+
+
+def schema_fingerprint():
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_state(path):
+    """{record digest: (slug, ((path, message), ...))} from the last incremental run, if still valid."""
+    try:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return {}
+    if state.get("schema") != schema_fingerprint():
+        return {}  # the schema changed: every record has to be checked again
+    return state["records"]
+
+
+def save_state(path, records):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        pickle.dump({"schema": schema_fingerprint(), "records": records}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def validate_incremental(products_path, state_path=STATE_PATH):
+    """(violations, records checked, records) for products_path, checking only records whose JSON changed.
+
+    Records are split out of the file without decoding them (see
+    split_catalog), so unchanged records are never parsed either.
+    """
+    with open(products_path, 'rb') as f:
+        data = f.read()
+    products = None
+    sources = split_catalog(data)
+    if sources is None:
+        products, sources = parse_catalog(data.decode("utf-8"))
+        sources = [source.encode("utf-8", "surrogatepass") for source in sources]
+    del data
+    previous = load_state(state_path)
+    current = {}
+    violations = []
+    slugs = []
+    checked = 0
+    for index, source in enumerate(sources):
+        key = hashlib.sha256(source).digest()[:16]
+        found = previous.get(key)
+        if found is None:
+            product = json.loads(source) if products is None else products[index]
+            errors = []
+            check_product(product, errors)
+            found = (_record_slug(product), tuple(errors))
+            checked += 1
+        current[key] = found
+        slug, errors = found
+        slugs.append(slug)
+        if errors:
+            violations += _violations(index, slug, errors)
+    violations.extend(_duplicate_slugs(slugs))
+    save_state(state_path, current)
+    return violations, checked, len(sources)
+
+
+def format_violations(violations, limit=None):
+    shown = violations if limit is None else violations[:limit]
+    lines = [f"  {v.slug}: {v.path or '(record)'}: {v.message}" for v in shown]
+    if len(shown) < len(violations):
+        lines.append(f"  ... and {len(violations) - len(shown)} more")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate products.json against the product schema.")
+    parser.add_argument("--products", default=os.path.join(DATA_DIR, "products.json"))
+    parser.add_argument("--incremental", action="store_true",
+                        help="only check records that changed since the last incremental run")
+    parser.add_argument("--state", default=STATE_PATH, help="state file for --incremental")
+    parser.add_argument("--limit", type=int, default=50, help="violations to print (0 for all)")
+    parser.add_argument("--json", action="store_true", help="print violations as JSON lines")
+    parser.add_argument("--show-source", action="store_true", help="print the generated check function")
+    args = parser.parse_args()
+
+    if args.show_source:
+        print(check_product.source)
+        return
+
+    start = time.perf_counter()
+    if args.incremental:
+        violations, checked, total = validate_incremental(args.products, args.state)
+    else:
+        with open(args.products, 'r', encoding='utf-8') as f:
+            products = json.load(f)
+        violations = validate_products(products)
+        checked = total = len(products)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        for v in violations:
+            print(json.dumps(v._asdict(), ensure_ascii=False))
+    elif violations:
+        print(format_violations(violations, args.limit or None))
+    records = len({v.index for v in violations})
+    print(f"{len(violations)} violations in {records} of {total} products "
+          f"({checked} checked, {elapsed:.2f}s)", file=sys.stderr if args.json else sys.stdout)
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Per-product JSON shards and a slim list manifest.
+
+The product page used to download the whole products.json (~1.1 MB) to
+render a single record. This writes, next to products.json:
+
+    data/products/<slug>.json   one full product record per file
+    data/manifest.json          what list views and related-tool cards need
+    data/search-index.json      home page search index (search_index.py)
+    data/views/*.json           column projections for the market map,
+                                category grid and home cards
+                                (view_projections.py)
+
+products.json itself is left alone; the compare page still reads it. The
+manifest is
+
+    {"products": [{"slug", "title", "tagline", "logo_url", "rating",
+                   "categories", "pricing": {model, starting_price,
+                   free_trial, free_tier}}, ...],
+     "categories": {category name: category slug}}
+
+in catalog order, so a product's position in "products" is a stable id
+other generated indexes can refer to. "categories" only lists names that
+have a page in categories.json; the product page uses it to decide which
+category badges become links.
+
+Shard filenames are the slug percent-encoded the way encodeURIComponent
+does it, so "Dealz: Real Estate Estimator" is stored as
+"Dealz%3A%20Real%20Estate%20Estimator.json" (fetched with the slug encoded
+twice). Files are only rewritten when their bytes change and shards of
+products that left the catalog are removed.
+
+    python scripts/product_shards.py [--products data/products.json] [--categories data/categories.json]
+"""
+import argparse
+import json
+import os
+from urllib.parse import quote
+
+from search_index import write_search_index
+from view_projections import write_views
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+SHARD_DIR = "products"
+MANIFEST = "manifest.json"
+
+# Same unreserved set as JavaScript's encodeURIComponent.
+URI_COMPONENT_SAFE = "!~*'()"
+COMPACT = (",", ":")
+
+PRICING_FLAGS = ("model", "starting_price", "free_trial", "free_tier")
+
+
+def shard_filename(slug):
+    return quote(slug, safe=URI_COMPONENT_SAFE) + ".json"
+
+
+def manifest_entry(product):
+    pricing = product.get("pricing")
+    if not isinstance(pricing, dict):
+        pricing = {}  # a few hand-edited records carry a bare pricing string
+    return {
+        "slug": product["slug"],
+        "title": product.get("title") or "",
+        "tagline": product.get("short_description") or product.get("tagline") or product.get("headline") or "",
+        "logo_url": product.get("logo_url") or "",
+        "rating": product.get("rating"),
+        "categories": product.get("categories") or [],
+        "pricing": {key: pricing[key] for key in PRICING_FLAGS if pricing.get(key)},
+    }
+
+
+def build_manifest(products, cat_data=None):
+    return {
+        "products": [manifest_entry(p) for p in products],
+        "categories": {entry["name"]: entry["slug"] for entry in (cat_data or {}).values()},
+    }
+
+
+def _write_if_changed(path, data):
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def write_product_shards(products, data_dir, cat_data=None):
+    """Write shards, the manifest and the views under data_dir; returns (written, removed).
+
+    written counts shard files whose content changed (the manifest is not
+    counted), removed counts stale shards deleted.
+    """
+    shard_dir = os.path.join(data_dir, SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+
+    written = 0
+    wanted = set()
+    for product in products:
+        name = shard_filename(product["slug"])
+        wanted.add(name)
+        data = json.dumps(product, separators=COMPACT).encode("utf-8")
+        written += _write_if_changed(os.path.join(shard_dir, name), data)
+
+    removed = 0
+    for name in os.listdir(shard_dir):
+        if name.endswith(".json") and name not in wanted:
+            os.remove(os.path.join(shard_dir, name))
+            removed += 1
+
+    manifest = build_manifest(products, cat_data)
+    _write_if_changed(os.path.join(data_dir, MANIFEST), json.dumps(manifest, separators=COMPACT).encode("utf-8"))
+    # The search index and the views are keyed to manifest positions, so they are rebuilt with it.
+    write_search_index(products, data_dir)
+    write_views(products, data_dir, cat_data)
+    return written, removed
+
+
+def build_shards_from_files(products_path, categories_path=None):
+    with open(products_path, 'r') as f:
+        products = json.load(f)
+    cat_data = None
+    if categories_path and os.path.exists(categories_path):
+        with open(categories_path, 'r') as f:
+            cat_data = json.load(f)
+    written, removed = write_product_shards(products, os.path.dirname(products_path), cat_data)
+    return len(products), written, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write per-product JSON shards and the list manifest.")
+    parser.add_argument("--products", default=os.path.join(DATA_DIR, "products.json"))
+    parser.add_argument("--categories", default=os.path.join(DATA_DIR, "categories.json"))
+    args = parser.parse_args()
+
+    total, written, removed = build_shards_from_files(args.products, args.categories)
+    print(f"Sharded {total} products ({written} shards written, {removed} removed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Shared load / lookup / save for data/products.json.
+
+Every enrichment script used to load the catalog, scan it for the records
+it wanted and json.dump() the whole list back. ProductStore keeps slug and
+title indexes for O(1) lookup and remembers which records were changed.
+
+flush() takes an exclusive lock on products.json.lock, re-reads the file if
+another script replaced it since we loaded it, applies only our changed,
+added or removed records on top of that copy (by slug), and swaps the
+result in with a temp file + rename. Records we didn't touch are copied as
+their original JSON text; only dirty records are serialised again. Output
+keeps the json.dump(products, indent=2) layout the repo uses.
+
+    store = ProductStore("data/products.json")
+    store.update("yardi", {"rating": 4.2})
+    changed = store.flush()
+    sync_categories_file("data/categories.json", store.products, changed)
+
+Code that mutates a record returned by get() in place must call
+mark_dirty(slug) so the change is flushed.
+"""
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+PRODUCTS_PATH = os.path.join(DATA_DIR, "products.json")
+
+_DECODER = json.JSONDecoder()
+_WS = " \t\r\n"
+
+
+def encode_record(product):
+    """One element exactly as json.dump(list, indent=2, ensure_ascii=False) would write it."""
+    return json.dumps(product, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+
+
+def parse_catalog(text):
+    """Decode a JSON array, returning (records, source text of each record)."""
+    pos = len(text) - len(text.lstrip(_WS))
+    if text[pos:pos + 1] != "[":
+        raise ValueError("products file is not a JSON array")
+    records, sources = [], []
+    pos += 1
+    while True:
+        while pos < len(text) and text[pos] in _WS:
+            pos += 1
+        if text[pos:pos + 1] == "]":
+            return records, sources
+        if records:
+            if text[pos] != ",":
+                raise ValueError(f"expected ',' at offset {pos}")
+            pos += 1
+            while text[pos] in _WS:
+                pos += 1
+        record, end = _DECODER.raw_decode(text, pos)
+        records.append(record)
+        sources.append(text[pos:end])
+        pos = end
+
+
+def split_catalog(data):
+    """Source bytes of each record in a products file's bytes, without decoding any, or None.
+
+    Only for files in the json.dump(list, indent=2) layout this module
+    writes, where every record after the first starts on a "\n  }," line
+    (nested values are indented further and strings cannot hold raw
+    newlines). Other layouts return None; use parse_catalog() for those.
+    Works on bytes because splitting a large non-ASCII str is many times
+    slower.
+    """
+    body = data.strip(b" \t\r\n")
+    if body == b"[]":
+        return []
+    if not (body.startswith(b"[\n  {\n    ") and body.endswith(b"\n  }\n]")):
+        return None
+    parts = body[4:-2].split(b"\n  },\n  ")
+    return [part + b"\n  }" for part in parts[:-1]] + parts[-1:]
+
+
+def _signature(st):
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def _stat(path):
+    try:
+        return _signature(os.stat(path))
+    except FileNotFoundError:
+        return None
+
+
+class ProductStore:
+    def __init__(self, path=PRODUCTS_PATH):
+        self.path = path
+        self._load()
+        self.dirty = set()
+        self.removed = set()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self._signature = _signature(os.fstat(f.fileno()))
+            text = f.read()
+        self.products, self._sources = parse_catalog(text)
+        self._reindex()
+
+    def _reindex(self):
+        self._by_slug = {}
+        self._by_title = {}
+        for i, product in enumerate(self.products):
+            self._by_slug[product.get("slug")] = i
+            self._by_title[product.get("title")] = i
+
+    def __len__(self):
+        return len(self.products)
+
+    def __iter__(self):
+        return iter(self.products)
+
+    def __contains__(self, slug):
+        return slug in self._by_slug
+
+    def get(self, slug):
+        i = self._by_slug.get(slug)
+        return None if i is None else self.products[i]
+
+    def find_by_title(self, title):
+        i = self._by_title.get(title)
+        return None if i is None else self.products[i]
+
+    def position(self, slug):
+        return self._by_slug.get(slug)
+
+    def mark_dirty(self, slug):
+        if slug not in self._by_slug:
+            raise KeyError(slug)
+        self.dirty.add(slug)
+        self._sources[self._by_slug[slug]] = None
+
+    def update(self, slug, fields):
+        """Merge fields into the product with this slug and return it."""
+        i = self._by_slug[slug]
+        product = self.products[i]
+        old_title = product.get("title")
+        product.update(fields)
+        if product.get("slug") != slug:
+            raise ValueError(f"update() can't change a slug ({slug!r} -> {product.get('slug')!r})")
+        if product.get("title") != old_title:
+            if self._by_title.get(old_title) == i:
+                del self._by_title[old_title]
+            self._by_title[product.get("title")] = i
+        self.mark_dirty(slug)
+        return product
+
+    def add(self, product):
+        """Append a new product, or replace the existing one with the same slug."""
+        slug = product["slug"]
+        i = self._by_slug.get(slug)
+        if i is None:
+            i = len(self.products)
+            self.products.append(product)
+            self._sources.append(None)
+            self._by_slug[slug] = i
+        else:
+            self.products[i] = product
+        self._by_title[product.get("title")] = i
+        self.removed.discard(slug)
+        self.mark_dirty(slug)
+        return product
+
+    def remove(self, slug):
+        i = self._by_slug[slug]
+        del self.products[i]
+        del self._sources[i]
+        self._reindex()
+        self.dirty.discard(slug)
+        self.removed.add(slug)
+
+    @contextmanager
+    def _locked(self):
+        with open(self.path + ".lock", 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def flush(self):
+        """Write pending changes; returns the slugs that were written or removed."""
+        changed = self.dirty | self.removed
+        if not changed:
+            return set()
+        with self._locked():
+            if _stat(self.path) != self._signature:
+                self._rebase()
+            sources = self._sources
+            for i, product in enumerate(self.products):
+                if sources[i] is None:
+                    sources[i] = encode_record(product)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write("[\n  " + ",\n  ".join(sources) + "\n]" if sources else "[]")
+            os.replace(tmp, self.path)
+            self._signature = _stat(self.path)
+        self.dirty.clear()
+        self.removed.clear()
+        return changed
+
+    def _rebase(self):
+        """Re-apply our pending changes on top of the current file."""
+        ours = {slug: self.products[self._by_slug[slug]] for slug in self.dirty}
+        self._load()
+        for slug in self.removed:
+            if slug in self._by_slug:
+                i = self._by_slug[slug]
+                del self.products[i]
+                del self._sources[i]
+                self._reindex()
+        for slug, product in ours.items():
+            i = self._by_slug.get(slug)
+            if i is None:
+                self.products.append(product)
+                self._sources.append(None)
+            else:
+                self.products[i] = product
+                self._sources[i] = None
+        self._reindex()
@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""Pre-render products/<slug>.html for every product in products.json.
+
+Pages follow the hand-written products/yardi.html: SEO/Open Graph/Twitter
+meta, SoftwareApplication and BreadcrumbList JSON-LD, hero, overview,
+features, pros & cons, integrations and a pricing/company/deployment/
+category sidebar, all baked into the HTML so crawlers don't have to run
+product.html's client-side rendering.
+
+The page skeleton lives in scripts/templates/product-page.html and is
+compiled once per process into literal/placeholder segments; repeated
+fragments are plain f-strings. Rendering runs in a process pool.
+
+Only pages whose record changed, or whose file is missing, are rendered
+again; a change to the template, this module or the category links
+re-renders everything. Per-page record digests are kept in
+.build/product-pages.json. Pages without the generator meta tag (such as
+the curated yardi.html) are never overwritten, and generated pages of
+products that left the catalog are deleted.
+
+    python scripts/render_product_pages.py [--workers N] [--force]
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from urllib.parse import quote
+
+from product_shards import URI_COMPONENT_SAFE
+from sitemap_writer import SITE
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(SCRIPTS_DIR)
+DATA_DIR = os.path.join(ROOT, "data")
+PAGES_DIR = os.path.join(ROOT, "products")
+GUIDES_DIR = os.path.join(ROOT, "guides")
+TEMPLATE_PATH = os.path.join(SCRIPTS_DIR, "templates", "product-page.html")
+STATE_PATH = os.path.join(ROOT, ".build", "product-pages.json")
+
+GENERATOR = "cre-directory render_product_pages"
+CHUNK_SIZE = 500
+
+# Same palette and hash as getColor() in js/app.js, for the logo fallback.
+COLORS = ['#4361ee', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c', '#e67e22', '#3498db', '#e91e63', '#00bcd4']
+DEPLOYMENT_ICONS = {"Cloud": "☁️", "On-Premise": "🖥️", "Mobile": "📱"}
+PRICE_RE = re.compile(r"\$\s*([0-9][0-9,]*(?:\.[0-9]+)?)")
+PLACEHOLDER_RE = re.compile(r"\{\{ (\w+) \}\}")
+
+
+class Template:
+    """A template split once into literal text and {{ name }} slots."""
+
+    def __init__(self, text):
+        parts = PLACEHOLDER_RE.split(text)
+        self.literals = parts[0::2]
+        self.names = parts[1::2]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read())
+
+    def render(self, values):
+        out = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            out.append(values[name])
+            out.append(literal)
+        return "".join(out)
+
+
+def page_filename(slug):
+    return quote(slug, safe=URI_COMPONENT_SAFE) + ".html"
+
+
+def page_url(slug):
+    return f"{SITE}/products/{quote(page_filename(slug))}"
+
+
+def category_links(cat_data, guides_dir=GUIDES_DIR):
+    """Category name -> page href relative to products/ (guide first, then category page)."""
+    links = {}
+    for entry in (cat_data or {}).values():
+        slug = entry["slug"]
+        if os.path.exists(os.path.join(guides_dir, slug + ".html")):
+            links[entry["name"]] = f"../guides/{slug}.html"
+        else:
+            links[entry["name"]] = f"../category.html#{slug}"
+    return links
+
+
+def _int32(n):
+    n &= 0xFFFFFFFF
+    return n - (1 << 32) if n >= 1 << 31 else n
+
+
+def logo_color(title):
+    h = 0
+    units = (title or "").encode("utf-16-le")
+    for i in range(0, len(units), 2):
+        h = int.from_bytes(units[i:i + 2], "little") + (_int32(_int32(h) << 5) - h)
+    return COLORS[abs(h) % len(COLORS)]
+
+
+def _e(value):
+    return html.escape(str(value), quote=True)
+
+
+def _json_ld(data):
+    text = json.dumps(data, indent=2, ensure_ascii=False).replace("</", "<\\/")
+    return "  " + text.replace("\n", "\n  ")
+
+
+def _first_sentence(text):
+    end = text.find(". ")
+    return text if end < 0 else text[:end + 1]
+
+
+def _stars(rating):
+    full = min(5, int(rating + 0.5))
+    return "★" * full + "☆" * (5 - full)
+
+
+def _month(date):
+    try:
+        return datetime.strptime(date, "%Y-%m-%d").strftime("%b %Y")
+    except (TypeError, ValueError):
+        return date
+
+
+def _low_price(pricing):
+    prices = [pricing.get("starting_price") or ""] + [plan.get("price") or "" for plan in pricing.get("plans") or []]
+    found = [float(m.replace(",", "")) for text in prices for m in PRICE_RE.findall(str(text))]
+    if not found:
+        return None
+    low = min(found)
+    return str(int(low)) if low == int(low) else str(low)
+
+
+def _feature_groups(product):
+    groups = [g for g in product.get("feature_groups") or [] if g.get("features")]
+    if groups:
+        return [(g.get("name") or "Features", [(f.get("name") or "", f.get("description") or "") for f in g["features"]])
+                for g in groups]
+    flat = []
+    for feature in product.get("features") or []:
+        if isinstance(feature, str):
+            name, _, desc = feature.partition(" - ")
+            flat.append((name, desc))
+    return [("Key Features", flat)] if flat else []
+
+
+def _main_sections(product):
+    sections = []
+    paragraphs = [p.strip() for p in (product.get("description") or product.get("headline") or "").split("\n\n")]
+    body = "\n".join(f"            <p>{_e(p)}</p>" for p in paragraphs if p)
+    sections.append(f"""
+          <!-- Overview -->
+          <div class="section-card">
+            <h2>Overview</h2>
+{body}
+          </div>
+""")
+
+    groups = _feature_groups(product)
+    if groups:
+        blocks = []
+        for group_name, features in groups:
+            items = "".join(f'                <li><span class="feature-name">{_e(f)}</span>'
+                            f'<span class="feature-desc">{_e(d)}</span></li>\n' for f, d in features)
+            blocks.append(f"""
+            <div class="feature-group">
+              <div class="feature-group-name">{_e(group_name)}</div>
+              <ul class="feature-list">
+{items}              </ul>
+            </div>
+""")
+        sections.append(f"""
+          <!-- Features -->
+          <div class="section-card">
+            <h2>Features</h2>
+{"".join(blocks)}          </div>
+""")
+
+    pros, cons = product.get("pros") or [], product.get("cons") or []
+    if pros or cons:
+        pro_items = "".join(f"                  <li>{_e(p)}</li>\n" for p in pros)
+        con_items = "".join(f"                  <li>{_e(c)}</li>\n" for c in cons)
+        sections.append(f"""
+          <!-- Pros & Cons -->
+          <div class="section-card">
+            <h2>Pros &amp; Cons</h2>
+            <div class="pros-cons">
+              <div>
+                <div class="pros-header">✓ Strengths</div>
+                <ul class="pros-list">
+{pro_items}                </ul>
+              </div>
+              <div>
+                <div class="cons-header">✗ Weaknesses</div>
+                <ul class="cons-list">
+{con_items}                </ul>
+              </div>
+            </div>
+          </div>
+""")
+
+    integrations = product.get("integrations") or []
+    if integrations:
+        items = []
+        for integration in integrations:
+            if isinstance(integration, dict):
+                label, cat = integration.get("name") or "", integration.get("category") or ""
+            else:
+                label, cat = integration, ""
+            cat_html = f'<div class="integration-cat">{_e(cat)}</div>' if cat else ""
+            items.append(f'              <div class="integration-item"><div class="integration-name">{_e(label)}</div>{cat_html}</div>\n')
+        sections.append(f"""
+          <!-- Integrations -->
+          <div class="section-card">
+            <h2>Integrations</h2>
+            <div class="integration-grid">
+{"".join(items)}            </div>
+          </div>
+""")
+    return "".join(sections)
+
+
+def _sidebar(product, pricing, company, links):
+    cards = []
+    plans = pricing.get("plans") or []
+    if plans:
+        blocks = "".join(f"""            <div class="pricing-plan">
+              <div class="plan-name">{_e(plan.get("name") or "")}</div>
+              <div class="plan-price">{_e(plan.get("price") or "Contact")}</div>
+{f'              <div class="plan-desc">{_e(plan["description"])}</div>{chr(10)}' if plan.get("description") else ""}            </div>
+""" for plan in plans)
+    else:
+        extras = [label for key, label in (("free_trial", "Free trial available"), ("free_tier", "Free tier available"))
+                  if pricing.get(key)]
+        desc = f'              <div class="plan-desc">{_e(" · ".join(extras))}</div>\n' if extras else ""
+        blocks = f"""            <div class="pricing-plan">
+              <div class="plan-name">{_e(pricing.get("model") or "Pricing")}</div>
+              <div class="plan-price">{_e(pricing.get("starting_price") or "Contact for pricing")}</div>
+{desc}            </div>
+"""
+    cards.append(f"""
+          <!-- Pricing -->
+          <div class="sidebar-card">
+            <h3>Pricing</h3>
+{blocks}          </div>
+""")
+
+    rows = [(label, company.get(key)) for label, key in
+            (("Founded", "founded"), ("HQ", "headquarters"), ("Employees", "employees"), ("Funding", "funding"))]
+    rows.append(("Last Updated", _month(product.get("last_updated"))))
+    info = "".join(f'            <div class="info-row"><span class="info-label">{label}</span>'
+                   f'<span class="info-value">{_e(value)}</span></div>\n' for label, value in rows if value)
+    if info:
+        cards.append(f"""
+          <!-- Company Info -->
+          <div class="sidebar-card">
+            <h3>Company Info</h3>
+{info}          </div>
+""")
+
+    deployment = product.get("deployment") or []
+    if deployment:
+        badges = "".join(f'              <span class="deploy-badge">'
+                         f'{DEPLOYMENT_ICONS[d] + " " if d in DEPLOYMENT_ICONS else ""}{_e(d)}</span>\n' for d in deployment)
+        cards.append(f"""
+          <!-- Deployment -->
+          <div class="sidebar-card">
+            <h3>Deployment</h3>
+            <div class="deploy-badges">
+{badges}            </div>
+          </div>
+""")
+
+    categories = product.get("categories") or []
+    if categories:
+        tags = "".join(f'              <a href="{_e(links[c])}" class="category-tag">{_e(c)}</a>\n' if c in links
+                       else f'              <a class="category-tag">{_e(c)}</a>\n' for c in categories)
+        cards.append(f"""
+          <!-- Categories -->
+          <div class="sidebar-card">
+            <h3>Categories</h3>
+            <div class="category-tags">
+{tags}            </div>
+          </div>
+""")
+    return "".join(cards)
+
+
+def render_page(product, template, links):
+    name = product.get("title") or product["slug"]
+    pricing = product.get("pricing") if isinstance(product.get("pricing"), dict) else {}
+    if isinstance(product.get("pricing"), str):
+        pricing = {"starting_price": product["pricing"]}
+    company = product.get("company") if isinstance(product.get("company"), dict) else {}
+    seo = product.get("seo") if isinstance(product.get("seo"), dict) else {}
+    url = product.get("url") or ""
+    canonical = page_url(product["slug"])
+    rating = product.get("rating")
+
+    title = seo.get("title") or f"{name} Review 2026: Pricing, Features & Alternatives | CRE Software"
+    description = seo.get("description") or product.get("short_description") or product.get("headline") or ""
+    social_title = title.rsplit(" | ", 1)[0]
+
+    primary = (product.get("categories") or [None])[0]
+    if primary and primary in links:
+        breadcrumb_category = f'      <a href="{_e(links[primary])}">{_e(primary)}</a>\n      <span>›</span>\n'
+    elif primary:
+        breadcrumb_category = f"      {_e(primary)}\n      <span>›</span>\n"
+    else:
+        breadcrumb_category = ""
+
+    letter = (name[:1] or "?").upper()
+    if not letter.isalnum():
+        letter = "?"
+    fallback = (f"<div style=&quot;background:{logo_color(name)};color:white;width:56px;height:56px;border-radius:12px;"
+                f"display:flex;align-items:center;justify-content:center;font-size:28px;font-weight:800&quot;>{letter}</div>")
+    logo = (f'<img src="{_e(product.get("logo_url") or "")}" alt="{_e(name)} logo" '
+            f"onerror=\"this.style.display='none';this.parentElement.innerHTML='{fallback}'\">")
+
+    meta = []
+    if rating:
+        count = f'\n            <span class="rating-count">({_e(product["review_count"])} reviews)</span>' \
+            if product.get("review_count") else ""
+        meta.append(f"""          <div class="rating-display">
+            <span class="rating-score">{_e(rating)}</span>
+            <span class="rating-stars">{_stars(rating)}</span>{count}
+          </div>
+""")
+    for icon, value in (("📍", company.get("headquarters")),
+                        ("🏢", f"{company['employees']} employees" if company.get("employees") else None),
+                        ("📅", f"Founded {company['founded']}" if company.get("founded") else None)):
+        if value:
+            meta.append(f'          <div class="product-meta-item">{icon} {_e(value)}</div>\n')
+
+    software_ld = {
+        "@context": "https://schema.org",
+        "@type": "SoftwareApplication",
+        "name": name,
+        "applicationCategory": "BusinessApplication",
+        "operatingSystem": ", ".join(product.get("deployment") or []) or "Web Browser",
+        "url": url,
+        "description": product.get("short_description") or product.get("headline") or description,
+    }
+    low_price = _low_price(pricing)
+    if low_price is not None:
+        software_ld["offers"] = {"@type": "AggregateOffer", "lowPrice": low_price, "priceCurrency": "USD",
+                                 "offerCount": str(len(pricing.get("plans") or []) or 1)}
+    if rating:
+        software_ld["aggregateRating"] = {"@type": "AggregateRating", "ratingValue": str(rating),
+                                          "reviewCount": str(product.get("review_count") or 1), "bestRating": "5"}
+    software_ld["publisher"] = {"@type": "Organization", "name": "CRE Software Directory", "url": SITE}
+
+    crumbs = [{"@type": "ListItem", "position": 1, "name": "Home", "item": SITE + "/"}]
+    if primary:
+        crumb = {"@type": "ListItem", "position": 2, "name": primary}
+        if primary in links:
+            crumb["item"] = SITE + "/" + links[primary][len("../"):]
+        crumbs.append(crumb)
+    crumbs.append({"@type": "ListItem", "position": len(crumbs) + 1, "name": name})
+
+    return template.render({
+        "generator": GENERATOR,
+        "title": _e(title),
+        "description": _e(description),
+        "keywords": f'  <meta name="keywords" content="{_e(", ".join(seo["keywords"]))}">\n' if seo.get("keywords") else "",
+        "canonical": _e(canonical),
+        "social_title": _e(social_title),
+        "social_description": _e(_first_sentence(description)),
+        "og_image": f'  <meta property="og:image" content="{_e(product["logo_url"])}">\n' if product.get("logo_url") else "",
+        "software_ld": _json_ld(software_ld),
+        "breadcrumb_ld": _json_ld({"@context": "https://schema.org", "@type": "BreadcrumbList", "itemListElement": crumbs}),
+        "breadcrumb_category": breadcrumb_category,
+        "name": _e(name),
+        "logo": logo,
+        "tagline": _e(product.get("short_description") or product.get("headline") or ""),
+        "meta": "".join(meta),
+        "url": _e(url),
+        "main": _main_sections(product),
+        "sidebar": _sidebar(product, pricing, company, links),
+    })
+
+
+# Per-process render context, set by _init_worker (or directly for serial runs).
+_CONTEXT = {}
+
+
+def _init_worker(template_text, links, out_dir):
+    _CONTEXT.update(template=Template(template_text), links=links, out_dir=out_dir)
+
+
+def _render_chunk(chunk):
+    template, links, out_dir = _CONTEXT["template"], _CONTEXT["links"], _CONTEXT["out_dir"]
+    for filename, product in chunk:
+        with open(os.path.join(out_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(render_page(product, template, links))
+    return len(chunk)
+
+
+def record_digest(product):
+    return hashlib.blake2b(json.dumps(product, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def render_fingerprint(template_text, links):
+    h = hashlib.sha256(template_text.encode("utf-8"))
+    with open(os.path.abspath(__file__), 'rb') as f:
+        h.update(f.read())
+    h.update(json.dumps(sorted(links.items())).encode("utf-8"))
+    return h.hexdigest()
+
+
+def is_generated(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return GENERATOR in f.read(1024)
+
+
+def _load_state(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def render_pages(products, cat_data, out_dir=PAGES_DIR, state_path=STATE_PATH, workers=None, force=False):
+    """Render changed pages; returns counts of rendered/unchanged/curated/removed pages."""
+    with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+        template_text = f.read()
+    links = category_links(cat_data)
+    fingerprint = render_fingerprint(template_text, links)
+
+    state = _load_state(state_path)
+    known = state.get("pages", {}) if state.get("fingerprint") == fingerprint and not force else {}
+    previous = state.get("pages", {})
+    os.makedirs(out_dir, exist_ok=True)
+
+    pages, todo = {}, []
+    counts = {"rendered": 0, "unchanged": 0, "curated": 0, "removed": 0}
+    for product in products:
+        filename = page_filename(product["slug"])
+        path = os.path.join(out_dir, filename)
+        digest = record_digest(product)
+        exists = os.path.exists(path)
+        if exists and filename not in previous and not is_generated(path):
+            counts["curated"] += 1
+            continue
+        pages[filename] = digest
+        if exists and known.get(filename) == digest:
+            counts["unchanged"] += 1
+        else:
+            todo.append((filename, product))
+
+    for filename in previous:
+        path = os.path.join(out_dir, filename)
+        if filename not in pages and os.path.exists(path) and is_generated(path):
+            os.remove(path)
+            counts["removed"] += 1
+
+    chunks = [todo[i:i + CHUNK_SIZE] for i in range(0, len(todo), CHUNK_SIZE)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        _init_worker(template_text, links, out_dir)
+        counts["rendered"] = sum(map(_render_chunk, chunks))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(template_text, links, out_dir)) as pool:
+            counts["rendered"] = sum(pool.map(_render_chunk, chunks))
+
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    tmp = state_path + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump({"fingerprint": fingerprint, "pages": pages}, f)
+    os.replace(tmp, state_path)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render products/<slug>.html pages from products.json.")
+    parser.add_argument("--products", default=os.path.join(DATA_DIR, "products.json"))
+    parser.add_argument("--categories", default=os.path.join(DATA_DIR, "categories.json"))
+    parser.add_argument("--out", default=PAGES_DIR)
+    parser.add_argument("--state", default=STATE_PATH)
+    parser.add_argument("--workers", type=int, help="render processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="re-render every page")
+    args = parser.parse_args()
+
+    with open(args.products, 'r') as f:
+        products = json.load(f)
+    with open(args.categories, 'r') as f:
+        cat_data = json.load(f)
+    counts = render_pages(products, cat_data, args.out, args.state, args.workers, args.force)
+    print(f"Rendered {counts['rendered']} pages ({counts['unchanged']} unchanged, "
+          f"{counts['curated']} hand-written kept, {counts['removed']} removed)")
+
+
+if __name__ == "__main__":
+    main()
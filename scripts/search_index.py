@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Prebuilt inverted index for the home page search.
+
+runHomeSearch used to lowercase and concatenate every product's text on
+each keystroke and substring-scan all of it. This builds the index once,
+next to the manifest, as data/search-index.json:
+
+    {"version": 1,
+     "fields": ["title", "categories", "tagline", "features", "description"],
+     "weights": [8, 4, 3, 2, 1],
+     "count": <products in the manifest>,
+     "terms": [sorted tokens],
+     "postings": [[id, fieldmask, id, fieldmask, ...] per term],
+     "completions": {prefix: [term numbers, most common first]}}
+
+Ids are positions in manifest.json's "products" list (catalog order).
+fieldmask bit i is set when the token occurs in fields[i]. Tokens are runs
+of [a-z0-9] at least two characters long. Feature descriptions are indexed
+under "features" along with feature names so results keep matching what
+the old scan matched.
+
+A query matches a product when every query token is a prefix of one of the
+product's tokens. A product scores the sum, over query tokens, of the best
+field weight sum among the tokens it matched, doubled for a whole-token
+match; ties keep catalog order. Prefix lookups binary-search "terms";
+"completions" holds the top terms for every 1-3 character prefix for
+autocomplete.
+
+    python scripts/search_index.py [--products data/products.json]
+    python scripts/search_index.py --query "lease admin"
+"""
+import argparse
+import bisect
+import json
+import os
+import re
+import time
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+INDEX_FILE = "search-index.json"
+INDEX_VERSION = 1
+
+FIELDS = ("title", "categories", "tagline", "features", "description")
+WEIGHTS = (8, 4, 3, 2, 1)
+COMPLETION_PREFIX_LEN = 3
+COMPLETIONS_PER_PREFIX = 8
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def product_fields(product):
+    """Text of each indexed field, in FIELDS order."""
+    features = []
+    for group in product.get("feature_groups") or []:
+        for feature in group.get("features") or []:
+            features.append(feature.get("name") or "")
+            features.append(feature.get("description") or "")
+    return (
+        product.get("title") or "",
+        " ".join(product.get("categories") or []),
+        product.get("short_description") or product.get("tagline") or "",
+        " ".join(features),
+        product.get("description") or "",
+    )
+
+
+def build_index(products):
+    postings = {}
+    for doc_id, product in enumerate(products):
+        masks = {}
+        for bit, text in enumerate(product_fields(product)):
+            for token in tokenize(text):
+                if len(token) > 1:
+                    masks[token] = masks.get(token, 0) | (1 << bit)
+        for token, mask in masks.items():
+            postings.setdefault(token, []).extend((doc_id, mask))
+
+    terms = sorted(postings)
+    by_prefix = {}
+    for n, term in enumerate(terms):
+        for size in range(1, min(len(term), COMPLETION_PREFIX_LEN) + 1):
+            by_prefix.setdefault(term[:size], []).append(n)
+    completions = {
+        prefix: sorted(numbers, key=lambda n: -len(postings[terms[n]]))[:COMPLETIONS_PER_PREFIX]
+        for prefix, numbers in by_prefix.items()
+    }
+
+    return {
+        "version": INDEX_VERSION,
+        "fields": list(FIELDS),
+        "weights": list(WEIGHTS),
+        "count": len(products),
+        "terms": terms,
+        "postings": [postings[term] for term in terms],
+        "completions": completions,
+    }
+
+
+def write_search_index(products, data_dir):
+    path = os.path.join(data_dir, INDEX_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        f.write(json.dumps(build_index(products), separators=(",", ":")))
+    os.replace(tmp, path)
+    return path
+
+
+def load_index(path=os.path.join(DATA_DIR, INDEX_FILE)):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _mask_weights(index):
+    weights = index["weights"]
+    return [sum(w for bit, w in enumerate(weights) if mask >> bit & 1) for mask in range(1 << len(weights))]
+
+
+def term_range(index, prefix):
+    """[lo, hi) of the terms starting with prefix."""
+    terms = index["terms"]
+    lo = bisect.bisect_left(terms, prefix)
+    hi = bisect.bisect_left(terms, prefix + "\uffff", lo)
+    return lo, hi
+
+
+def search(index, query, limit=None):
+    """Ranked [(id, score), ...] for query; every token must match."""
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    mask_weight = _mask_weights(index)
+    terms, postings = index["terms"], index["postings"]
+
+    scores = None
+    for token in dict.fromkeys(tokens):
+        best = {}
+        lo, hi = term_range(index, token)
+        for n in range(lo, hi):
+            boost = 2 if terms[n] == token else 1
+            posting = postings[n]
+            for i in range(0, len(posting), 2):
+                doc_id, score = posting[i], mask_weight[posting[i + 1]] * boost
+                if score > best.get(doc_id, 0):
+                    best[doc_id] = score
+        if scores is None:
+            scores = best
+        else:
+            scores = {doc_id: s + best[doc_id] for doc_id, s in scores.items() if doc_id in best}
+        if not scores:
+            return []
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return ranked if limit is None else ranked[:limit]
+
+
+def complete(index, prefix, limit=COMPLETIONS_PER_PREFIX):
+    """Most common indexed terms starting with prefix."""
+    prefix = prefix.lower()
+    if len(prefix) <= COMPLETION_PREFIX_LEN:
+        return [index["terms"][n] for n in index["completions"].get(prefix, [])][:limit]
+    lo, hi = term_range(index, prefix)
+    numbers = sorted(range(lo, hi), key=lambda n: -len(index["postings"][n]))
+    return [index["terms"][n] for n in numbers[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the home page search index.")
+    parser.add_argument("--products", default=os.path.join(DATA_DIR, "products.json"))
+    parser.add_argument("--index", default=os.path.join(DATA_DIR, INDEX_FILE))
+    parser.add_argument("--query", help="run a query against --index instead of building it")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.query is None:
+        with open(args.products, 'r') as f:
+            products = json.load(f)
+        path = write_search_index(products, os.path.dirname(args.index))
+        print(f"Indexed {len(products)} products into {path}")
+        return
+
+    index = load_index(args.index)
+    with open(os.path.join(os.path.dirname(args.index), "manifest.json"), 'r') as f:
+        manifest = json.load(f)["products"]
+    start = time.perf_counter()
+    results = search(index, args.query)
+    elapsed = (time.perf_counter() - start) * 1000
+    for doc_id, score in results[:args.limit]:
+        print(f"  {score:4}  {manifest[doc_id]['title']}")
+    print(f"{len(results)} matches in {elapsed:.2f} ms")
+    tokens = tokenize(args.query)
+    if tokens:
+        print(f"Completions for {tokens[-1]!r}: {', '.join(complete(index, tokens[-1]))}")
+
+
+if __name__ == "__main__":
+    main()
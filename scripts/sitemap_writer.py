@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Streaming, sharded sitemap writer.
+
+URLs are streamed into numbered sitemap shards that respect the protocol
+limits (50,000 URLs / 50 MB uncompressed per file). Each shard is spooled
+to a temporary file while it is hashed, so memory stays flat however large
+the catalog gets. When everything fits in one uncompressed shard it is
+written as a plain sitemap.xml, exactly as before; otherwise shards become
+sitemap-1.xml, sitemap-2.xml, ... (or .xml.gz with gzip=True) and
+sitemap.xml is a sitemap index pointing at them, with each shard's newest
+<lastmod>.
+
+Shard digests are remembered in .build/sitemap-state.json and a shard
+whose content is unchanged since the previous build is not rewritten, so
+its file (and mtime) stays as it was. Shards are filled in order, so an
+insertion only rewrites the shard it lands in and the ones after it.
+
+process_data.py writes its sitemap through this module. Run it directly
+to build the site sitemap from the enriched catalog, with <lastmod> taken
+from each product's last_updated:
+
+    python scripts/sitemap_writer.py [--base https://cresoftware.tech] [--gzip]
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The deployed site (see CNAME); process_data.py and render_product_pages.py build URLs from it too
+SITE = "https://cresoftware.tech"
+
+MAX_URLS = 50_000
+MAX_BYTES = 50 * 1024 * 1024
+
+URLSET_HEAD = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_TAIL = '</urlset>'
+INDEX_HEAD = '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+INDEX_TAIL = '</sitemapindex>'
+
+LASTMOD_RE = re.compile(r"\d{4}-\d{2}-\d{2}(T[0-9:.]+(Z|[+-]\d{2}:\d{2}))?$")
+
+HOME_PRIORITY = "1.0"
+CATEGORY_PRIORITY = "0.9"
+PRODUCT_PRIORITY = "0.8"
+
+
+def url_entry(loc, priority=None, lastmod=None):
+    entry = f"  <url><loc>{escape(loc)}</loc>"
+    if lastmod and LASTMOD_RE.match(lastmod):
+        entry += f"<lastmod>{lastmod}</lastmod>"
+    if priority is not None:
+        entry += f"<priority>{priority}</priority>"
+    return entry + "</url>\n"
+
+
+class _Shard:
+    def __init__(self, directory, gzipped):
+        fd, self.tmp = tempfile.mkstemp(prefix=".sitemap-", suffix=".tmp", dir=directory)
+        raw = os.fdopen(fd, 'wb')
+        self.file = gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) if gzipped else raw
+        self.raw = raw
+        self.hash = hashlib.sha256()
+        self.urls = 0
+        self.bytes = 0
+        self.lastmod = None
+        self.write(URLSET_HEAD.encode("utf-8"))
+
+    def write(self, data):
+        self.file.write(data)
+        self.hash.update(data)
+        self.bytes += len(data)
+
+    def finish(self):
+        self.write(URLSET_TAIL.encode("utf-8"))
+        self.file.close()
+        self.raw.close()
+        return self.hash.hexdigest()
+
+
+class SitemapWriter:
+    """Stream URLs into sitemap shards under root; use as a context manager."""
+
+    def __init__(self, root, base_url, name="sitemap", gzip=False, max_urls=MAX_URLS, max_bytes=MAX_BYTES,
+                 state_path=None):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+        self.name = name
+        self.gzip = gzip
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.state_path = state_path or os.path.join(root, ".build", f"{name}-state.json")
+        self._shard = None
+        self._done = []  # (tmp path, digest, lastmod)
+        self._tail_bytes = len(URLSET_TAIL.encode("utf-8"))
+        self.written = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+    def add(self, loc, priority=None, lastmod=None):
+        data = url_entry(loc, priority, lastmod).encode("utf-8")
+        shard = self._shard
+        if shard is not None and (shard.urls >= self.max_urls
+                                  or shard.bytes + len(data) + self._tail_bytes > self.max_bytes):
+            self._finish_shard()
+            shard = None
+        if shard is None:
+            shard = self._shard = _Shard(self.root, self.gzip)
+        shard.write(data)
+        shard.urls += 1
+        if lastmod and LASTMOD_RE.match(lastmod) and (shard.lastmod is None or lastmod > shard.lastmod):
+            shard.lastmod = lastmod
+
+    def _finish_shard(self):
+        digest = self._shard.finish()
+        self._done.append((self._shard.tmp, digest, self._shard.lastmod))
+        self._shard = None
+
+    def _discard(self):
+        if self._shard is not None:
+            self._shard.file.close()
+            self._shard.raw.close()
+            self._done.append((self._shard.tmp, None, None))
+            self._shard = None
+        for tmp, _, _ in self._done:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._done = []
+
+    def close(self):
+        """Move finished shards into place and write the index; returns changed filenames."""
+        if self._shard is None and not self._done:
+            self._shard = _Shard(self.root, self.gzip)  # an empty urlset, like before
+        if self._shard is not None:
+            self._finish_shard()
+
+        try:
+            with open(self.state_path, 'r') as f:
+                previous = json.load(f)
+        except (FileNotFoundError, ValueError):
+            previous = {}
+        state = {}
+
+        ext = ".xml.gz" if self.gzip else ".xml"
+        single = len(self._done) == 1 and not self.gzip
+        index = []
+        for number, (tmp, digest, lastmod) in enumerate(self._done, 1):
+            filename = f"{self.name}.xml" if single else f"{self.name}-{number}{ext}"
+            self._place(tmp, filename, digest, previous)
+            state[filename] = digest
+            index.append((filename, lastmod))
+        self._done = []
+
+        keep = set(state)
+        if not single:
+            data = [INDEX_HEAD]
+            for filename, lastmod in index:
+                data.append(f"  <sitemap><loc>{escape(self.base_url)}/{filename}</loc>"
+                            + (f"<lastmod>{lastmod}</lastmod>" if lastmod else "") + "</sitemap>\n")
+            data.append(INDEX_TAIL)
+            data = "".join(data).encode("utf-8")
+            digest = hashlib.sha256(data).hexdigest()
+            fd, tmp = tempfile.mkstemp(prefix=".sitemap-", suffix=".tmp", dir=self.root)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            index_name = f"{self.name}.xml"
+            self._place(tmp, index_name, digest, previous)
+            state[index_name] = digest
+            keep.add(index_name)
+
+        shard_re = re.compile(re.escape(self.name) + r"-\d+\.xml(\.gz)?$")
+        for filename in os.listdir(self.root):
+            if shard_re.match(filename) and filename not in keep:
+                os.remove(os.path.join(self.root, filename))
+
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        with open(self.state_path, 'w') as f:
+            json.dump(state, f)
+        return self.written
+
+    def _place(self, tmp, filename, digest, previous):
+        path = os.path.join(self.root, filename)
+        if previous.get(filename) == digest and os.path.exists(path):
+            os.remove(tmp)
+            return
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+        self.written.append(filename)
+
+
+def write_site_sitemap(products, cat_data, root=ROOT, base_url=SITE, gzip=False):
+    with SitemapWriter(root, base_url, gzip=gzip) as sitemap:
+        sitemap.add(f"{base_url}/", HOME_PRIORITY)
+        for product in products:
+            sitemap.add(f"{base_url}/product.html#{quote(product['slug'], safe='')}", PRODUCT_PRIORITY,
+                        product.get("last_updated"))
+        for entry in cat_data.values():
+            sitemap.add(f"{base_url}/category.html#{entry['slug']}", CATEGORY_PRIORITY)
+    return sitemap.written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write sitemap.xml (sharded behind an index when needed).")
+    parser.add_argument("--products", default=os.path.join(ROOT, "data", "products.json"))
+    parser.add_argument("--categories", default=os.path.join(ROOT, "data", "categories.json"))
+    parser.add_argument("--root", default=ROOT, help="directory to write sitemap files into")
+    parser.add_argument("--base", default=SITE, help="site URL the sitemap points at")
+    parser.add_argument("--gzip", action="store_true", help="write shards as .xml.gz")
+    args = parser.parse_args()
+
+    with open(args.products, 'r') as f:
+        products = json.load(f)
+    with open(args.categories, 'r') as f:
+        cat_data = json.load(f)
+    written = write_site_sitemap(products, cat_data, args.root, args.base, args.gzip)
+    print(f"Wrote {len(written)} sitemap files" + (f": {', '.join(written)}" if written else " (all unchanged)"))
+
+
+if __name__ == "__main__":
+    main()
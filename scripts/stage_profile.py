@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Per-stage timing and peak-memory instrumentation for process_data.
+
+process_data --profile wraps each pipeline stage in StageProfiler.stage()
+(NullProfiler, whose stages measure nothing, stands in otherwise):
+
+    profiler = StageProfiler()
+    profiler.start()
+    with profiler.stage("read") as stage:
+        rows = list(read_rows(path))
+        stage.rows = len(rows)
+    profiler.stop()
+    profiler.write(".build/profile.json", csv=path)
+
+Each stage records wall time (perf_counter), CPU time of this process
+(process_time; pool workers are not included), rows handled and rows/s,
+and, through tracemalloc, the peak bytes allocated while the stage ran
+(the high-water mark above what was live when it started) and the bytes
+still held when it ended. tracemalloc slows allocation-heavy code, so
+times under --profile are for comparing stages with each other rather
+than with an unprofiled run.
+
+--cprofile PATH additionally runs the build under cProfile and dumps
+pstats to PATH (inspect with `python -m pstats PATH`).
+"""
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Stage:
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.wall = self.cpu = 0.0
+        self.peak_bytes = self.retained_bytes = 0
+
+    def as_dict(self):
+        return {
+            "stage": self.name,
+            "wall_s": round(self.wall, 6),
+            "cpu_s": round(self.cpu, 6),
+            "rows": self.rows,
+            "rows_per_s": round(self.rows / self.wall, 1) if self.rows is not None and self.wall else None,
+            "peak_alloc_bytes": self.peak_bytes,
+            "retained_bytes": self.retained_bytes,
+        }
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off: stages cost a context manager and nothing else."""
+    enabled = False
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        yield Stage(name, rows)
+
+
+class StageProfiler:
+    enabled = True
+
+    def __init__(self, cprofile_path=None):
+        self.stages = []
+        self.cprofile_path = cprofile_path
+        self._profile = None
+        self._started = self._finished = None
+        self._peak = 0
+
+    def start(self):
+        tracemalloc.start()
+        self._started = (time.perf_counter(), time.process_time())
+        if self.cprofile_path:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        if self._profile is not None:
+            self._profile.disable()
+            os.makedirs(os.path.dirname(os.path.abspath(self.cprofile_path)), exist_ok=True)
+            self._profile.dump_stats(self.cprofile_path)
+            self._profile = None
+        if tracemalloc.is_tracing():
+            self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+        self._finished = (time.perf_counter(), time.process_time())
+        tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Measure the block; set .rows on the yielded Stage if it is not known up front."""
+        stage = Stage(name, rows)
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield stage
+        finally:
+            stage.wall = time.perf_counter() - wall
+            stage.cpu = time.process_time() - cpu
+            current, peak = tracemalloc.get_traced_memory()
+            self._peak = max(self._peak, peak)  # reset_peak() above hides earlier highs from stop()
+            stage.peak_bytes = max(0, peak - before)
+            stage.retained_bytes = current - before
+            self.stages.append(stage)
+
+    def report(self, **info):
+        wall = self._finished[0] - self._started[0]
+        cpu = self._finished[1] - self._started[1]
+        return {
+            **info,
+            "total": {"wall_s": round(wall, 6), "cpu_s": round(cpu, 6), "peak_traced_bytes": self._peak},
+            "stages": [stage.as_dict() for stage in self.stages],
+            "cprofile": self.cprofile_path,
+        }
+
+    def write(self, path, **info):
+        """Write the JSON report and return it."""
+        report = self.report(**info)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+    def summary(self):
+        """Human-readable table of the stages."""
+        lines = [f"{'stage':<20} {'wall s':>9} {'cpu s':>9} {'rows/s':>12} {'peak MB':>9}"]
+        for stage in self.stages:
+            d = stage.as_dict()
+            rate = f"{d['rows_per_s']:,.0f}" if d["rows_per_s"] else "-"
+            lines.append(f"{stage.name:<20} {stage.wall:9.3f} {stage.cpu:9.3f} {rate:>12} "
+                         f"{stage.peak_bytes / 1e6:9.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Single-pass free-text signal extraction.
+
+One rule table drives every keyword heuristic we run over product text:
+property types, deployment and pricing model (process_data.py) and CRE
+categories / audience property types (enrich_products.py). The text is
+lowercased once per call and all requested signals are evaluated together,
+so callers no longer re-lowercase the text for every heuristic (enrichment
+used to do it eight times per homepage).
+
+Matching keeps the original substring semantics ("app" matches
+"application") and each label stops at its first matching term. Lookups
+are plain str.__contains__ calls: on multi-hundred-KB pages that beats
+tokenising the page in Python or running a combined regex, both of which
+were measured and rejected.
+"""
+
+# Each signal is an ordered list of (label, terms); a label fires when any
+# of its terms occurs in the text. Resolvers below turn the fired labels
+# into the value callers store.
+RULES = {
+    "property_types": [
+        ("Office", ["office"]),
+        ("Retail", ["retail"]),
+        ("Industrial", ["industrial"]),
+        ("Multifamily", ["multifamily"]),
+        ("Mixed-Use", ["mixed-use"]),
+        ("Residential", ["residential"]),
+        ("commercial", ["commercial"]),
+    ],
+    "deployment": [
+        ("Cloud", ["cloud", "saas", "web-based", "web based", "browser", "online"]),
+        ("On-Premise", ["on-premise", "on premise", "desktop", "installed"]),
+        ("Mobile", ["mobile", "ios", "android", "app"]),
+    ],
+    "pricing_model": [
+        ("free", ["free"]),
+        ("trial", ["trial"]),
+        ("premium", ["freemium", "premium"]),
+        ("Subscription", ["subscription", "monthly", "per month"]),
+        # "quote" / "contact" / "custom pricing" wording resolves to the
+        # same Quote-based default, so it isn't scanned for.
+    ],
+    "cre_categories": [
+        ("Property Management", ["property management", "tenant", "lease", "rent", "maintenance"]),
+        ("CRM & Marketing", ["crm", "marketing", "lead", "campaign", "prospecting"]),
+        ("Data & Analytics", ["analytics", "data", "insights", "reporting", "intelligence"]),
+        ("Investment & Valuation", ["investment", "valuation", "appraisal", "cap rate", "roi"]),
+        ("Broker Tools", ["broker", "brokerage", "listing", "deal", "transaction"]),
+        ("Construction & Development", ["construction", "development", "project management", "building"]),
+    ],
+    "audience_property_types": [
+        ("residential", ["residential", "apartment", "multifamily"]),
+        ("commercial", ["office", "industrial", "retail"]),
+    ],
+}
+
+
+def _resolve_property_types(labels):
+    types = [label for label in labels if label != "commercial"]
+    if "commercial" in labels and not types:
+        types.extend(["Office", "Retail", "Industrial"])
+    if not types:
+        types.append("Commercial")
+    return sorted(set(types))
+
+
+def _resolve_deployment(labels):
+    return list(labels) or ["Cloud"]  # default assumption for modern SaaS
+
+
+def _resolve_pricing_model(labels):
+    if "free" in labels and "trial" not in labels:
+        return "Freemium" if "premium" in labels else "Free"
+    if "Subscription" in labels:
+        return "Subscription"
+    return "Quote-based"  # default for B2B
+
+
+def _resolve_cre_categories(labels):
+    return list(labels) or ["Data & Analytics"]
+
+
+def _resolve_audience_property_types(labels):
+    if "residential" in labels:
+        return ["Multifamily", "Residential"]
+    if "commercial" in labels:
+        return ["Office", "Industrial", "Retail"]
+    return ["Commercial"]
+
+
+RESOLVERS = {
+    "property_types": _resolve_property_types,
+    "deployment": _resolve_deployment,
+    "pricing_model": _resolve_pricing_model,
+    "cre_categories": _resolve_cre_categories,
+    "audience_property_types": _resolve_audience_property_types,
+}
+
+
+class SignalClassifier:
+    def __init__(self, rules, resolvers):
+        self.rules = rules
+        self.resolvers = resolvers
+        self._compiled = {
+            name: (tuple((label, tuple(terms)) for label, terms in label_rules), resolvers[name])
+            for name, label_rules in rules.items()
+        }
+
+    def classify(self, text, signals=None):
+        """Return {signal: value} for the requested signals (default: all)."""
+        contains = (text or "").lower().__contains__
+        compiled = self._compiled
+
+        result = {}
+        for name in (self.rules if signals is None else signals):
+            label_rules, resolve = compiled[name]
+            result[name] = resolve([label for label, terms in label_rules if any(map(contains, terms))])
+        return result
+
+
+CLASSIFIER = SignalClassifier(RULES, RESOLVERS)
+
+
+def classify(text, signals=None):
+    return CLASSIFIER.classify(text, signals)
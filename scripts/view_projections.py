@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""Column-oriented data for the market map, category grid and home cards.
+
+market-map.html downloaded all of products.json (descriptions, feature
+groups, SEO blocks, pricing plans) to draw logos grouped by category, and
+the home and category pages did the same to render cards. This writes one
+projection per view under data/views/, holding only what that view renders:
+
+    market-map.json     slug, title, logo_url, url, summary (the tooltip
+                        text, already cut to 280 characters), categories,
+                        primary_category; plus category_names {slug: name}
+                        so the page no longer needs categories.json
+    category-grid.json  the card columns plus property_types, deployment,
+                        pricing_model (the filter values) and last_updated;
+                        plus members {category slug: [row ids]}
+    home.json           the card columns plus property_types and
+                        last_updated
+
+Card columns are slug, title, tagline, logo_url, rating, categories,
+top_features (the first three feature names), pricing.model and
+pricing.starting_price. A projection is
+
+    {"version": 1, "view": name, "count": rows,
+     "columns": {column: [one value per row]},
+     "dictionaries": {column: [distinct values]},
+     "flags": [boolean column for bit 0, bit 1, ...], ...}
+
+Rows are in catalog order, so row i is product i of the manifest and the
+search index. A column listed in "dictionaries" stores indexes into that
+list (a list of indexes for list-valued columns). The "flags" column packs
+one bit per FLAGS entry, in this order:
+
+    0  pricing.free_trial
+    1  pricing.free_tier
+    2  is_featured
+    3  _badge_popular      the comparison badges, worked out here over the
+    4  _badge_value        whole catalog exactly as assignComparisonBadges()
+    5  _badge_small        in js/app.js does
+    6  _has_feature_groups the product has feature groups (the home page's
+                           enriched count)
+
+Dotted column names are nested fields of the row object the pages rebuild
+(pricing.model -> row.pricing.model).
+
+Views are written with the shards and manifest (product_shards.py) and only
+when their bytes change.
+
+    python scripts/view_projections.py [--products data/products.json] [--categories data/categories.json]
+"""
+import argparse
+import json
+import os
+import re
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+VIEW_DIR = "views"
+VIEW_VERSION = 1
+COMPACT = (",", ":")
+
+SUMMARY_LENGTH = 280
+TOP_FEATURES = 3
+BADGE_COUNT = 5
+SMALL_TEAM_RE = re.compile(r"small|startup|1-|individual", re.IGNORECASE)
+TRAILING_WORD_RE = re.compile(r"\s\S*\Z")
+
+CARD_COLUMNS = ("slug", "title", "tagline", "logo_url", "rating", "categories", "top_features",
+                "pricing.model", "pricing.starting_price")
+
+VIEWS = {
+    "market-map": ("slug", "title", "logo_url", "url", "summary", "categories", "primary_category"),
+    "category-grid": CARD_COLUMNS + ("property_types", "deployment", "pricing_model", "last_updated"),
+    "home": CARD_COLUMNS + ("property_types", "last_updated"),
+}
+
+FLAGS = ("pricing.free_trial", "pricing.free_tier", "is_featured", "_badge_popular", "_badge_value", "_badge_small",
+         "_has_feature_groups")
+
+# Repeated strings are stored once per view
+DICTIONARY_COLUMNS = {"categories", "primary_category", "property_types", "deployment", "pricing_model",
+                      "pricing.model"}
+
+
+def _pricing(product):
+    pricing = product.get("pricing")
+    return pricing if isinstance(pricing, dict) else {}  # a few records carry a bare pricing string
+
+
+def _audience(product):
+    audience = product.get("target_audience")
+    return audience if isinstance(audience, dict) else {}
+
+
+def summary(product):
+    """The market map tooltip text: the description cut at a word before 280 (UTF-16) characters."""
+    desc = product.get("description") or product.get("short_description") or ""
+    units = desc.encode("utf-16-le", "surrogatepass")
+    if len(units) <= SUMMARY_LENGTH * 2:
+        return desc
+    cut = units[:SUMMARY_LENGTH * 2].decode("utf-16-le", "ignore")
+    return TRAILING_WORD_RE.sub("", cut, count=1) + "…"
+
+
+def top_features(product):
+    names = []
+    for group in product.get("feature_groups") or []:
+        for feature in group.get("features") or []:
+            names.append(feature.get("name"))
+            if len(names) == TOP_FEATURES:
+                return names
+    return names
+
+
+COLUMN_VALUES = {
+    "slug": lambda p: p["slug"],
+    "title": lambda p: p.get("title") or "",
+    "tagline": lambda p: p.get("short_description") or p.get("tagline") or p.get("headline") or "",
+    "logo_url": lambda p: p.get("logo_url") or "",
+    "url": lambda p: p.get("url") or "",
+    "summary": summary,
+    "rating": lambda p: p.get("rating"),
+    "categories": lambda p: p.get("categories") or [],
+    "primary_category": lambda p: p.get("primary_category") or "",
+    "top_features": top_features,
+    "property_types": lambda p: _audience(p).get("property_types") or p.get("property_types") or [],
+    "deployment": lambda p: p.get("deployment") or [],
+    "pricing_model": lambda p: _pricing(p).get("model") or p.get("pricing_model") or "Quote-based",
+    "pricing.model": lambda p: _pricing(p).get("model") or "",
+    "pricing.starting_price": lambda p: _pricing(p).get("starting_price") or "",
+    "last_updated": lambda p: p.get("last_updated") or "",
+}
+
+
+def comparison_badges(products):
+    """{flag: set of row ids}, following assignComparisonBadges() in js/app.js."""
+    def top(rows):
+        # Array.prototype.sort is stable, and so is sorted()
+        return {i for i, _ in sorted(rows, key=lambda row: -(row[1].get("rating") or 0))[:BADGE_COUNT]}
+
+    rows = list(enumerate(products))
+    return {
+        "_badge_popular": top((i, p) for i, p in rows if p.get("rating") and p.get("is_featured")),
+        "_badge_value": top((i, p) for i, p in rows
+                            if (_pricing(p).get("free_tier") or _pricing(p).get("free_trial"))
+                            and (p.get("rating") or 0) >= 4),
+        "_badge_small": top((i, p) for i, p in rows
+                            if any(SMALL_TEAM_RE.search(s) for s in _audience(p).get("company_sizes") or [])),
+    }
+
+
+def _flags(products):
+    badges = comparison_badges(products)
+    flags = []
+    for i, p in enumerate(products):
+        pricing = _pricing(p)
+        values = (pricing.get("free_trial"), pricing.get("free_tier"), p.get("is_featured"),
+                  i in badges["_badge_popular"], i in badges["_badge_value"], i in badges["_badge_small"],
+                  bool(p.get("feature_groups")))
+        flags.append(sum(1 << bit for bit, value in enumerate(values) if value))
+    return flags
+
+
+def _encode(values):
+    """(dictionary, values as indexes) for a column of strings or lists of strings."""
+    index = {}
+
+    def code(value):
+        if value not in index:
+            index[value] = len(index)
+        return index[value]
+
+    encoded = [[code(v) for v in value] if isinstance(value, list) else code(value) for value in values]
+    return list(index), encoded
+
+
+def build_view(name, products, cat_data=None, flags=None):
+    columns, dictionaries = {}, {}
+    for column in VIEWS[name]:
+        values = [COLUMN_VALUES[column](p) for p in products]
+        if column in DICTIONARY_COLUMNS:
+            dictionaries[column], values = _encode(values)
+        columns[column] = values
+    if name != "market-map":
+        columns["flags"] = flags if flags is not None else _flags(products)
+    view = {
+        "version": VIEW_VERSION,
+        "view": name,
+        "count": len(products),
+        "columns": columns,
+        "dictionaries": dictionaries,
+        "flags": list(FLAGS) if "flags" in columns else [],
+    }
+    categories = list((cat_data or {}).values())
+    if name == "market-map":
+        view["category_names"] = {cat["slug"]: cat["name"] for cat in categories}
+    elif name == "category-grid":
+        row = {p["slug"]: i for i, p in enumerate(products)}
+        view["members"] = {cat["slug"]: sorted({row[slug] for slug in cat.get("products", []) if slug in row})
+                           for cat in categories}
+    return view
+
+
+def _write_if_changed(path, data):
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def write_views(products, data_dir, cat_data=None):
+    """Write every projection under data_dir/views; returns the names of those that changed."""
+    view_dir = os.path.join(data_dir, VIEW_DIR)
+    os.makedirs(view_dir, exist_ok=True)
+    flags = _flags(products)
+    changed = []
+    for name in VIEWS:
+        data = json.dumps(build_view(name, products, cat_data, flags), separators=COMPACT, ensure_ascii=False)
+        if _write_if_changed(os.path.join(view_dir, name + ".json"), data.encode("utf-8")):
+            changed.append(name)
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the per-view column projections under data/views.")
+    parser.add_argument("--products", default=os.path.join(DATA_DIR, "products.json"))
+    parser.add_argument("--categories", default=os.path.join(DATA_DIR, "categories.json"))
+    args = parser.parse_args()
+
+    with open(args.products, 'r', encoding='utf-8') as f:
+        products = json.load(f)
+    cat_data = None
+    if os.path.exists(args.categories):
+        with open(args.categories, 'r', encoding='utf-8') as f:
+            cat_data = json.load(f)
+    data_dir = os.path.dirname(args.products)
+    changed = write_views(products, data_dir, cat_data)
+    for name in VIEWS:
+        size = os.path.getsize(os.path.join(data_dir, VIEW_DIR, name + ".json"))
+        print(f"  {name + '.json':<20} {size / 1024:7.1f} KB{'' if name in changed else '  (unchanged)'}")
+    print(f"Wrote {len(changed)} of {len(VIEWS)} views for {len(products)} products")
+
+
+if __name__ == "__main__":
+    main()